@@ -0,0 +1,34 @@
+"""add partial index on application locked_at
+
+Revision ID: 080fadfd0e3a
+Revises: eb4fd79a5e2f
+Create Date: 2026-10-18 10:12:41.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '080fadfd0e3a'
+down_revision: Union[str, Sequence[str], None] = 'eb4fd79a5e2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_application_locked_at',
+        'application',
+        ['locked_at'],
+        unique=False,
+        postgresql_where=sa.text('locked_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_locked_at', table_name='application')
@@ -0,0 +1,33 @@
+"""index check_in_log on event_type, user_id
+
+Revision ID: 4e2b7c9d1a35
+Revises: cfe104e95694
+Create Date: 2026-10-18 14:02:11.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e2b7c9d1a35'
+down_revision: Union[str, Sequence[str], None] = 'cfe104e95694'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_check_in_event_type_user_id', 'check_in_log', ['event_type', 'user_id'], unique=False
+    )
+    # Covered by the new index's leading column
+    op.drop_index('ix_check_in_event_type', table_name='check_in_log')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_check_in_event_type', 'check_in_log', ['event_type'], unique=False)
+    op.drop_index('ix_check_in_event_type_user_id', table_name='check_in_log')
@@ -0,0 +1,41 @@
+"""unique check-in per user and event
+
+Revision ID: 7f3a1d5e9c21
+Revises: 4e2b7c9d1a35
+Create Date: 2026-10-18 14:31:47.208915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a1d5e9c21'
+down_revision: Union[str, Sequence[str], None] = '4e2b7c9d1a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep each user's earliest check-in per event, the one staff saw
+    # reported as "already checked in at"
+    op.execute("""
+        DELETE FROM check_in_log AS dup
+        USING check_in_log AS kept
+        WHERE dup.user_id = kept.user_id
+          AND dup.event_type = kept.event_type
+          AND (dup.check_in_time, dup.id) > (kept.check_in_time, kept.id)
+    """)
+    op.create_unique_constraint('uq_check_in_user_event', 'check_in_log', ['user_id', 'event_type'])
+    # Covered by the constraint's leading column
+    op.drop_index('ix_check_in_user_id', table_name='check_in_log')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Deleted duplicates are not restored
+    op.create_index('ix_check_in_user_id', 'check_in_log', ['user_id'], unique=False)
+    op.drop_constraint('uq_check_in_user_event', 'check_in_log', type_='unique')
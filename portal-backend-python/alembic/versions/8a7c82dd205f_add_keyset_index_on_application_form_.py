@@ -0,0 +1,33 @@
+"""add keyset index on application form_key created_at id
+
+Revision ID: 8a7c82dd205f
+Revises: 080fadfd0e3a
+Create Date: 2026-10-18 11:43:41.744185
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a7c82dd205f'
+down_revision: Union[str, Sequence[str], None] = '080fadfd0e3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_application_form_key_created_at_id',
+        'application',
+        ['form_key', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_form_key_created_at_id', table_name='application')
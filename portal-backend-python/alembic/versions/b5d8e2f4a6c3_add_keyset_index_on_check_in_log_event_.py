@@ -0,0 +1,33 @@
+"""add keyset index on check_in_log event_type check_in_time id
+
+Revision ID: b5d8e2f4a6c3
+Revises: 7f3a1d5e9c21
+Create Date: 2026-10-18 15:12:09.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d8e2f4a6c3'
+down_revision: Union[str, Sequence[str], None] = '7f3a1d5e9c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_check_in_event_type_check_in_time_id',
+        'check_in_log',
+        ['event_type', sa.text('check_in_time DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_check_in_event_type_check_in_time_id', table_name='check_in_log')
@@ -0,0 +1,79 @@
+"""index email parts in application search_vector
+
+Revision ID: c9e4a7b2d8f1
+Revises: b5d8e2f4a6c3
+Create Date: 2026-10-18 17:40:21.318405
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a7b2d8f1'
+down_revision: Union[str, Sequence[str], None] = 'b5d8e2f4a6c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PREVIOUS_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'first_name', '') || ' ' || "
+    "coalesce(submission_json->>'last_name', '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'pref_name', '') || ' ' || "
+    "coalesce(submission_json->>'email', '') || ' ' || "
+    "coalesce(submission_json->>'university', '') || ' ' || "
+    "coalesce(submission_json->>'major', '') || ' ' || "
+    "coalesce(submission_json->>'country', '')), 'B')"
+)
+
+# The parser keeps "ada@duke.edu" as a single token; splitting the email on
+# @ and . lets searches for the full address or its domain match it
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'first_name', '') || ' ' || "
+    "coalesce(submission_json->>'last_name', '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'pref_name', '') || ' ' || "
+    "coalesce(submission_json->>'university', '') || ' ' || "
+    "coalesce(submission_json->>'major', '') || ' ' || "
+    "coalesce(submission_json->>'country', '') || ' ' || "
+    "regexp_replace(coalesce(submission_json->>'email', ''), '[@.]', ' ', 'g')), 'B')"
+)
+
+
+def _replace_search_vector(expression: str) -> None:
+    # A generated column's expression can't be altered in place; re-adding
+    # it recomputes every row
+    op.drop_index('ix_application_search_vector', table_name='application', postgresql_using='gin')
+    op.drop_column('application', 'search_vector')
+    op.add_column(
+        'application',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(expression, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_application_search_vector',
+        'application',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_search_vector(SEARCH_VECTOR_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_search_vector(PREVIOUS_SEARCH_VECTOR_SQL)
@@ -0,0 +1,33 @@
+"""add index on application user_id form_key
+
+Revision ID: e4b8c2d6f0a1
+Revises: c9e4a7b2d8f1
+Create Date: 2026-10-18 19:02:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c2d6f0a1'
+down_revision: Union[str, Sequence[str], None] = 'c9e4a7b2d8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_application_user_id_form_key',
+        'application',
+        ['user_id', 'form_key'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_user_id_form_key', table_name='application')
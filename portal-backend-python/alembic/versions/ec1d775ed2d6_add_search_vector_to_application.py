@@ -0,0 +1,60 @@
+"""add search_vector to application
+
+Revision ID: ec1d775ed2d6
+Revises: 8a7c82dd205f
+Create Date: 2026-10-18 11:45:02.071715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec1d775ed2d6'
+down_revision: Union[str, Sequence[str], None] = '8a7c82dd205f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'first_name', '') || ' ' || "
+    "coalesce(submission_json->>'last_name', '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(submission_json->>'pref_name', '') || ' ' || "
+    "coalesce(submission_json->>'email', '') || ' ' || "
+    "coalesce(submission_json->>'university', '') || ' ' || "
+    "coalesce(submission_json->>'major', '') || ' ' || "
+    "coalesce(submission_json->>'country', '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A STORED generated column is computed for every existing row when the
+    # column is added, so no separate backfill is needed
+    op.add_column(
+        'application',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_application_search_vector',
+        'application',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_search_vector', table_name='application', postgresql_using='gin')
+    op.drop_column('application', 'search_vector')
@@ -1,7 +1,15 @@
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 
+import httpx
 import jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import (
     SecurityScopes,
     HTTPAuthorizationCredentials,
@@ -14,6 +22,16 @@ auth0_api_audience = os.getenv("AUTH0_API_AUDIENCE")
 auth0_issuer = os.getenv("AUTH0_ISSUER")
 auth0_algorithms = os.getenv("AUTH0_ALGORITHMS")
 
+# How long a fetched JWKS is trusted before it must be refreshed
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("AUTH0_JWKS_CACHE_TTL_SECONDS", "600"))
+# Maximum number of already-verified tokens kept in memory
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("AUTH0_TOKEN_CACHE_MAX_SIZE", "2048"))
+# Fetch JWKS with an async client and verify signatures off the event loop
+NON_BLOCKING_VERIFY = os.getenv("AUTH0_NON_BLOCKING_VERIFY", "false").lower() == "true"
+JWKS_FETCH_TIMEOUT_SECONDS = 10
+
+logger = logging.getLogger(__name__)
+
 
 class UnauthorizedException(HTTPException):
     def __init__(self, detail: str, **kwargs):
@@ -27,10 +45,73 @@ class UnauthenticatedException(HTTPException):
         )
 
 
+class TokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by a hash of the raw token.
+    Entries are dropped once the token's `exp` claim has passed.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        # Tokens without an expiry are never cached
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class VerifyToken:
-    def __init__(self):
-        jwks_url = f"https://{auth0_domain}/.well-known/jwks.json"
-        self.jwks_client = jwt.PyJWKClient(jwks_url)
+    def __init__(
+        self,
+        non_blocking: Optional[bool] = None,
+        jwks_url: Optional[str] = None,
+    ):
+        self.jwks_url = jwks_url or f"https://{auth0_domain}/.well-known/jwks.json"
+        self.jwks_client = jwt.PyJWKClient(
+            self.jwks_url,
+            cache_keys=True,
+            cache_jwk_set=True,
+            lifespan=JWKS_CACHE_TTL_SECONDS,
+        )
+        self.token_cache = TokenCache()
+        self.non_blocking = NON_BLOCKING_VERIFY if non_blocking is None else non_blocking
+        # Collapses concurrent cold-cache fetches into a single request
+        self._jwks_fetch_lock = asyncio.Lock()
+        self._http_client: Optional[httpx.AsyncClient] = None
 
     async def verify(
         self,
@@ -40,18 +121,31 @@ class VerifyToken:
         if token is None:
             raise UnauthenticatedException
 
+        cached_payload = self.token_cache.get(token.credentials)
+        if cached_payload is not None:
+            return cached_payload
+
+        if self.non_blocking:
+            await self._ensure_jwks_async()
+            payload = await run_in_threadpool(self._decode, token.credentials)
+        else:
+            payload = self._decode(token.credentials)
+
+        self.token_cache.put(token.credentials, payload)
+        return payload
+
+    def _decode(self, credentials: str) -> Dict[str, Any]:
+        """Resolve the signing key and verify the token signature and claims."""
         try:
-            signing_key = self.jwks_client.get_signing_key_from_jwt(
-                token.credentials
-            ).key
+            signing_key = self.jwks_client.get_signing_key_from_jwt(credentials).key
         except jwt.exceptions.PyJWKClientError as error:
             raise UnauthorizedException(str(error))
         except jwt.exceptions.DecodeError as error:
             raise UnauthorizedException(str(error))
 
         try:
-            payload = jwt.decode(
-                token.credentials,
+            return jwt.decode(
+                credentials,
                 signing_key,
                 algorithms=auth0_algorithms,
                 audience=auth0_api_audience,
@@ -60,4 +154,70 @@ class VerifyToken:
         except Exception as error:
             raise UnauthorizedException(str(error))
 
-        return payload
+    def _has_fresh_jwks(self) -> bool:
+        cache = self.jwks_client.jwk_set_cache
+        return cache is not None and cache.get() is not None
+
+    async def _ensure_jwks_async(self) -> None:
+        """Warm the JWKS cache with an async fetch so a cold cache never blocks the loop."""
+        if self._has_fresh_jwks():
+            return
+
+        async with self._jwks_fetch_lock:
+            # Another request may have fetched it while we were waiting
+            if self._has_fresh_jwks():
+                return
+            try:
+                await self._fetch_jwks_async()
+            except (httpx.HTTPError, ValueError, jwt.exceptions.PyJWKSetError) as error:
+                raise UnauthorizedException(f"Failed to fetch JWKS: {error}")
+
+    async def _fetch_jwks_async(self) -> None:
+        if self._http_client is None:
+            # Building the client loads the CA bundle, which is slow enough to
+            # stall the loop, so do it in the threadpool once and reuse it
+            self._http_client = await run_in_threadpool(
+                httpx.AsyncClient, timeout=JWKS_FETCH_TIMEOUT_SECONDS
+            )
+        response = await self._http_client.get(self.jwks_url)
+        response.raise_for_status()
+        self.jwks_client.jwk_set_cache.put(response.json())
+        self._clear_signing_key_cache()
+
+    def _clear_signing_key_cache(self) -> None:
+        # Signing keys are cached per kid; drop them so rotated keys are picked up
+        if hasattr(self.jwks_client.get_signing_key, "cache_clear"):
+            self.jwks_client.get_signing_key.cache_clear()
+
+    def refresh_jwks(self) -> None:
+        """Re-fetch the JWKS so requests keep hitting a warm key set."""
+        self.jwks_client.get_jwk_set(refresh=True)
+        self._clear_signing_key_cache()
+
+    async def refresh_jwks_periodically(self) -> None:
+        """
+        Background task that refreshes the JWKS every half TTL, so the cached
+        key set never expires on a request path.
+        """
+        interval = max(JWKS_CACHE_TTL_SECONDS / 2, 1)
+        while True:
+            try:
+                if self.non_blocking:
+                    await self._fetch_jwks_async()
+                else:
+                    await run_in_threadpool(self.refresh_jwks)
+            except Exception as error:
+                logger.warning("JWKS refresh failed: %s", error)
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+_verifier: Optional[VerifyToken] = None
+
+
+def get_verifier() -> VerifyToken:
+    """Get or create the process-wide token verifier shared by all routers."""
+    global _verifier
+    if _verifier is None:
+        _verifier = VerifyToken()
+    return _verifier
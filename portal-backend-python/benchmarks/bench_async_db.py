@@ -0,0 +1,177 @@
+"""
+Requests/sec for the hot endpoints on blocking sessions vs the async engine.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_async_db
+
+The admin and check-in routers are mounted on one app and driven in-process
+by CONCURRENCY clients sending REQUESTS requests each. The endpoint code is
+identical in both runs; only get_async_db changes:
+
+- blocking: an AsyncSession proxying a plain Session on the sync engine, so
+  every query runs on the event loop thread the way get_db-backed endpoints
+  did;
+- async: sessions from the AsyncEngine, so queries overlap on the pool.
+
+Alongside req/s we report the longest stall seen by a ticker task on the
+same loop, i.e. how long any other request (/health included) could be kept
+waiting. Stats are counted on every request (no snapshot) over APPLICATIONS
+rows of the current form; the bench database keeps them between runs.
+
+Throughput only improves when there is database wait to overlap: point
+BENCH_DATABASE_URL at a Postgres on another host. On a single core shared
+with Postgres both variants are CPU bound and score about the same.
+"""
+
+import asyncio
+import time
+import uuid
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.common import BENCH_DATABASE_URL, bench_sessionmaker, bulk_insert
+from db import get_async_db
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+from models.user_role import RoleEnum, UserRole
+from routers import admin, check_in
+from routers.identity import auth
+
+APPLICATIONS = 20_000
+CONCURRENCY = 32
+REQUESTS = 25  # per client
+
+
+def _seed(Session):
+    """The current form's applications, once, and a fresh admin for this run."""
+    form_key = admin.CURRENT_FORM_KEY
+    with Session() as db:
+        existing = db.scalar(select(func.count()).where(Application.form_key == form_key))
+        if existing < APPLICATIONS:
+            if not db.get(Form, form_key):
+                db.add(Form(form_key=form_key, year=2026, is_open=True))
+                db.flush()
+            missing = APPLICATIONS - existing
+            users = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(missing)]
+            bulk_insert(db, User, users)
+            statuses = [ApplicationStatus.PENDING, ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED]
+            bulk_insert(db, Application, [
+                {"id": uuid4(), "user_id": user["id"], "form_key": form_key, "status": statuses[i % 3]}
+                for i, user in enumerate(users)
+            ])
+            db.commit()
+            db.execute(text("ANALYZE application"))
+
+        session_id = str(uuid.uuid4())
+        reviewer = User(auth0_id=f"auth0|bench_admin_{uuid4()}", current_session_id=session_id)
+        db.add(reviewer)
+        db.flush()
+        db.add_all([
+            UserRole(user_id=reviewer.id, role=RoleEnum.ADMIN),
+            UserRole(user_id=reviewer.id, role=RoleEnum.CHECK_IN),
+        ])
+        accepted = db.scalars(
+            select(Application.user_id)
+            .where(Application.form_key == form_key)
+            .where(Application.status == ApplicationStatus.ACCEPTED)
+            .limit(CONCURRENCY * REQUESTS * 2)
+        ).all()
+        db.commit()
+        return reviewer.auth0_id, session_id, accepted
+
+
+def _app(auth0_id, get_session):
+    app = FastAPI()
+    app.include_router(prefix="/admin", router=admin.router)
+    app.include_router(prefix="/check_in", router=check_in.router)
+    app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+    app.dependency_overrides[get_async_db] = get_session
+    return app
+
+
+async def _load(app, make_request):
+    """
+    Requests/sec with CONCURRENCY clients each sending REQUESTS requests,
+    and the longest event loop stall while they ran.
+    """
+    stalls = [0.0]
+    stop = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last - 0.001)
+            last = now
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(w):
+            for i in range(REQUESTS):
+                response = await make_request(client, w * REQUESTS + i)
+                assert response.status_code in (200, 404), response.text
+
+        await make_request(client, -1)  # warm the role cache and the pool
+        tick = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(w) for w in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick
+        return CONCURRENCY * REQUESTS / elapsed, max(stalls)
+
+
+def main():
+    Session = bench_sessionmaker()
+    auth0_id, session_id, accepted = _seed(Session)
+    async_url = make_url(BENCH_DATABASE_URL).set(drivername="postgresql+psycopg_async")
+    async_engine = create_async_engine(async_url, pool_size=CONCURRENCY, max_overflow=0)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def blocking_session():
+        db = AsyncSession(sync_session_class=lambda **_: Session(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def async_session():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    endpoints = {
+        "GET /admin/stats": lambda event_type: lambda client, i: client.get(
+            "/admin/stats", params={"session_id": session_id}
+        ),
+        "GET /admin/next-application": lambda event_type: lambda client, i: client.get(
+            "/admin/next-application", params={"session_id": session_id}
+        ),
+        "POST /check_in/log_user": lambda event_type: lambda client, i: client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(accepted[i % len(accepted)]), "event_type": event_type},
+        ),
+    }
+
+    async def run(label, get_session):
+        app = _app(auth0_id, get_session)
+        event_type = f"bench_{label}_{uuid4()}"
+        for name, request in endpoints.items():
+            rps, stall = await _load(app, request(event_type))
+            print(f"{label:<9} {name:<30} {rps:8.1f} req/s  max loop stall={stall * 1000:7.1f}ms")
+        # The pool belongs to this event loop
+        await async_engine.dispose()
+
+    print(f"{CONCURRENCY} concurrent clients x {REQUESTS} requests, {APPLICATIONS} applications\n")
+    for label, get_session in [("blocking", blocking_session), ("async", async_session)]:
+        asyncio.run(run(label, get_session))
+
+
+if __name__ == "__main__":
+    main()
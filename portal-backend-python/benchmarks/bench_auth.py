@@ -0,0 +1,133 @@
+"""
+Token verification latency under concurrent load, cold vs warm JWKS cache.
+
+cd portal-backend-python
+python -m benchmarks.bench_auth
+
+A local HTTP server stands in for Auth0's JWKS endpoint with an artificial
+delay. For each verification mode we fire CONCURRENCY requests with distinct
+tokens (so the verified-token cache never hits) alongside the same number of
+unauthenticated "bystander" requests, and report p50/p99 latency for both.
+A blocking verifier stalls the bystanders on a cold cache; the non-blocking
+verifier should not.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+os.environ.setdefault("AUTH0_ALGORITHMS", "RS256")
+os.environ.setdefault("AUTH0_API_AUDIENCE", "bench-audience")
+os.environ.setdefault("AUTH0_ISSUER", "https://bench.issuer/")
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from auth import VerifyToken  # noqa: E402
+from benchmarks.common import percentile  # noqa: E402
+
+CONCURRENCY = 100
+JWKS_LATENCY_SECONDS = 0.25
+KID = "bench-key"
+
+
+def _start_jwks_server(jwks: dict) -> ThreadingHTTPServer:
+    body = json.dumps(jwks).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(JWKS_LATENCY_SECONDS)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _run_scenario(verifier: VerifyToken, tokens: list[str]):
+    auth_latencies = []
+    bystander_latencies = []
+    # Every request arrives in the same burst; latency is measured from arrival
+    start = time.perf_counter()
+
+    async def authed_request(token: str):
+        await verifier.verify(
+            security_scopes=[],
+            token=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+        )
+        auth_latencies.append(time.perf_counter() - start)
+
+    async def bystander_request():
+        # e.g. /health, which never touches auth
+        await asyncio.sleep(0)
+        bystander_latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(
+        *(coro for token in tokens for coro in (authed_request(token), bystander_request()))
+    )
+    return auth_latencies, bystander_latencies
+
+
+def main():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk["kid"] = KID
+    server = _start_jwks_server({"keys": [public_jwk]})
+    jwks_url = f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json"
+
+    def make_tokens():
+        return [
+            jwt.encode(
+                {
+                    "sub": f"auth0|bench_{i}_{time.perf_counter_ns()}",
+                    "aud": os.environ["AUTH0_API_AUDIENCE"],
+                    "iss": os.environ["AUTH0_ISSUER"],
+                    "exp": int(time.time()) + 3600,
+                },
+                private_key,
+                algorithm="RS256",
+                headers={"kid": KID},
+            )
+            for i in range(CONCURRENCY)
+        ]
+
+    print(
+        f"concurrency={CONCURRENCY} jwks_latency={JWKS_LATENCY_SECONDS * 1000:.0f}ms\n"
+    )
+    print(
+        f"{'mode':<14}{'cache':<7}{'auth p50':>10}{'auth p99':>10}"
+        f"{'other p50':>11}{'other p99':>11}"
+    )
+    for non_blocking in (False, True):
+        for warm in (False, True):
+            verifier = VerifyToken(non_blocking=non_blocking, jwks_url=jwks_url)
+            if warm:
+                verifier.refresh_jwks()
+            auth_lat, other_lat = asyncio.run(_run_scenario(verifier, make_tokens()))
+            mode = "non-blocking" if non_blocking else "blocking"
+            print(
+                f"{mode:<14}{'warm' if warm else 'cold':<7}"
+                f"{statistics.median(auth_lat) * 1000:>8.1f}ms"
+                f"{percentile(auth_lat, 99) * 1000:>8.1f}ms"
+                f"{statistics.median(other_lat) * 1000:>9.1f}ms"
+                f"{percentile(other_lat, 99) * 1000:>9.1f}ms"
+            )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
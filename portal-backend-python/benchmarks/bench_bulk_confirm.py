@@ -0,0 +1,99 @@
+"""
+bulk_confirm.py, one lookup per line vs the staged set-based confirm.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_bulk_confirm
+
+Seeds APPLICATIONS applications in a fresh form, most of them accepted,
+and confirms IDENTIFIERS of them named half by user UUID and half by email,
+with a few unknown lines mixed in. Both versions run inside a transaction
+that is rolled back, so each starts from the same data.
+"""
+
+import random
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.common import bench_sessionmaker, bulk_insert, report, time_calls
+from bulk_confirm import confirm, is_valid_uuid
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+
+APPLICATIONS = 20_000
+IDENTIFIERS = 5_000
+UNKNOWN = 50
+RUNS = 5
+
+
+def _seed(Session, form_key):
+    rng = random.Random(5)
+    with Session() as db:
+        db.add(Form(form_key=form_key, year=2026, is_open=False))
+        db.flush()
+        users = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(APPLICATIONS)]
+        bulk_insert(db, User, users)
+        bulk_insert(db, Application, [
+            {
+                "id": uuid4(),
+                "user_id": user["id"],
+                "form_key": form_key,
+                "status": ApplicationStatus.ACCEPTED if rng.random() < 0.9 else ApplicationStatus.PENDING,
+                "submission_json": {"first_name": "Guest", "last_name": str(i), "email": f"Guest{i}@example.com"},
+            }
+            for i, user in enumerate(users)
+        ])
+        db.commit()
+        db.execute(text("ANALYZE application"))
+        db.commit()
+
+    picked = rng.sample(range(APPLICATIONS), IDENTIFIERS)
+    identifiers = [str(users[i]["id"]) if n % 2 else f"guest{i}@example.com" for n, i in enumerate(picked)]
+    identifiers[::IDENTIFIERS // UNKNOWN] = [f"nobody{i}@example.com" for i in range(UNKNOWN)]
+    return identifiers
+
+
+def _legacy_confirm(db, identifiers, form_key):
+    """The previous bulk_confirm loop: up to two queries per line."""
+    confirmed = 0
+    for identifier in identifiers:
+        application = None
+        base_query = db.query(Application).filter(Application.form_key == form_key)
+        if is_valid_uuid(identifier):
+            application = base_query.filter(Application.user_id == identifier).first()
+        if not application:
+            application = base_query.filter(
+                Application.submission_json['email'].astext.ilike(identifier)
+            ).first()
+        if application and application.status == ApplicationStatus.ACCEPTED:
+            application.status = ApplicationStatus.CONFIRMED
+            confirmed += 1
+    db.flush()
+    return confirmed
+
+
+def main():
+    Session = bench_sessionmaker()
+    form_key = f"bench-{uuid4()}"
+    identifiers = _seed(Session, form_key)
+    print(f"{APPLICATIONS} applications, {IDENTIFIERS} identifiers\n")
+
+    def rolled_back(fn):
+        def run():
+            with Session() as db:
+                result = fn(db)
+                db.rollback()
+                return result
+        return run
+
+    legacy = rolled_back(lambda db: _legacy_confirm(db, identifiers, form_key))
+    staged = rolled_back(lambda db: sum(r.confirmed for r in confirm(db, identifiers, form_key)))
+    assert legacy() == staged()
+
+    report("per-line lookups", time_calls(legacy, 1))
+    report("staged, one join + one UPDATE", time_calls(staged, RUNS))
+
+
+if __name__ == "__main__":
+    main()
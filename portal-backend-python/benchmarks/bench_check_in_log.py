@@ -0,0 +1,100 @@
+"""
+/check_in/log latency: the whole log vs keyset pages and since-polling.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_check_in_log
+
+Seeds LOG_ROWS check-ins spread over EVENTS event types (a meal, a
+workshop, swag...) and times the endpoint function:
+
+- the full log of one event and of every event, as every caller got it
+  before `limit` existed;
+- the newest page, a page deep in the log via `cursor`;
+- a `since` poll after NEW_ROWS more check-ins, what a scanner keeping its
+  list current fetches instead of the whole log.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.common import bench_sessionmaker, bulk_insert, report, time_calls
+from models.check_in_log import CheckInLog
+from models.user import User
+from routers import check_in
+from routers.identity import Principal
+
+LOG_ROWS = 50_000
+EVENTS = 10
+NEW_ROWS = 10
+PAGE_SIZE = 50
+RUNS = 20
+
+
+def _check_ins(users, event_types, start):
+    rng = random.Random(len(users))
+    return [
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "name": f"Guest {i}",
+            "event_type": event_type,
+            "check_in_time": start + timedelta(seconds=rng.randrange(36 * 3600)),
+        }
+        for event_type in event_types
+        for i, user_id in enumerate(users)
+    ]
+
+
+def _seed(Session, run):
+    attendees = LOG_ROWS // EVENTS
+    event_types = [f"bench-{run}-{n}" for n in range(EVENTS)]
+    with Session() as db:
+        for index in CheckInLog.__table__.indexes:
+            index.create(db.connection(), checkfirst=True)
+        users = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(attendees + NEW_ROWS)]
+        bulk_insert(db, User, users)
+        user_ids = [user["id"] for user in users]
+        bulk_insert(db, CheckInLog, _check_ins(user_ids[:attendees], event_types, datetime(2026, 3, 1)))
+        db.commit()
+        db.execute(text("ANALYZE check_in_log"))
+        db.commit()
+    return event_types, user_ids[attendees:]
+
+
+def main():
+    Session = bench_sessionmaker()
+    run = uuid4().hex[:8]
+    event_types, late_users = _seed(Session, run)
+    event_type = event_types[0]
+    loop = asyncio.new_event_loop()
+    principal = Principal(user=User(auth0_id="bench"))
+    print(f"{LOG_ROWS} check-ins over {EVENTS} events\n")
+
+    def get_log(db, **params):
+        params = {"event_type": None, "limit": None, "cursor": None, "since": None, **params}
+        return loop.run_until_complete(check_in.get_all_check_ins(principal=principal, db=db, **params))
+
+    with Session() as db:
+        report("full log, one event", time_calls(lambda: get_log(db, event_type=event_type), RUNS))
+        report("full log, every event", time_calls(lambda: get_log(db), RUNS // 4))
+        report(f"newest {PAGE_SIZE}", time_calls(lambda: get_log(db, event_type=event_type, limit=PAGE_SIZE), RUNS))
+
+        deep = get_log(db, event_type=event_type, limit=LOG_ROWS // EVENTS // 2).next_cursor
+        report(f"{PAGE_SIZE} from mid-log cursor", time_calls(
+            lambda: get_log(db, event_type=event_type, limit=PAGE_SIZE, cursor=deep), RUNS))
+
+        latest = get_log(db, event_type=event_type, limit=1).latest_cursor
+        bulk_insert(db, CheckInLog, _check_ins(late_users, [event_type], datetime(2026, 3, 3)))
+        db.commit()
+        page = get_log(db, event_type=event_type, limit=PAGE_SIZE, since=latest)
+        assert len(page.log) == NEW_ROWS
+        report(f"since poll, {NEW_ROWS} new", time_calls(
+            lambda: get_log(db, event_type=event_type, limit=PAGE_SIZE, since=latest), RUNS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+/check_in/dashboard latency: per-event counts and arrival histograms.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_dashboard
+
+Seeds LOG_ROWS check-ins spread over EVENTS event types and times:
+
+- what a dashboard had to do before: fetch every event's full /log and
+  count and bucket it client-side;
+- the grouped arrivals query on its own, and its plan;
+- the endpoint with its cache cold and warm.
+"""
+
+import asyncio
+from collections import Counter
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.bench_check_in_log import _seed
+from benchmarks.common import bench_async_sessionmaker, bench_sessionmaker, report, time_calls
+from models.user import User
+from routers import check_in
+from routers.identity import Principal
+
+RUNS = 20
+
+
+def main():
+    Session = bench_sessionmaker()
+    event_types, _ = _seed(Session, uuid4().hex[:8])
+    loop = asyncio.new_event_loop()
+    async_db = bench_async_sessionmaker()()
+    principal = Principal(user=User(auth0_id="bench"))
+    print(f"check-ins over {len(event_types)} events\n")
+
+    def client_side(db):
+        log = loop.run_until_complete(check_in.get_all_check_ins(
+            event_type=None, limit=None, cursor=None, since=None, principal=principal, db=db,
+        )).log
+        return Counter((row.event_type, row.time[:13]) for row in log)
+
+    def dashboard():
+        return loop.run_until_complete(check_in.get_dashboard(principal=principal, db=async_db))
+
+    def cold():
+        check_in.dashboard_cache.clear()
+        return dashboard()
+
+    with Session() as db:
+        report("full log, bucketed in Python", time_calls(lambda: client_side(db), RUNS // 4))
+        report("arrivals query", time_calls(lambda: db.execute(check_in._arrivals_statement()).all(), RUNS))
+        report("dashboard, cold cache", time_calls(cold, RUNS))
+        report("dashboard, warm cache", time_calls(dashboard, RUNS))
+        loop.run_until_complete(async_db.close())
+
+        compiled = check_in._arrivals_statement().compile(db.bind, compile_kwargs={"literal_binds": True})
+        print()
+        for (line,) in db.execute(text(f"EXPLAIN {compiled}")):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
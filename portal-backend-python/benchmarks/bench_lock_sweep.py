@@ -0,0 +1,97 @@
+"""
+Cost of releasing expired review locks, inline scan vs set-based sweep.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_lock_sweep
+
+Seeds APPLICATIONS pending applications, LOCKED of which carry a lock (a
+fraction of them expired), then measures:
+  - "next application" as it used to be: load every locked row into Python,
+    release the expired ones, then claim;
+  - "next application" now: the claim alone (expired locks are eligible);
+  - the background sweep: one UPDATE over the partial locked_at index.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from benchmarks.common import bench_sessionmaker, bulk_insert, report, time_calls
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+from routers.admin import (
+    LOCK_TIMEOUT_SECONDS,
+    _claim_next_application,
+    _is_lock_expired,
+    release_expired_locks,
+)
+
+APPLICATIONS = 10_000
+LOCKED = 2_000
+EXPIRED_EVERY = 10
+RUNS = 50
+
+
+def _legacy_release_expired_locks(db) -> None:
+    """The previous inline implementation, kept here for comparison."""
+    changed = False
+    for app in db.query(Application).filter(Application.locked_at.isnot(None)).all():
+        if _is_lock_expired(app.locked_at):
+            app.locked_by = None
+            app.locked_at = None
+            changed = True
+    if changed:
+        db.commit()
+
+
+def _seed(Session, form_key):
+    now = datetime.now(timezone.utc)
+    expired = now - timedelta(seconds=LOCK_TIMEOUT_SECONDS * 2)
+    with Session() as db:
+        db.add(Form(form_key=form_key, year=2026, is_open=True))
+        reviewer = User(auth0_id=f"auth0|bench_reviewer_{uuid4()}")
+        db.add(reviewer)
+        db.flush()
+
+        user_rows = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(APPLICATIONS)]
+        bulk_insert(db, User, user_rows)
+        app_rows = []
+        for i, user_row in enumerate(user_rows):
+            locked = i < LOCKED
+            app_rows.append({
+                "id": uuid4(),
+                "user_id": user_row["id"],
+                "form_key": form_key,
+                "status": ApplicationStatus.PENDING,
+                "submission_json": {},
+                "locked_by": reviewer.id if locked else None,
+                "locked_at": (expired if i % EXPIRED_EVERY == 0 else now) if locked else None,
+            })
+        bulk_insert(db, Application, app_rows)
+        db.commit()
+        return reviewer.id
+
+
+def main():
+    Session = bench_sessionmaker()
+    form_key = f"bench-{uuid4()}"
+    reviewer_id = _seed(Session, form_key)
+    print(f"{APPLICATIONS} applications, {LOCKED} locked ({LOCKED // EXPIRED_EVERY} expired)\n")
+
+    with Session() as db:
+        def legacy():
+            _legacy_release_expired_locks(db)
+            _claim_next_application(db, reviewer_id, form_key)
+            db.commit()
+
+        def claim_only():
+            _claim_next_application(db, reviewer_id, form_key)
+            db.commit()
+
+        report("next application (inline scan)", time_calls(legacy, RUNS))
+        report("next application (claim only)", time_calls(claim_only, RUNS))
+        report("background sweep (one UPDATE)", time_calls(lambda: release_expired_locks(db), RUNS))
+
+
+if __name__ == "__main__":
+    main()
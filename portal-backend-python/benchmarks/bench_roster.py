@@ -0,0 +1,120 @@
+"""
+Check-in lookups from the database vs the in-memory roster.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_roster
+
+For each roster size in ATTENDEES, seeds that many accepted applications
+in a fresh form and times:
+
+- name search: the search_vector query /check_in/search_users used to run,
+  vs RosterIndex.search;
+- QR validation: the application lookup /check_in/log_user used to run,
+  vs RosterIndex.get;
+- a full roster rebuild, and the memory the roster holds.
+"""
+
+import itertools
+import random
+import tracemalloc
+from uuid import uuid4
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import bench_sessionmaker, bulk_insert, report, time_calls
+from models.application import Application, ApplicationStatus, search_tsquery
+from models.form import Form
+from models.user import User
+from services import roster
+
+ATTENDEES = (1_000, 5_000, 20_000)
+RUNS = 200
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Radia", "Leslie"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Perlman", "Lamport"]
+QUERIES = ["lovel", "grace hop", "turing1", "ra"]
+
+
+def _seed(Session, form_key, count):
+    rng = random.Random(count)
+    with Session() as db:
+        db.add(Form(form_key=form_key, year=2026, is_open=True))
+        db.flush()
+        users = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(count)]
+        bulk_insert(db, User, users)
+        bulk_insert(db, Application, [
+            {
+                "id": uuid4(),
+                "user_id": user["id"],
+                "form_key": form_key,
+                "status": ApplicationStatus.ACCEPTED,
+                "submission_json": {
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": f"{rng.choice(LAST_NAMES)}{i}",
+                    "email": f"attendee{i}@example.com",
+                },
+            }
+            for i, user in enumerate(users)
+        ])
+        db.commit()
+        db.execute(text("ANALYZE application"))
+        db.commit()
+    return [user["id"] for user in users]
+
+
+def _search_vector_search(db, form_key, q):
+    """The previous /check_in/search_users query."""
+    tsquery = search_tsquery(q, names_only=True)
+    return db.query(Application).filter(
+        Application.form_key == form_key,
+        Application.status.in_(roster.ADMITTED_STATUSES),
+        Application.search_vector.op("@@")(tsquery),
+    ).order_by(
+        func.ts_rank(Application.search_vector, tsquery).desc(),
+        Application.created_at,
+    ).limit(10).all()
+
+
+def _database_lookup(db, form_key, user_id):
+    """The previous /check_in/log_user application lookup."""
+    return db.execute(select(Application).where(
+        Application.user_id == user_id,
+        Application.form_key == form_key,
+        Application.status.in_(roster.ADMITTED_STATUSES),
+    ).limit(1)).scalars().first()
+
+
+def main():
+    Session = bench_sessionmaker()
+    for count in ATTENDEES:
+        form_key = f"bench-{uuid4()}"
+        user_ids = _seed(Session, form_key, count)
+        roster.CURRENT_FORM_KEY = form_key
+        print(f"\n{count} attendees, queries {QUERIES}")
+
+        with Session() as db:
+            def rebuild():
+                roster.roster_index.clear()
+                roster.load_roster(db)
+
+            report("roster rebuild", time_calls(rebuild, 10))
+            tracemalloc.start()
+            rebuild()
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{'roster memory':<36} {size / 1024 / 1024:8.2f}MB")
+
+            queries = itertools.cycle(QUERIES)
+            report("name search, search_vector", time_calls(
+                lambda: _search_vector_search(db, form_key, next(queries)), RUNS))
+            report("name search, roster", time_calls(
+                lambda: roster.load_roster(db).search(next(queries), 10), RUNS))
+
+            ids = itertools.cycle(user_ids)
+            report("QR lookup, database", time_calls(
+                lambda: _database_lookup(db, form_key, next(ids)), RUNS))
+            report("QR lookup, roster", time_calls(
+                lambda: roster.load_roster(db).get(next(ids)), RUNS))
+
+
+if __name__ == "__main__":
+    main()
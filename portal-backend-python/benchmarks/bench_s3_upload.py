@@ -0,0 +1,144 @@
+"""
+Resume upload cost, buffered put_object on the event loop vs streamed
+uploads from worker threads, against moto's in-process S3.
+
+cd portal-backend-python
+python -m benchmarks.bench_s3_upload
+
+APPLICANTS submissions arrive at once, each carrying FILES_PER_SUBMISSION
+files of FILE_MB, spooled to disk the way Starlette hands them over. For
+each upload path we report wall time for the burst, the longest stall seen
+by a ticker task on the same loop, and (in a second, sampled run) the peak
+Python heap held by the upload path itself, excluding moto's own copies.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from uuid import uuid4
+
+import boto3
+from fastapi import UploadFile
+from moto import mock_aws
+from starlette.datastructures import Headers
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+os.environ["S3_BUCKET_NAME"] = "bench-bucket"
+
+from utils.s3 import get_s3_client, upload_files_to_s3  # noqa: E402
+
+APPLICANTS = 10
+FILES_PER_SUBMISSION = 3
+FILE_MB = 4
+SPOOL_MAX_BYTES = 1024 * 1024  # Starlette's default before rolling to disk
+
+
+def _legacy_client():
+    return boto3.client("s3", region_name=os.getenv("AWS_REGION", "us-east-1"))
+
+
+async def _legacy_upload(file: UploadFile, s3_key: str) -> str:
+    """The previous utils.s3.upload_file_to_s3: new client, full read, blocking put."""
+    s3_client = _legacy_client()
+    file_content = await file.read()
+    s3_client.put_object(
+        Bucket=os.environ["S3_BUCKET_NAME"], Key=s3_key, Body=file_content, ContentType=file.content_type
+    )
+    return s3_key
+
+
+async def _legacy_submission(files):
+    for file, key in files:
+        await _legacy_upload(file, key)
+
+
+def _make_files(payload: bytes):
+    files = []
+    for i in range(FILES_PER_SUBMISSION):
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        spooled.write(payload)
+        spooled.seek(0)
+        upload = UploadFile(
+            spooled, filename=f"file{i}.pdf", headers=Headers({"content-type": "application/pdf"})
+        )
+        files.append((upload, f"bench/{uuid4()}/file{i}.pdf"))
+    return files
+
+
+async def _burst(submit):
+    payload = os.urandom(FILE_MB * 1024 * 1024)
+    submissions = [_make_files(payload) for _ in range(APPLICANTS)]
+    await asyncio.gather(*(submit(files) for files in submissions))
+
+
+async def _latency(submit):
+    """Wall time for the burst and the longest stall seen by a ticker task."""
+    stalls = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            stalls.append(now - last - 0.005)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await _burst(submit)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(stalls)
+
+
+async def _client_memory(submit):
+    """
+    Peak heap held outside moto, sampled while the burst runs. Allocations
+    with a moto frame anywhere in their traceback are moto's stored objects
+    and request parsing, which both paths pay equally.
+    """
+    not_moto = [tracemalloc.Filter(False, "*/moto/*", all_frames=True)]
+    peak = 0
+    done = asyncio.Event()
+
+    async def sampler():
+        nonlocal peak
+        while not done.is_set():
+            snapshot = tracemalloc.take_snapshot().filter_traces(not_moto)
+            peak = max(peak, sum(stat.size for stat in snapshot.statistics("filename")))
+            await asyncio.sleep(0.02)
+
+    tracemalloc.start(64)
+    sample = asyncio.create_task(sampler())
+    await _burst(submit)
+    done.set()
+    await sample
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    total_mb = APPLICANTS * FILES_PER_SUBMISSION * FILE_MB
+    print(f"{APPLICANTS} submissions x {FILES_PER_SUBMISSION} files x {FILE_MB}MB = {total_mb}MB\n")
+    for label, submit in [
+        ("buffered put_object", _legacy_submission),
+        ("streamed, concurrent", upload_files_to_s3),
+    ]:
+        with mock_aws():
+            get_s3_client.cache_clear()
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=os.environ["S3_BUCKET_NAME"])
+            elapsed, stall = asyncio.run(_latency(submit))
+            peak = asyncio.run(_client_memory(submit))
+        print(
+            f"{label:<24} burst={elapsed * 1000:8.1f}ms  max loop stall={stall * 1000:7.1f}ms  "
+            f"peak client heap={peak / 1024 / 1024:7.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
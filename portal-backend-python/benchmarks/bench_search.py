@@ -0,0 +1,132 @@
+"""
+Applicant search latency, Python-side filtering vs the search_vector index.
+
+cd portal-backend-python
+BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_search
+
+Seeds APPLICATIONS accepted applications with synthetic names and schools,
+then times /admin/applications?search= and /check_in/search_users?q= as
+they were (load every application, filter in Python) and as they are now
+(the endpoint functions themselves: admin matching in Postgres, check-in
+against the in-memory roster).
+"""
+
+import asyncio
+import itertools
+import random
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.common import bench_async_sessionmaker, bench_sessionmaker, bulk_insert, report, time_calls
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+from routers import admin, check_in
+from routers.identity import Principal
+from services import roster
+
+APPLICATIONS = 10_000
+RUNS = 30
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Radia", "Leslie"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Perlman", "Lamport"]
+SCHOOLS = ["Tallis University", "Wexmoor College", "Northgate Institute", "Harlow Polytechnic"]
+QUERIES = ["lovel", "grace hop", "turing"]
+
+
+def _seed(Session, form_key):
+    rng = random.Random(7)
+    with Session() as db:
+        db.add(Form(form_key=form_key, year=2026, is_open=True))
+        db.flush()
+        users = [{"id": uuid4(), "auth0_id": f"auth0|bench_{uuid4()}"} for _ in range(APPLICATIONS)]
+        bulk_insert(db, User, users)
+        apps = []
+        for i, user in enumerate(users):
+            first, last = rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)}{i}"
+            apps.append({
+                "id": uuid4(),
+                "user_id": user["id"],
+                "form_key": form_key,
+                "status": ApplicationStatus.ACCEPTED,
+                "submission_json": {
+                    "first_name": first,
+                    "last_name": last,
+                    "email": f"{first.lower()}.{last.lower()}@example.com",
+                    "university": rng.choice(SCHOOLS),
+                    "major": "Computer Science",
+                    "country": "Canada",
+                },
+            })
+        bulk_insert(db, Application, apps)
+        db.commit()
+        db.execute(text("ANALYZE application"))
+        db.commit()
+
+
+def _legacy_admin_search(db, form_key, search):
+    """The previous /admin/applications search: every row, filtered in Python."""
+    result = []
+    for app in db.query(Application).filter(Application.form_key == form_key).all():
+        s = app.submission_json or {}
+        searchable = " ".join(
+            str(s.get(field, ""))
+            for field in ("first_name", "last_name", "pref_name", "email", "university", "major", "country")
+        ).lower()
+        if search.lower() in searchable:
+            result.append(app)
+    return result
+
+
+def _legacy_check_in_search(db, form_key, q):
+    """The previous /check_in/search_users: every accepted row, first 10 matches."""
+    result = []
+    for app in db.query(Application).filter(
+        Application.form_key == form_key,
+        Application.status.in_([ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED]),
+    ).all():
+        s = app.submission_json or {}
+        full_name = f"{s.get('first_name', '')} {s.get('last_name', '')}".strip().lower()
+        if q in full_name:
+            result.append(app)
+        if len(result) >= 10:
+            break
+    return result
+
+
+def main():
+    Session = bench_sessionmaker()
+    form_key = f"bench-{uuid4()}"
+    _seed(Session, form_key)
+    admin.CURRENT_FORM_KEY = check_in.CURRENT_FORM_KEY = roster.CURRENT_FORM_KEY = form_key
+    loop = asyncio.new_event_loop()
+    async_db = bench_async_sessionmaker()()
+    print(f"{APPLICATIONS} applications, queries {QUERIES}\n")
+
+    with Session() as db:
+        principal = Principal(user=User(auth0_id="bench"))
+        queries = itertools.cycle(QUERIES)
+
+        report("admin search, Python filter", time_calls(
+            lambda: _legacy_admin_search(db, form_key, next(queries)), RUNS))
+        report("admin search, search_vector", time_calls(
+            lambda: loop.run_until_complete(admin.list_applications(
+                status=None, search=next(queries), limit=None, cursor=None,
+                principal=principal, db=db,
+            )), RUNS))
+        report("admin search page, search_vector", time_calls(
+            lambda: loop.run_until_complete(admin.list_applications(
+                status=None, search=next(queries), limit=50, cursor=None,
+                principal=principal, db=db,
+            )), RUNS))
+        report("check-in search, Python filter", time_calls(
+            lambda: _legacy_check_in_search(db, form_key, next(queries)), RUNS))
+        report("check-in search, roster", time_calls(
+            lambda: loop.run_until_complete(check_in.search_users(
+                q=next(queries), principal=principal, db=async_db,
+            )), RUNS))
+        loop.run_until_complete(async_db.close())
+
+
+if __name__ == "__main__":
+    main()
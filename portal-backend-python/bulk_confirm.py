@@ -2,13 +2,23 @@
 """
 Bulk confirm accepted applications from a txt file.
 Only considers applications where form_key is "2026-cfg-application".
+
+Each line is a user UUID or an applicant email (matched case-insensitively).
+The whole file is staged in a temp table and resolved in one join, then the
+accepted applications are confirmed with one UPDATE.
+
+Usage: python bulk_confirm.py [--dry-run] <input.txt>
 """
 
 import sys
 import uuid
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import (
+    Column, Integer, MetaData, String, Table, create_engine, func, literal, select, union_all, update,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session, sessionmaker
 from models.application import Application, ApplicationStatus
 
 # Configuration from Environment
@@ -21,6 +31,25 @@ db_port = os.getenv("DB_PORT", "5432")
 DB_URL = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 FORM_KEY_FILTER = "2026-cfg-application"
 
+# One row per input line; user_id is set when the line parses as a UUID
+_input = Table(
+    "bulk_confirm_input",
+    MetaData(),
+    Column("ordinal", Integer, primary_key=True),
+    Column("identifier", String, nullable=False),
+    Column("user_id", UUID(as_uuid=True), nullable=True),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class Result(NamedTuple):
+    identifier: str
+    application_id: Optional[uuid.UUID]  # None when nothing matched
+    status: Optional[ApplicationStatus]  # status left unchanged, if skipped
+    confirmed: bool
+
+
 def is_valid_uuid(value: str) -> bool:
     try:
         uuid.UUID(value)
@@ -28,61 +57,116 @@ def is_valid_uuid(value: str) -> bool:
     except ValueError:
         return False
 
-def bulk_confirm(txt_file: str):
-    engine = create_engine(DB_URL)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    confirmed_count = 0
-    not_found_count = 0
-    not_accepted_count = 0
 
-    try:
-        with open(txt_file, 'r') as f:
-            lines = f.readlines()
-
-        for line in lines:
-            identifier = line.strip()
-            if not identifier:
+def read_identifiers(txt_file: str) -> List[str]:
+    with open(txt_file, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _resolve_statement(form_key: str):
+    """
+    (ordinal, application id, status) for every input line that matches an
+    application in `form_key`: by user UUID first, else by email, oldest
+    application first.
+    """
+    def matching(rank, onclause):
+        return (
+            select(_input.c.ordinal, Application.id, Application.status, Application.created_at, literal(rank).label("rank"))
+            .join(Application, onclause)
+            .where(Application.form_key == form_key)
+        )
+
+    matches = union_all(
+        matching(0, Application.user_id == _input.c.user_id),
+        matching(1, func.lower(Application.submission_json['email'].astext) == func.lower(_input.c.identifier)),
+    ).subquery()
+    return (
+        select(matches.c.ordinal, matches.c.id, matches.c.status)
+        .distinct(matches.c.ordinal)
+        .order_by(matches.c.ordinal, matches.c.rank, matches.c.created_at)
+    )
+
+
+def confirm(session: Session, identifiers: List[str], form_key: str = FORM_KEY_FILTER) -> List[Result]:
+    """
+    Confirm the accepted applications `identifiers` name, one Result per
+    identifier in order. An application listed twice is confirmed by its
+    first line; later lines report it as already confirmed. Does not commit.
+    """
+    connection = session.connection()
+    _input.create(connection)
+    if identifiers:
+        connection.execute(_input.insert(), [
+            {
+                "ordinal": ordinal,
+                "identifier": identifier,
+                "user_id": identifier if is_valid_uuid(identifier) else None,
+            }
+            for ordinal, identifier in enumerate(identifiers)
+        ])
+    matched: Dict[int, Tuple[uuid.UUID, ApplicationStatus]] = {
+        ordinal: (application_id, status)
+        for ordinal, application_id, status in connection.execute(_resolve_statement(form_key))
+    }
+    _input.drop(connection)
+
+    to_confirm = {
+        application_id
+        for application_id, status in matched.values()
+        if status == ApplicationStatus.ACCEPTED
+    }
+    confirmed = set()
+    if to_confirm:
+        confirmed = set(connection.execute(
+            update(Application)
+            .where(Application.id.in_(to_confirm), Application.status == ApplicationStatus.ACCEPTED)
+            .values(status=ApplicationStatus.CONFIRMED)
+            .returning(Application.id)
+        ).scalars())
+
+    results = []
+    reported = set()
+    for ordinal, identifier in enumerate(identifiers):
+        if ordinal not in matched:
+            results.append(Result(identifier, None, None, False))
+            continue
+        application_id, status = matched[ordinal]
+        if application_id in confirmed:
+            if application_id in reported:
+                status = ApplicationStatus.CONFIRMED
+            else:
+                reported.add(application_id)
+                results.append(Result(identifier, application_id, None, True))
                 continue
+        results.append(Result(identifier, application_id, status, False))
+    return results
 
-            application = None
-
-            # Base query with the specific form_key filter
-            base_query = session.query(Application).filter(Application.form_key == FORM_KEY_FILTER)
-
-            if is_valid_uuid(identifier):
-                # Search by UUID + Form Key
-                application = base_query.filter(Application.user_id == identifier).first()
-            
-            if not application:
-                # Search by email inside submission_json + Form Key
-                # PostgreSQL specific JSONB query; if using SQLite/other, you might need app.submission_json['email'].astext
-                application = base_query.filter(
-                    Application.submission_json['email'].astext.ilike(identifier)
-                ).first()
-
-            if not application:
-                print(f"NOT FOUND or WRONG FORM: {identifier}")
-                not_found_count += 1
-                continue
-
-            # Check status
-            if application.status != ApplicationStatus.ACCEPTED:
-                print(f"SKIPPED (status={application.status.value}): {identifier}")
-                not_accepted_count += 1
-                continue
 
-            # Update status
-            application.status = ApplicationStatus.CONFIRMED
-            print(f"CONFIRMED: {identifier} (app_id: {application.id})")
-            confirmed_count += 1
+def bulk_confirm(txt_file: str, dry_run: bool = False):
+    engine = create_engine(DB_URL)
+    Session = sessionmaker(bind=engine)
+    session = Session()
 
-        session.commit()
-        print(f"\n--- Summary ({FORM_KEY_FILTER}) ---")
-        print(f"Confirmed: {confirmed_count}")
-        print(f"Not found/Wrong form: {not_found_count}")
-        print(f"Not accepted (skipped): {not_accepted_count}")
+    try:
+        results = confirm(session, read_identifiers(txt_file))
+
+        for result in results:
+            if result.application_id is None:
+                print(f"NOT FOUND or WRONG FORM: {result.identifier}")
+            elif not result.confirmed:
+                print(f"SKIPPED (status={result.status.value}): {result.identifier}")
+            else:
+                verb = "WOULD CONFIRM" if dry_run else "CONFIRMED"
+                print(f"{verb}: {result.identifier} (app_id: {result.application_id})")
+
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+        print(f"\n--- Summary ({FORM_KEY_FILTER}){' [dry run, nothing saved]' if dry_run else ''} ---")
+        print(f"Confirmed: {sum(result.confirmed for result in results)}")
+        print(f"Not found/Wrong form: {sum(result.application_id is None for result in results)}")
+        print(f"Not accepted (skipped): {sum(result.status is not None for result in results)}")
 
     except Exception as e:
         session.rollback()
@@ -92,8 +176,12 @@ def bulk_confirm(txt_file: str):
         session.close()
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python bulk_confirm.py <input.txt>")
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    if dry_run:
+        args.remove("--dry-run")
+    if len(args) != 1:
+        print("Usage: python bulk_confirm.py [--dry-run] <input.txt>")
         sys.exit(1)
 
-    bulk_confirm(sys.argv[1])
\ No newline at end of file
+    bulk_confirm(args[0], dry_run=dry_run)
@@ -1,7 +1,17 @@
+from contextlib import contextmanager
+
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import greenlet_spawn
 from sqlalchemy.orm import sessionmaker
 from models.base import Base
+from routers.identity import role_cache
+from routers.application import question_cache
+from routers.check_in import dashboard_cache
+from services.roster import roster_index
+from utils.s3 import get_s3_client
 from pytest_postgresql.janitor import DatabaseJanitor
 
 
@@ -54,3 +64,116 @@ def test_session(test_sessionmaker):
     finally:
         session.rollback()
         session.close()
+
+
+class _TestAsyncSession(AsyncSession):
+    """Commits keep attributes loaded, like AsyncSessionLocal's sessions."""
+
+    async def execute(self, statement, params=None, **kw):
+        # AsyncSession soft-closes raw cursor results through the async
+        # driver's cursor, which the sync one behind test_session lacks;
+        # buffer their rows instead
+        result = await greenlet_spawn(self.sync_session.execute, statement, params, **kw)
+        if isinstance(result, CursorResult) and result.returns_rows:
+            return result.freeze()()
+        return result
+
+    async def commit(self) -> None:
+        self.sync_session.expire_on_commit = False
+        try:
+            await super().commit()
+        finally:
+            self.sync_session.expire_on_commit = True
+
+
+@pytest.fixture
+def test_async_session(test_session):
+    """
+    An AsyncSession proxying test_session, for endpoints on get_async_db.
+    Queries run on the same connection and savepoint, so fixture data is
+    visible and rolled back the same way.
+    """
+    return _TestAsyncSession(sync_session_class=lambda **_: test_session)
+
+
+@pytest.fixture
+def query_log(test_session):
+    """
+    Record every SQL statement issued through the test engine.
+    Savepoint bookkeeping from the test harness is not counted.
+    """
+    statements = []
+    engine = test_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def query_budget(query_log):
+    """
+    Fail the test when a block issues more SQL statements than budgeted:
+
+        with query_budget(3):
+            client.get("/admin/stats", params=...)
+
+    Budgets are upper bounds, so an endpoint can get cheaper without
+    touching its test, but an N+1 slipping in fails CI.
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        start = len(query_log)
+        yield
+        issued = query_log[start:]
+        if len(issued) > max_queries:
+            listing = "\n".join(f"  {' '.join(q.split())[:200]}" for q in issued)
+            pytest.fail(f"{len(issued)} queries issued, budget is {max_queries}:\n{listing}")
+
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def clear_role_cache():
+    """Roles are granted directly in fixtures, bypassing cache invalidation."""
+    role_cache.clear()
+    yield
+    role_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_question_cache():
+    """Each test's forms and questions are rolled back afterwards."""
+    question_cache.clear()
+    yield
+    question_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_dashboard_cache():
+    """Each test's check-ins are rolled back afterwards."""
+    dashboard_cache.clear()
+    yield
+    dashboard_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_roster():
+    """Each test's applications are rolled back afterwards."""
+    roster_index.clear()
+    yield
+    roster_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_s3_client():
+    """The shared S3 client must be created inside each test's moto mock."""
+    get_s3_client.cache_clear()
+    yield
+    get_s3_client.cache_clear()
@@ -1,6 +1,14 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from utils.metrics import Histogram
 
 db_host = os.getenv("DB_HOST")
 db_user = os.getenv("DB_USER")
@@ -8,15 +16,104 @@ db_password = os.getenv("DB_PASSWORD")
 db_name = os.getenv("DB_NAME")
 db_port = os.getenv("DB_PORT", "5432")
 
+# asyncio driver for the AsyncEngine; psycopg 3 ships one natively
+db_async_driver = os.getenv("DB_ASYNC_DRIVER", "psycopg_async")
+
 DB_URL = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+ASYNC_DB_URL = f"postgresql+{db_async_driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+# Per engine: the sync and async engines each keep a pool of this shape
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Retire connections before server-side idle timeouts, and so none outlive
+# an RDS failover for long; pre-ping replaces any that went stale anyway
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+class PoolStats:
+    """Checkout wait times, timeouts and invalidated connections for a pool."""
+
+    def __init__(self):
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+
+class _TimedCheckout:
+    """Pool mixin that times every checkout, including waits for a free slot."""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.stats = PoolStats()
+        # Pre-ping failures and errors that drop a connection; pools made by
+        # recreate() inherit this listener through _dispatch
+        if kw.get("_dispatch") is None:
+            stats = self.stats
+            event.listen(self, "invalidate", lambda *_: stats.record_invalidation())
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            self.stats.wait_seconds.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
 
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 
 engine = create_engine(
     DB_URL,
+    poolclass=TimedQueuePool,
+    **POOL_OPTIONS,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    ASYNC_DB_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **POOL_OPTIONS,
+)
+
+# Attributes can't lazy-load from async code, so keep them after commit
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db() -> Session:
     """
@@ -30,6 +127,16 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    """
+    Dependency function to get a non-blocking database session.
+    Use this in async FastAPI endpoints with Depends(get_async_db)
+    and await every query.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_local_session() -> Session:
     """
     Get a database session directly.
@@ -37,3 +144,24 @@ def get_local_session() -> Session:
     Remember to close the session when done!
     """
     return SessionLocal()
+
+
+def describe_pool(pool) -> Dict[str, Any]:
+    """Point-in-time usage of a TimedQueuePool plus its cumulative stats."""
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow from -size until the pool has filled up
+        "overflow": max(pool.overflow(), 0),
+        "timeouts": pool.stats.timeouts,
+        "invalidations": pool.stats.invalidations,
+        "wait_seconds": pool.stats.wait_seconds.snapshot(),
+    }
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Usage of the application's sync and async connection pools."""
+    return {
+        "sync": describe_pool(engine.pool),
+        "async": describe_pool(async_engine.sync_engine.pool),
+    }
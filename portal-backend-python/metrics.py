@@ -0,0 +1,221 @@
+"""
+Process metrics, served on /metrics in the Prometheus text format.
+
+MetricsMiddleware records every HTTP request by route template (never the
+raw path, so ids don't explode the label space), together with how many
+SQL statements it issued and how long they took. Routers bump the domain
+counters below; check-ins are labelled only by the event types in
+CHECK_IN_EVENT_TYPES, since clients choose the event type freely. Each worker process keeps its own numbers; Prometheus sums
+them across targets.
+
+Statements slower than SLOW_QUERY_MS, and requests issuing more than
+REQUEST_QUERY_WARNING statements (usually an N+1), are logged with their
+route.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from db import async_engine, engine, pool_stats
+from utils.metrics import Registry
+
+logger = logging.getLogger(__name__)
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# 0 disables either log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+REQUEST_QUERY_WARNING = int(os.getenv("REQUEST_QUERY_WARNING", "50"))
+
+# Left out of the in-flight gauge and the latency histogram (still counted
+# in http_requests_total): the scrape itself and hours-long event streams.
+# Any other text/event-stream response is dropped from them once it starts.
+UNTIMED_PATHS = frozenset({"/metrics", "/check_in/stream"})
+
+# Statement counts per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# The scanner's event menu; any other event type is counted as "other"
+CHECK_IN_EVENT_TYPES = frozenset(
+    os.getenv("CHECK_IN_EVENT_TYPES", "check-in,lunch,dinner,brekky").split(",")
+)
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests handled, by route and status.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request.", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method",)
+)
+HTTP_REQUEST_DB_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries", "SQL statements issued while handling a request.", ("route",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = REGISTRY.histogram(
+    "http_request_db_seconds", "Time spent in SQL statements while handling a request.", ("route",)
+)
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds", "Time to execute one SQL statement.", ("engine",)
+)
+
+CHECK_INS = REGISTRY.counter("check_ins_total", "Successful check-ins.", ("event_type",))
+DECISIONS = REGISTRY.counter("application_decisions_total", "Reviewer decisions.", ("decision",))
+SUBMISSIONS = REGISTRY.counter("application_submissions_total", "Applications submitted.", ("form_key",))
+
+
+def check_in_event_label(event_type: str) -> str:
+    """The check_ins_total label for `event_type`."""
+    return event_type if event_type in CHECK_IN_EVENT_TYPES else "other"
+
+
+class _DbUsage:
+    __slots__ = ("scope", "queries", "seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.seconds = 0.0
+
+    def describe(self) -> str:
+        return f"{self.scope['method']} {_route_label(self.scope)}"
+
+
+# Set by the middleware for the duration of each request. Starlette's
+# threadpool and SQLAlchemy's async greenlets both carry it along.
+_request_db_usage: ContextVar[Optional[_DbUsage]] = ContextVar("request_db_usage", default=None)
+
+
+_engine_hooks: Dict[Engine, List[Tuple[str, Callable]]] = {}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _query_finished(conn, engine_name: str, statement: str) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERY_DURATION.labels(engine_name).observe(elapsed)
+    usage = _request_db_usage.get()
+    if usage is not None:
+        usage.queries += 1
+        usage.seconds += elapsed
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        # Parameters are left out; they carry applicant data
+        logger.warning(
+            "Slow query (%.0fms) in %s: %s",
+            elapsed * 1000, usage.describe() if usage else "background task", " ".join(statement.split())[:2000],
+        )
+
+
+def instrument_engine(target: Engine, engine_name: str) -> None:
+    """Time every statement run on `target` and charge it to the current request."""
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _query_finished(conn, engine_name, statement)
+
+    def handle_error(exception_context):
+        if exception_context.connection is not None:
+            _query_finished(exception_context.connection, engine_name, exception_context.statement or "")
+
+    hooks = [
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", after_cursor_execute),
+        ("handle_error", handle_error),
+    ]
+    for name, fn in hooks:
+        event.listen(target, name, fn)
+    _engine_hooks[target] = hooks
+
+
+def uninstrument_engine(target: Engine) -> None:
+    for name, fn in _engine_hooks.pop(target, []):
+        event.remove(target, name, fn)
+
+
+def _route_label(scope) -> str:
+    # Static files and 404s match no API route
+    route = scope.get("route")
+    return getattr(route, "path", None) or "other"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and DB usage per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        timed = scope["path"] not in UNTIMED_PATHS
+
+        async def send_with_status(message):
+            nonlocal status, timed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers") or ()).get(b"content-type", b"")
+                if timed and content_type.startswith(b"text/event-stream"):
+                    timed = False
+                    in_flight.dec()
+            await send(message)
+
+        usage = _DbUsage(scope)
+        token = _request_db_usage.set(usage)
+        if timed:
+            in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_db_usage.reset(token)
+            route = _route_label(scope)
+            HTTP_REQUESTS.labels(method, route, status).inc()
+            if timed:
+                in_flight.dec()
+                HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUEST_DB_QUERIES.labels(route).observe(usage.queries)
+            HTTP_REQUEST_DB_SECONDS.labels(route).observe(usage.seconds)
+            if REQUEST_QUERY_WARNING and usage.queries > REQUEST_QUERY_WARNING:
+                logger.warning(
+                    "%s issued %d queries (%.0fms in the database)",
+                    usage.describe(), usage.queries, usage.seconds * 1000,
+                )
+
+
+@REGISTRY.collector
+def _collect_pools():
+    pools = pool_stats()
+
+    def per_pool(key):
+        return [({"pool": name}, stats[key]) for name, stats in pools.items()]
+
+    return [
+        ("db_pool_size", "gauge", "Connections the pool keeps open.", per_pool("size")),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out.", per_pool("checked_out")),
+        ("db_pool_overflow", "gauge", "Connections open beyond the pool size.", per_pool("overflow")),
+        ("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up waiting.", per_pool("timeouts")),
+        ("db_pool_invalidations_total", "counter", "Connections discarded as broken or stale.",
+         per_pool("invalidations")),
+        ("db_pool_checkout_wait_seconds", "histogram", "Time to check a connection out of the pool.",
+         per_pool("wait_seconds")),
+    ]
+
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
@@ -7,6 +7,7 @@ from .application import Application
 from .check_in_log import CheckInLog
 from .admin_user import AdminUser  # Deprecated - to be removed after migration
 from .user_role import UserRole, RoleEnum
+from .upload_outbox import UploadOutbox
 
 # should this be dynamically generated?
-__all__ = ["Base", "User", "Form", "Question", "Response", "Application", "CheckInLog", "AdminUser", "UserRole", "RoleEnum"]
+__all__ = ["Base", "User", "Form", "Question", "Response", "Application", "CheckInLog", "AdminUser", "UserRole", "RoleEnum", "UploadOutbox"]
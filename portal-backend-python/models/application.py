@@ -1,11 +1,29 @@
 from sqlalchemy import text
-from sqlalchemy import Column, ForeignKey, String, DateTime, Enum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Computed, ForeignKey, String, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from models.base import Base
 import enum
+import re
 from sqlalchemy import func
 
 
+def _submission_text(*fields: str) -> str:
+    return " || ' ' || ".join(f"coalesce(submission_json->>'{field}', '')" for field in fields)
+
+
+# Names carry weight A so name-only searches (manual check-in) can restrict
+# to them; everything else the applicants table searches on is weight B.
+# The parser keeps an email as one token, so its parts are indexed instead:
+# search_tsquery splits "ada@duke.edu" into ada & duke & edu.
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('simple'::regconfig, {_submission_text('first_name', 'last_name')}), 'A')"
+    f" || setweight(to_tsvector('simple'::regconfig, "
+    f"{_submission_text('pref_name', 'university', 'major', 'country')} || ' ' || "
+    f"regexp_replace(coalesce(submission_json->>'email', ''), '[@.]', ' ', 'g')), 'B')"
+)
+
+
 class ApplicationStatus(enum.Enum):
     PENDING = "pending"
     ACCEPTED = "accepted"
@@ -47,4 +65,39 @@ class Application(Base):
     )  # FK to admin user who made the decision
     decided_at = Column(
         DateTime, nullable=True
-    )  # Timestamp when decision was made
\ No newline at end of file
+    )  # Timestamp when decision was made
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True
+    ))  # derived from submission_json, searched with search_tsquery()
+
+    __table_args__ = (
+        # Partial index for the expired-lock sweep; only apps that are (or
+        # were) locked carry a locked_at
+        Index(
+            "ix_application_locked_at",
+            "locked_at",
+            postgresql_where=locked_at.isnot(None),
+        ),
+        # Keyset pagination of the admin applicants list
+        Index(
+            "ix_application_form_key_created_at_id",
+            "form_key",
+            created_at.desc(),
+            id.desc(),
+        ),
+        Index("ix_application_search_vector", search_vector, postgresql_using="gin"),
+        # Check-in's per-scan status lookup
+        Index("ix_application_user_id_form_key", "user_id", "form_key"),
+    )
+
+
+def search_tsquery(term: str, names_only: bool = False):
+    """
+    Prefix tsquery matching every word of `term`, e.g. "ada lov" matches
+    "Ada Lovelace". Returns None when `term` has no searchable words.
+    """
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+    weight = "A" if names_only else ""
+    return func.to_tsquery("simple", " & ".join(f"{word}:*{weight}" for word in words))
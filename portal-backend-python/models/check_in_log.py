@@ -1,4 +1,4 @@
-from sqlalchemy import text, Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import text, Column, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 from models.base import Base
@@ -17,6 +17,15 @@ class CheckInLog(Base):
     check_in_time = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
 
     __table_args__ = (
-        Index('ix_check_in_event_type', 'event_type'),
-        Index('ix_check_in_user_id', 'user_id'),
+        # Serves per-event lookups and the not-checked-in anti-join
+        Index('ix_check_in_event_type_user_id', 'event_type', 'user_id'),
+        # Keyset pages of an event's log, newest first
+        Index(
+            'ix_check_in_event_type_check_in_time_id',
+            'event_type',
+            check_in_time.desc(),
+            id.desc(),
+        ),
+        # One check-in per user per event; also serves lookups by user_id
+        UniqueConstraint('user_id', 'event_type', name='uq_check_in_user_event'),
     )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import text
+from sqlalchemy import text, false
 from sqlalchemy import Column, Text, Boolean, ForeignKey, Integer, Float
 from sqlalchemy.dialects.postgresql import UUID
 from models.base import Base
@@ -29,3 +29,6 @@ class Response(Base):
     int_answer = Column(Integer, nullable=True)
     float_answer = Column(Float, nullable=True)
     file_s3_key = Column(String, nullable=True)
+    upload_pending = Column(
+        Boolean, nullable=False, server_default=false()
+    )  # file_s3_key is reserved but the upload is still queued in upload_outbox
@@ -0,0 +1,33 @@
+from sqlalchemy import text, Column, String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import func
+from models.base import Base
+
+
+class UploadOutbox(Base):
+    """
+    A submitted file staged on local disk and still waiting to reach S3.
+    The row is committed with the submission and deleted once the upload
+    succeeds; next_attempt_at doubles as the lease held by the worker
+    currently uploading it.
+    """
+
+    __tablename__ = "upload_outbox"
+
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()")
+    )
+    response_id = Column(
+        UUID(as_uuid=True), ForeignKey("response.id", ondelete="CASCADE"), nullable=False
+    )
+    s3_key = Column(String, nullable=False)
+    staged_path = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    next_attempt_at = Column(DateTime, nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_upload_outbox_next_attempt_at", "next_attempt_at"),
+    )
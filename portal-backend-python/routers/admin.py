@@ -1,45 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, Security, Form
+from fastapi import APIRouter, Depends, HTTPException, Security, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Dict, Any, Optional
+from sqlalchemy import func, or_, select, tuple_, update
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from urllib.parse import quote, unquote
+import asyncio
+import base64
+import logging
+import os
+import threading
+import time
 import uuid as uuid_lib
+from collections import Counter
 
-from auth import VerifyToken
-from db import get_db
+from fastapi.concurrency import run_in_threadpool
+
+from auth import get_verifier
+from db import get_async_db, get_db, get_local_session, pool_stats
 from models.user import User
-from models.user_role import UserRole, RoleEnum
-from models.application import Application, ApplicationStatus
+from models.user_role import RoleEnum
+from models.application import Application, ApplicationStatus, search_tsquery
 from models.response import Response
 from models.form import Form as Form1
 from pydantic import BaseModel
 from services.google_sheets import export_applicants_to_sheets
-
-
-def _user_has_role(db: Session, user_id: UUID, role: RoleEnum) -> bool:
-    """Check if a user has a specific role."""
-    return db.query(UserRole).filter(
-        UserRole.user_id == user_id,
-        UserRole.role == role
-    ).first() is not None
-
-
-def _require_admin(db: Session, user_id: UUID) -> None:
-    """Raise HTTPException if user is not an admin."""
-    if not _user_has_role(db, user_id, RoleEnum.ADMIN):
-        raise HTTPException(status_code=403, detail="User is not an admin")
+from metrics import DECISIONS
+from routers.identity import (
+    Principal,
+    load_principal,
+    get_principal,
+    get_admin_principal,
+    get_session_principal,
+    get_admin_session_principal,
+    get_async_admin_session_principal,
+)
 
 router = APIRouter()
-auth = VerifyToken()
+auth = get_verifier()
+logger = logging.getLogger(__name__)
 
 # Constants
 LOCK_TIMEOUT_HOURS = 1
 LOCK_TIMEOUT_SECONDS = LOCK_TIMEOUT_HOURS * 3600
+LOCK_REAPER_INTERVAL_SECONDS = int(os.getenv("LOCK_REAPER_INTERVAL_SECONDS", "60"))
+# 0 disables the in-memory /stats snapshot and counts on every request
+ADMIN_STATS_SNAPSHOT_SECONDS = float(os.getenv("ADMIN_STATS_SNAPSHOT_SECONDS", "0"))
 CURRENT_FORM_KEY = "2026-cfg-application"
 RESUME_QUESTION_ID = "0f9782ba-7b18-418d-90ad-ec13a9b467c5"
 RESUME_S3_BASE_URL = "https://hackathon-resume-bucket.s3.us-east-2.amazonaws.com/"
+APPLICATIONS_MAX_PAGE_SIZE = 500
 
 
 class AdminCheckResponse(BaseModel):
@@ -56,6 +67,8 @@ class ApplicationResponse(BaseModel):
     submission_json: Optional[Dict[str, Any]]
     created_at: str
     resume_url: Optional[str] = None
+    # The resume is still queued for S3; resume_url is None until it lands
+    upload_pending: bool = False
 
     class Config:
         from_attributes = True
@@ -70,6 +83,25 @@ class AdminStatsResponse(BaseModel):
     user_rejected: int
 
 
+class PoolWaitHistogram(BaseModel):
+    buckets: List[Tuple[float, int]]  # (upper bound in seconds, cumulative count)
+    sum: float
+    count: int
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    timeouts: int
+    invalidations: int
+    wait_seconds: PoolWaitHistogram
+
+
+class DbPoolStatsResponse(BaseModel):
+    pools: Dict[str, PoolStatsResponse]
+
+
 class DecisionRequest(BaseModel):
     decision: str  # "accept", "reject", or "pending"
 
@@ -104,6 +136,7 @@ class ApplicationListItem(BaseModel):
 class ApplicationListResponse(BaseModel):
     applications: list[ApplicationListItem]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class SingleApplicationResponse(BaseModel):
@@ -114,6 +147,7 @@ class SingleApplicationResponse(BaseModel):
     submission_json: Optional[Dict[str, Any]]
     created_at: str
     resume_url: Optional[str] = None
+    upload_pending: bool = False
     is_locked_by_other: bool = False
     locked_by_email: Optional[str] = None
 
@@ -131,42 +165,173 @@ def _is_lock_expired(locked_at: Optional[datetime]) -> bool:
     return datetime.now(timezone.utc) - locked_at > timedelta(seconds=LOCK_TIMEOUT_SECONDS)
 
 
-def _release_expired_locks(db: Session) -> None:
-    """Release all locks that have timed out, including skipped apps."""
-    # Find apps with locked_at set (either locked or skipped)
-    apps_with_lock_time = db.query(Application).filter(
-        Application.locked_at.isnot(None)
-    ).all()
+def release_expired_locks(db: Session) -> int:
+    """
+    Release all locks that have timed out, including skipped apps, with a
+    single set-based UPDATE backed by the partial index on locked_at.
+    Returns the number of applications released.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=LOCK_TIMEOUT_SECONDS)
+    result = db.execute(
+        update(Application)
+        .where(Application.locked_at < cutoff)
+        .values(locked_by=None, locked_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
 
-    changed = False
-    for app in apps_with_lock_time:
-        if _is_lock_expired(app.locked_at):
-            app.locked_by = None
-            app.locked_at = None
-            changed = True
 
-    if changed:
-        db.commit()
+async def reap_expired_locks_periodically() -> None:
+    """Background task that sweeps expired locks off the request path."""
+    def sweep() -> int:
+        db = get_local_session()
+        try:
+            return release_expired_locks(db)
+        finally:
+            db.close()
 
+    while True:
+        try:
+            await run_in_threadpool(sweep)
+        except Exception as error:
+            logger.warning("Expired lock sweep failed: %s", error)
+        await asyncio.sleep(LOCK_REAPER_INTERVAL_SECONDS)
 
-def _invalidate_other_sessions(
-    db: Session, user_id: UUID, new_session_id: str
-) -> None:
-    """Invalidate all other sessions for this user."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        user.current_session_id = new_session_id
-        db.commit()
 
+def _claim_next_application_statement(user_id: UUID, form_key: str = CURRENT_FORM_KEY):
+    """
+    Atomically claim the next PENDING application for a reviewer.
+
+    A single UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED)
+    RETURNING, so concurrent reviewers are handed distinct applications
+    instead of racing for the same row. Apps that are unlocked, locked by
+    this reviewer, or whose lock has expired are eligible; locked_at NULLS
+    FIRST sends skipped apps to the back of the queue.
+    """
+    lock_cutoff = datetime.now(timezone.utc) - timedelta(seconds=LOCK_TIMEOUT_SECONDS)
+    candidate = (
+        select(Application.id)
+        .where(Application.form_key == form_key)
+        .where(Application.status == ApplicationStatus.PENDING)
+        .where(
+            or_(
+                Application.locked_by.is_(None),
+                Application.locked_by == user_id,
+                Application.locked_at < lock_cutoff,
+            )
+        )
+        .order_by(Application.locked_at.asc().nullsfirst())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(Application)
+        .where(Application.id == candidate)
+        .values(locked_by=user_id, locked_at=datetime.now(timezone.utc))
+        .returning(Application)
+        .execution_options(synchronize_session=False)
+    )
 
-def _validate_session(
-    db: Session, user_id: UUID, session_id: str
-) -> bool:
-    """Validate that the session is still active."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or user.current_session_id != session_id:
-        return False
-    return True
+
+def _claim_next_application(
+    db: Session, user_id: UUID, form_key: str = CURRENT_FORM_KEY
+) -> Optional[Application]:
+    return db.execute(_claim_next_application_statement(user_id, form_key)).scalars().first()
+
+
+def _count_by_status_statement(user_id: UUID, form_key: str = CURRENT_FORM_KEY):
+    """
+    Global and per-admin application counts by status, from a single
+    GROUP BY status, (decided_by = :user_id) aggregate.
+    """
+    mine = func.coalesce(Application.decided_by == user_id, False).label("mine")
+    return (
+        select(Application.status, mine, func.count())
+        .where(Application.form_key == form_key)
+        .group_by(Application.status, mine)
+    )
+
+
+def _tally_by_status(rows) -> Tuple[Counter, Counter]:
+    totals, user_totals = Counter(), Counter()
+    for status, is_mine, count in rows:
+        totals[status] += count
+        if is_mine:
+            user_totals[status] += count
+    return totals, user_totals
+
+
+def _resume_link(resume_response: Optional[Response]) -> Tuple[Optional[str], bool]:
+    """
+    (resume_url, upload_pending) for an application's resume answer. A
+    deferred upload gets no URL until the outbox has put it on S3.
+    """
+    if not resume_response or not resume_response.file_s3_key:
+        return None, False
+    if resume_response.upload_pending:
+        return None, True
+    return RESUME_S3_BASE_URL + quote(resume_response.file_s3_key, safe='/'), False
+
+
+class StatsSnapshot:
+    """
+    Process-local copy of the /stats counts for the current form.
+
+    Global counts and each admin's counts expire independently after
+    ttl_seconds; the decision endpoint applies its own status changes in
+    place, so only decisions made through other workers lag behind.
+    """
+
+    GLOBAL = "global"
+
+    def __init__(self, ttl_seconds: float = ADMIN_STATS_SNAPSHOT_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._counts: Dict[Any, Tuple[float, Counter]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key) -> Optional[Counter]:
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._counts.pop(key, None)
+                return None
+            return Counter(entry[1])
+
+    def set(self, key, counts: Counter) -> None:
+        with self._lock:
+            self._counts[key] = (time.monotonic() + self.ttl_seconds, Counter(counts))
+
+    def record_decision(
+        self,
+        before: Tuple[ApplicationStatus, Optional[UUID]],
+        after: Tuple[ApplicationStatus, Optional[UUID]],
+    ) -> None:
+        """Move one application between (status, decided_by) buckets."""
+        if before == after:
+            return
+        (old_status, old_decider), (new_status, new_decider) = before, after
+        with self._lock:
+            if self.GLOBAL in self._counts:
+                counts = self._counts[self.GLOBAL][1]
+                counts[old_status] -= 1
+                counts[new_status] += 1
+            if old_decider in self._counts:
+                self._counts[old_decider][1][old_status] -= 1
+            if new_decider in self._counts:
+                self._counts[new_decider][1][new_status] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+stats_snapshot = StatsSnapshot()
 
 
 @router.post("/auth/check", response_model=AdminCheckResponse)
@@ -183,103 +348,61 @@ async def check_admin_status(
     if not auth0_id:
         raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
 
-    # Get or create user
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
+    # Get or create user, along with all of their roles
+    principal = load_principal(db, auth0_id)
+    if not principal:
         user = User(auth0_id=auth0_id)
         db.add(user)
-        db.flush()
+        db.commit()
+        return AdminCheckResponse(is_admin=False, roles=[])
 
-    # Get all roles for this user
-    user_roles = db.query(UserRole).filter(UserRole.user_id == user.id).all()
-    role_names = [ur.role.value for ur in user_roles]
-    is_admin = RoleEnum.ADMIN.value in role_names
-    has_any_role = len(role_names) > 0
+    user = principal.user
+    role_names = sorted(role.value for role in principal.roles)
+    is_admin = principal.has_role(RoleEnum.ADMIN)
 
-    if not has_any_role:
-        db.commit()
+    if not role_names:
         return AdminCheckResponse(is_admin=False, roles=[])
 
     # Release any locks held by this user (e.g., from a previous abruptly closed session)
     locked_apps = db.query(Application).filter(Application.locked_by == user.id).all()
-    if locked_apps:
-        for app in locked_apps:
-            app.locked_by = None
-            app.locked_at = None
-        db.commit()
+    for app in locked_apps:
+        app.locked_by = None
+        app.locked_at = None
 
-    # Create new session ID and invalidate other sessions
+    # Create new session ID, which invalidates all other sessions
     new_session_id = str(uuid_lib.uuid4())
-    _invalidate_other_sessions(db, user.id, new_session_id)
+    user.current_session_id = new_session_id
+    db.commit()
 
     return AdminCheckResponse(is_admin=is_admin, roles=role_names, session_id=new_session_id)
 
 
 @router.get("/next-application", response_model=ApplicationResponse)
 async def get_next_application(
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_async_admin_session_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get the next PENDING application for judging.
     Locks it to the current admin user.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
-    # Release expired locks
-    _release_expired_locks(db)
-
-    # Get next PENDING application (not locked, or locked by this user)
-    # Only from the current form
-    # Order by locked_at NULLS FIRST so skipped apps go to back of queue
-    next_app = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(Application.status == ApplicationStatus.PENDING)
-        .filter(
-            or_(
-                Application.locked_by.is_(None),
-                Application.locked_by == user.id,
-            )
-        )
-        .order_by(Application.locked_at.asc().nullsfirst())
-        .first()
-    )
+    user = principal.user
 
+    # Claim the next PENDING application from the current form and lock it to this user
+    result = await db.execute(_claim_next_application_statement(user.id))
+    next_app = result.scalars().first()
     if not next_app:
         raise HTTPException(status_code=404, detail="No pending applications")
-
-    # Lock the application to this user
-    next_app.locked_by = user.id
-    next_app.locked_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
 
     # Fetch resume URL if available
-    resume_url = None
-    resume_response = (
-        db.query(Response)
-        .filter(Response.application_id == next_app.id)
-        .filter(Response.question_id == UUID(RESUME_QUESTION_ID))
-        .first()
+    result = await db.execute(
+        select(Response)
+        .where(Response.application_id == next_app.id)
+        .where(Response.question_id == UUID(RESUME_QUESTION_ID))
+        .limit(1)
     )
-    if resume_response and resume_response.file_s3_key:
-        # normalized_key = unquote(resume_response.file_s3_key)
-        encoded_key = quote(resume_response.file_s3_key, safe='/')
-        resume_url = RESUME_S3_BASE_URL + encoded_key
+    resume_url, upload_pending = _resume_link(result.scalars().first())
 
     return ApplicationResponse(
         id=str(next_app.id),
@@ -289,6 +412,7 @@ async def get_next_application(
         submission_json=next_app.submission_json,
         created_at=next_app.created_at.isoformat(),
         resume_url=resume_url,
+        upload_pending=upload_pending,
     )
 
 
@@ -296,27 +420,13 @@ async def get_next_application(
 async def submit_decision(
     app_id: str,
     decision_request: DecisionRequest,
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """
     Submit a decision (accept/reject/pending) on an application.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
+    user = principal.user
 
     # Get application
     try:
@@ -333,6 +443,7 @@ async def submit_decision(
         raise HTTPException(status_code=403, detail="You do not have the lock on this application")
 
     # Process decision
+    before = (app.status, app.decided_by)
     decision = decision_request.decision.lower()
     if decision == "accept":
         app.status = ApplicationStatus.ACCEPTED
@@ -351,6 +462,9 @@ async def submit_decision(
         app.locked_by = None
         app.locked_at = datetime.now(timezone.utc)
         db.commit()
+        DECISIONS.labels(decision).inc()
+        if app.form_key == CURRENT_FORM_KEY:
+            stats_snapshot.record_decision(before, (app.status, app.decided_by))
         return ApplicationResponse(
             id=str(app.id),
             user_id=str(app.user_id),
@@ -366,6 +480,9 @@ async def submit_decision(
     app.locked_by = None
     app.locked_at = None
     db.commit()
+    DECISIONS.labels(decision).inc()
+    if app.form_key == CURRENT_FORM_KEY:
+        stats_snapshot.record_decision(before, (app.status, app.decided_by))
 
     return ApplicationResponse(
         id=str(app.id),
@@ -379,111 +496,76 @@ async def submit_decision(
 
 @router.get("/stats", response_model=AdminStatsResponse)
 async def get_stats(
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_async_admin_session_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get judging statistics.
     Global stats and per-admin stats.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
+    user = principal.user
+
+    # Global stats and per-user stats (only for current form)
+    totals = stats_snapshot.get(StatsSnapshot.GLOBAL) if stats_snapshot.enabled else None
+    user_totals = stats_snapshot.get(user.id) if stats_snapshot.enabled else None
+    if totals is None or user_totals is None:
+        result = await db.execute(_count_by_status_statement(user.id))
+        totals, user_totals = _tally_by_status(result.all())
+        if stats_snapshot.enabled:
+            stats_snapshot.set(StatsSnapshot.GLOBAL, totals)
+            stats_snapshot.set(user.id, user_totals)
 
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    return AdminStatsResponse(
+        total_pending=totals[ApplicationStatus.PENDING],
+        total_accepted=totals[ApplicationStatus.ACCEPTED],
+        total_rejected=totals[ApplicationStatus.REJECTED],
+        total_confirmed=totals[ApplicationStatus.CONFIRMED],
+        user_accepted=user_totals[ApplicationStatus.ACCEPTED],
+        user_rejected=user_totals[ApplicationStatus.REJECTED],
+    )
 
-    _require_admin(db, user.id)
 
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
+@router.get("/db-pool-stats", response_model=DbPoolStatsResponse)
+async def get_db_pool_stats(
+    principal: Principal = Depends(get_admin_principal),
+):
+    """
+    Connection pool usage for this worker: connections checked out and in
+    overflow, checkout timeouts, connections dropped as stale, and how long
+    checkouts waited. Only accessible by admins.
+    """
+    return DbPoolStatsResponse(pools=pool_stats())
 
-    # Get global stats (only for current form)
-    total_pending = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(Application.status == ApplicationStatus.PENDING)
-        .count()
-    )
-    total_accepted = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(Application.status == ApplicationStatus.ACCEPTED)
-        .count()
-    )
-    total_rejected = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(Application.status == ApplicationStatus.REJECTED)
-        .count()
-    )
-    total_confirmed = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(Application.status == ApplicationStatus.CONFIRMED)
-        .count()
-    )
 
-    # Get per-user stats (only for current form)
-    user_accepted = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(
-            Application.status == ApplicationStatus.ACCEPTED,
-            Application.decided_by == user.id,
-        )
-        .count()
-    )
-    user_rejected = (
-        db.query(Application)
-        .filter(Application.form_key == CURRENT_FORM_KEY)
-        .filter(
-            Application.status == ApplicationStatus.REJECTED,
-            Application.decided_by == user.id,
-        )
-        .count()
-    )
+def _encode_cursor(app: Application) -> str:
+    """Opaque keyset cursor pointing just past `app` in (created_at, id) order."""
+    raw = f"{app.created_at.isoformat()}|{app.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-    return AdminStatsResponse(
-        total_pending=total_pending,
-        total_accepted=total_accepted,
-        total_rejected=total_rejected,
-        total_confirmed=total_confirmed,
-        user_accepted=user_accepted,
-        user_rejected=user_rejected,
-    )
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, app_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(app_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.get("/applications", response_model=ApplicationListResponse)
 async def list_applications(
-    session_id: str,
     status: Optional[str] = None,
     search: Optional[str] = None,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    limit: Optional[int] = Query(None, ge=1, le=APPLICATIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """
-    List all applications with optional filtering and search.
+    List applications with optional filtering and search, newest first.
+    Pass `limit` to page through the results; each page returns the
+    `next_cursor` to send back for the following one. `total` always counts
+    every match, not just the current page.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     # Build query
     query = db.query(Application).filter(Application.form_key == CURRENT_FORM_KEY)
 
@@ -499,75 +581,65 @@ async def list_applications(
         elif status_upper == "CONFIRMED":
             query = query.filter(Application.status == ApplicationStatus.CONFIRMED)
 
-    # Get all applications
-    applications = query.order_by(Application.created_at.desc()).all()
+    # Search filter, matched against the indexed search_vector so pages
+    # and totals agree
+    tsquery = search_tsquery(search) if search else None
+    if tsquery is not None:
+        query = query.filter(Application.search_vector.op("@@")(tsquery))
+
+    total = query.order_by(None).count()
+
+    # Stable keyset order: newest first, id breaks created_at ties
+    if cursor:
+        query = query.filter(
+            tuple_(Application.created_at, Application.id) < tuple_(*_decode_cursor(cursor))
+        )
+    query = query.order_by(Application.created_at.desc(), Application.id.desc())
+    if limit:
+        query = query.limit(limit + 1)
+    applications = query.all()
+
+    next_cursor = None
+    if limit and len(applications) > limit:
+        applications = applications[:limit]
+        next_cursor = _encode_cursor(applications[-1])
 
-    # Build response with search filtering (done in Python for JSON field search)
     result = []
     for app in applications:
         submission = app.submission_json or {}
-        first_name = submission.get("first_name", "")
-        last_name = submission.get("last_name", "")
-        pref_name = submission.get("pref_name", "")
-        email = submission.get("email", "")
-        university = submission.get("university", "")
-        major = submission.get("major", "")
-        graduation_year = str(submission.get("graduation_year", ""))
-        country = submission.get("country", "")
-
-        # Search filter
-        if search:
-            search_lower = search.lower()
-            searchable = f"{first_name} {last_name} {pref_name} {email} {university} {major} {country}".lower()
-            if search_lower not in searchable:
-                continue
-
         result.append(ApplicationListItem(
             id=str(app.id),
             status=app.status.value,
-            first_name=first_name,
-            last_name=last_name,
-            pref_name=pref_name,
-            email=email,
-            university=university,
-            major=major,
-            graduation_year=graduation_year,
-            country=country,
+            first_name=submission.get("first_name", ""),
+            last_name=submission.get("last_name", ""),
+            pref_name=submission.get("pref_name", ""),
+            email=submission.get("email", ""),
+            university=submission.get("university", ""),
+            major=submission.get("major", ""),
+            graduation_year=str(submission.get("graduation_year", "")),
+            country=submission.get("country", ""),
             created_at=app.created_at.isoformat(),
             decided_by=str(app.decided_by) if app.decided_by else None,
         ))
 
     return ApplicationListResponse(
         applications=result,
-        total=len(result),
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/application/{app_id}", response_model=SingleApplicationResponse)
 async def get_application(
     app_id: str,
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """
     Get a specific application by ID.
     Attempts to acquire lock if available, otherwise returns read-only view.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
+    user = principal.user
 
     # Get application
     try:
@@ -579,14 +651,12 @@ async def get_application(
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    # Release expired locks first
-    _release_expired_locks(db)
-
-    # Check lock status
+    # Check lock status (expired locks are swept in the background, but
+    # may not have been released yet)
     is_locked_by_other = False
     locked_by_email = None
 
-    if app.locked_by and app.locked_by != user.id:
+    if app.locked_by and app.locked_by != user.id and not _is_lock_expired(app.locked_at):
         # Someone else has the lock and it's not expired
         is_locked_by_other = True
         locked_by_email = "another admin"
@@ -597,16 +667,12 @@ async def get_application(
         db.commit()
 
     # Fetch resume URL if available
-    resume_url = None
-    resume_response = (
+    resume_url, upload_pending = _resume_link(
         db.query(Response)
         .filter(Response.application_id == app.id)
         .filter(Response.question_id == UUID(RESUME_QUESTION_ID))
         .first()
     )
-    if resume_response and resume_response.file_s3_key:
-        encoded_key = quote(resume_response.file_s3_key, safe='/')
-        resume_url = RESUME_S3_BASE_URL + encoded_key
 
     return SingleApplicationResponse(
         id=str(app.id),
@@ -616,6 +682,7 @@ async def get_application(
         submission_json=app.submission_json,
         created_at=app.created_at.isoformat(),
         resume_url=resume_url,
+        upload_pending=upload_pending,
         is_locked_by_other=is_locked_by_other,
         locked_by_email=locked_by_email,
     )
@@ -624,28 +691,14 @@ async def get_application(
 @router.post("/application/{app_id}/release-lock")
 async def release_application_lock(
     app_id: str,
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """
     Release the lock on a specific application.
     Used when returning to the applicants table.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
+    user = principal.user
 
     # Get application
     try:
@@ -668,27 +721,12 @@ async def release_application_lock(
 
 @router.get("/ping")
 async def ping(
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_session_principal),
 ):
     """
     Ping endpoint to validate session is still active.
     Useful for detecting timeout on multi-tab scenarios.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     return {"status": "ok"}
 
 
@@ -735,20 +773,13 @@ async def release_locks_beacon(
 
 @router.post("/logout")
 async def logout(
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_principal),
     db: Session = Depends(get_db),
 ):
     """
     Logout - clear all locks held by this user and clear their session.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    user = principal.user
 
     # Clear session
     user.current_session_id = None
@@ -766,29 +797,13 @@ async def logout(
 
 @router.post("/export-to-sheets", response_model=ExportResponse)
 async def export_to_sheets(
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """
     Export accepted and rejected applicants to Google Sheets.
     Creates two new tabs with today's date.
     """
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    # Get user and verify admin status
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    # Validate session
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     # Get accepted applications ordered by decided_at
     accepted_apps = (
         db.query(Application)
@@ -864,24 +879,10 @@ class RemoveExceptionRequest(BaseModel):
 
 @router.get("/exceptions", response_model=ExceptionListResponse)
 async def get_exception_list(
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """Get the list of emails with form submission exceptions."""
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     form = db.query(Form1).filter(Form1.form_key == CURRENT_FORM_KEY).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
@@ -895,24 +896,10 @@ async def get_exception_list(
 @router.post("/exceptions/add", response_model=ExceptionListResponse)
 async def add_exception_email(
     request: AddExceptionRequest,
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """Add an email to the exception list."""
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     form = db.query(Form1).filter(Form1.form_key == CURRENT_FORM_KEY).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
@@ -935,24 +922,10 @@ async def add_exception_email(
 @router.post("/exceptions/remove", response_model=ExceptionListResponse)
 async def remove_exception_email(
     request: RemoveExceptionRequest,
-    session_id: str,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_admin_session_principal),
     db: Session = Depends(get_db),
 ):
     """Remove an email from the exception list."""
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
-
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    _require_admin(db, user.id)
-
-    if not _validate_session(db, user.id, session_id):
-        raise HTTPException(status_code=403, detail="Session invalidated")
-
     form = db.query(Form1).filter(Form1.form_key == CURRENT_FORM_KEY).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Security, Form as FastAPIForm, File, UploadFile, Query
-from uuid import UUID
+from uuid import UUID, uuid4
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List, Optional
-from auth import VerifyToken
-from db import get_db
+from typing import Dict, Any, List, NamedTuple, Optional
+from auth import get_verifier
+from db import get_async_db, get_db
 from models.application import Application, ApplicationStatus
 from models.response import Response
+from models.upload_outbox import UploadOutbox
 from models.question import Question, QuestionType
 from models.user import User
 from models.form import Form as FormModel  # <-- ORM model alias
@@ -13,12 +16,98 @@ from .schema import (
     SubmitApplicationResponse,
     GetApplicationResponse,
 )
-from utils.s3 import upload_file_to_s3
+from utils.s3 import upload_files_to_s3
+from services.upload_outbox import DEFERRED_UPLOADS, discard_staged_uploads, stage_uploads
+from metrics import SUBMISSIONS
 from pydantic import BaseModel
 import json
+import os
+import threading
+import time
 
 router = APIRouter()
-auth = VerifyToken()
+auth = get_verifier()
+
+QUESTION_CACHE_TTL_SECONDS = float(os.getenv("QUESTION_CACHE_TTL_SECONDS", "300"))
+
+
+class CachedQuestion(NamedTuple):
+    id: UUID
+    question_type: QuestionType
+
+
+class QuestionCache:
+    """
+    Process-local cache of form_key -> {question_key: CachedQuestion}.
+
+    Question inserts, updates and deletes made through the ORM invalidate
+    the form's entry; the TTL bounds staleness for changes made elsewhere
+    (migrations, scripts, other workers).
+    """
+
+    def __init__(self, ttl_seconds: float = QUESTION_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._forms: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, form_key: str) -> Optional[Dict[str, CachedQuestion]]:
+        with self._lock:
+            entry = self._forms.get(form_key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._forms.pop(form_key, None)
+                return None
+            return entry[1]
+
+    def set(self, form_key: str, questions: Dict[str, CachedQuestion]) -> None:
+        with self._lock:
+            self._forms[form_key] = (time.monotonic() + self.ttl_seconds, questions)
+
+    def invalidate(self, form_key: str) -> None:
+        with self._lock:
+            self._forms.pop(form_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._forms.clear()
+
+
+question_cache = QuestionCache()
+
+
+@event.listens_for(Question, "after_insert")
+@event.listens_for(Question, "after_update")
+@event.listens_for(Question, "after_delete")
+def _invalidate_question_cache(mapper, connection, target) -> None:
+    question_cache.invalidate(target.form_key)
+
+
+def _question_map_query(form_key: str):
+    return select(Question.question_key, Question.id, Question.question_type).where(
+        Question.form_key == form_key
+    )
+
+
+def _cache_question_map(form_key: str, rows) -> Dict[str, CachedQuestion]:
+    questions = {key: CachedQuestion(id, question_type) for key, id, question_type in rows}
+    question_cache.set(form_key, questions)
+    return questions
+
+
+def load_question_map(db: Session, form_key: str) -> Dict[str, CachedQuestion]:
+    """All of a form's questions keyed by question_key, with one query on a miss."""
+    questions = question_cache.get(form_key)
+    if questions is None:
+        questions = _cache_question_map(form_key, db.execute(_question_map_query(form_key)))
+    return questions
+
+
+async def load_question_map_async(db: AsyncSession, form_key: str) -> Dict[str, CachedQuestion]:
+    """load_question_map for an AsyncSession."""
+    questions = question_cache.get(form_key)
+    if questions is None:
+        result = await db.execute(_question_map_query(form_key))
+        questions = _cache_question_map(form_key, result)
+    return questions
 
 
 class FormStatusResponse(BaseModel):
@@ -58,7 +147,7 @@ async def submit_application(
     auth0_email: Optional[str] = FastAPIForm(None),  # For exception list checking
     files: List[UploadFile] = File(default=[]),
     auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     auth0_id = auth_payload.get("sub")
     if not auth0_id:
@@ -71,7 +160,7 @@ async def submit_application(
         raise HTTPException(status_code=400, detail="Invalid form_data JSON")
 
     # Ensure form exists and is open (or user has exception)
-    form = db.query(FormModel).filter(FormModel.form_key == form_key).first()
+    form = await db.get(FormModel, form_key)
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
 
@@ -83,19 +172,21 @@ async def submit_application(
         if not has_exception:
             raise HTTPException(status_code=403, detail="Form is closed")
 
-    user = (
-        db.query(User).filter(User.auth0_id == auth0_id).first()
+    result = await db.execute(
+        select(User).where(User.auth0_id == auth0_id).limit(1)
     )  # TODO: User creation should not be handled here
+    user = result.scalars().first()
     if not user:
         user = User(auth0_id=auth0_id)
         db.add(user)
-        db.flush()
+        await db.flush()
 
-    existing_application = (
-        db.query(Application)
-        .filter(Application.user_id == user.id, Application.form_key == form_key)
-        .first()
+    result = await db.execute(
+        select(Application.id)
+        .where(Application.user_id == user.id, Application.form_key == form_key)
+        .limit(1)
     )
+    existing_application = result.first()
 
     if existing_application:
         raise HTTPException(
@@ -110,21 +201,18 @@ async def submit_application(
     )
 
     db.add(application)
-    db.flush()
+    await db.flush()
 
     valid_form_data = {}
 
     file_map = {file.filename: file for file in files if file.filename}
 
+    questions = await load_question_map_async(db, form_key)
+    responses = []
+    uploads = []
+
     for question_key, field_value in parsed_form_data.items():
-        question = (
-            db.query(Question)
-            .filter(
-                Question.form_key == form_key,
-                Question.question_key == question_key,
-            )
-            .first()
-        )
+        question = questions.get(question_key)
 
         if not question:
             continue
@@ -135,39 +223,62 @@ async def submit_application(
                 file = file_map[filename]
 
                 s3_key = f"{form_key}/{application.id}/{question_key}/{file.filename}"
-                await upload_file_to_s3(
-                    file,
-                    s3_key,
-                )
+                response_id = uuid4()
+                uploads.append((file, s3_key, response_id))
 
-                response = Response(
+                responses.append(dict(
+                    id=response_id,
                     user_id=user.id,
                     question_id=question.id,
                     application_id=application.id,
+                    text_answer=None,
+                    bool_answer=None,
                     file_s3_key=s3_key,
-                )
-                db.add(response)
+                    upload_pending=DEFERRED_UPLOADS,
+                ))
 
                 valid_form_data[question_key] = s3_key
         else:
-            response = Response(
+            responses.append(dict(
+                id=uuid4(),
                 user_id=user.id,
                 question_id=question.id,
                 application_id=application.id,
                 text_answer=str(field_value) if field_value is not None else None,
                 bool_answer=field_value if isinstance(field_value, bool) else None,
-            )
-            db.add(response)
+                file_s3_key=None,
+                upload_pending=False,
+            ))
 
             valid_form_data[question_key] = field_value
 
-    user.first_name = valid_form_data.get("first_name")
-    user.last_name = valid_form_data.get("last_name")
-    user.email = valid_form_data.get("email")
+    # Files either go up to S3 concurrently right now, or are staged on
+    # disk and queued in the outbox, committed together with the responses
+    outbox = []
+    if uploads and DEFERRED_UPLOADS:
+        outbox = await stage_uploads(uploads)
+    elif uploads:
+        await upload_files_to_s3([(file, s3_key) for file, s3_key, _ in uploads])
 
-    application.submission_json = valid_form_data
-
-    db.commit()
+    try:
+        # One multi-row INSERT for every answer (all rows share the same keys)
+        if responses:
+            await db.execute(insert(Response), responses)
+        if outbox:
+            await db.execute(insert(UploadOutbox), outbox)
+
+        user.first_name = valid_form_data.get("first_name")
+        user.last_name = valid_form_data.get("last_name")
+        user.email = valid_form_data.get("email")
+
+        application.submission_json = valid_form_data
+
+        await db.commit()
+    except BaseException:
+        # Without their outbox rows nothing would ever remove these files
+        discard_staged_uploads(outbox)
+        raise
+    SUBMISSIONS.labels(form_key).inc()
 
     return SubmitApplicationResponse(applicationId=application.id)
 
@@ -1,20 +1,48 @@
 from zoneinfo import ZoneInfo
-from fastapi import APIRouter, Depends, HTTPException, Security
+import base64
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import exists, false, func, literal_column, select, true, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
-from db import get_db
-from auth import VerifyToken
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field
+from db import get_async_db, get_db
+from auth import get_verifier
 from models.check_in_log import CheckInLog
 from models.application import Application, ApplicationStatus
 from models.user import User
-from models.user_role import RoleEnum
-from routers.roles import require_check_in
+from metrics import CHECK_INS, check_in_event_label
+from routers.identity import Principal, get_async_check_in_principal, get_check_in_principal
+from services.roster import RosterEntry, get_attendee_async, get_attendees_async, load_roster_async
+from utils.pubsub import Broker
 from datetime import datetime
+from uuid import UUID
 
 router = APIRouter()
-auth = VerifyToken()
+auth = get_verifier()
 CURRENT_FORM_KEY = "2026-cfg-application"
+SEARCH_RESULTS_LIMIT = 10
+NOT_CHECKED_IN_MAX_PAGE_SIZE = 500
+CHECK_IN_BATCH_MAX = 1000
+LOG_MAX_PAGE_SIZE = 500
+# How stale /dashboard may be; 0 queries on every request
+CHECK_IN_DASHBOARD_SECONDS = float(os.getenv("CHECK_IN_DASHBOARD_SECONDS", "10"))
+ARRIVAL_BUCKET_MINUTES = 15
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_RETRY_MS = 3000
+
+QR_CODE_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+
+# Check-ins and deletions, by event type, for /stream
+check_in_feed = Broker()
 
 # Pydantic schemas
 class CheckInRequest(BaseModel):
@@ -33,6 +61,31 @@ class CheckInResponse(BaseModel):
     status: str
 
 
+class CheckInBatchItem(BaseModel):
+    qr_code: str
+    event_type: str
+    client_timestamp: datetime  # when the badge was scanned
+
+
+class CheckInBatchRequest(BaseModel):
+    entries: List[CheckInBatchItem] = Field(max_length=CHECK_IN_BATCH_MAX)
+
+
+class CheckInBatchResult(BaseModel):
+    qr_code: str
+    event_type: str
+    # checked_in, already_checked_in, not_accepted, invalid_qr, or retry when
+    # the check-in was deleted while the batch was being recorded
+    status: str
+    full_name: Optional[str] = None
+    check_in_time: Optional[str] = None
+
+
+class CheckInBatchResponse(BaseModel):
+    results: List[CheckInBatchResult]
+    checked_in: int
+
+
 class UserInfo(BaseModel):
     user_id: str
     name: str
@@ -72,6 +125,28 @@ class CheckInLogEntry(BaseModel):
 class AllCheckInsResponse(BaseModel):
     log: List[CheckInLogEntry]
     total_users: int
+    next_cursor: Optional[str] = None
+    latest_cursor: Optional[str] = None
+
+
+class ArrivalBucket(BaseModel):
+    start: str
+    count: int
+
+
+class EventAttendance(BaseModel):
+    event_type: str
+    checked_in: int
+    not_checked_in: int
+    first_check_in: str
+    last_check_in: str
+    arrivals: List[ArrivalBucket]
+
+
+class DashboardResponse(BaseModel):
+    attendees: int
+    events: List[EventAttendance]
+    generated_at: str
 
 
 class DeleteCheckInRequest(BaseModel):
@@ -82,6 +157,7 @@ class DeleteCheckInRequest(BaseModel):
 class NotCheckedInResponse(BaseModel):
     users: List[UserInfo]
     total: int
+    next_cursor: Optional[str] = None
 
 
 
@@ -115,30 +191,88 @@ def resolve_name(db: Session, user_id: str) -> Optional[str]:
         return None
 
 
-# Helper to verify check_in role
-def _verify_check_in_access(auth_payload: Dict[str, Any], db: Session) -> User:
-    """Verify the user has check_in role and return the user."""
-    auth0_id = auth_payload.get("sub")
-    if not auth0_id:
-        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
+def _check_in_statement(rows: List[Dict[str, Any]]):
+    """
+    Insert check-ins (dicts of user_id, name, event_type, check_in_time; at
+    most one per user and event), skipping users already checked in to that
+    event. Returns (user_id, event_type, check_in_time, created) for each
+    new check-in and each one already there.
+    """
+    inserted = (
+        pg_insert(CheckInLog)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[CheckInLog.user_id, CheckInLog.event_type])
+        .returning(CheckInLog.user_id, CheckInLog.event_type, CheckInLog.check_in_time)
+        .cte("inserted")
+    )
+    # The statement's snapshot predates the insert, so the second branch
+    # only finds check-ins that were already there
+    existing = select(CheckInLog.user_id, CheckInLog.event_type, CheckInLog.check_in_time, false()).where(
+        tuple_(CheckInLog.user_id, CheckInLog.event_type).in_([(row["user_id"], row["event_type"]) for row in rows])
+    )
+    return union_all(
+        select(inserted.c.user_id, inserted.c.event_type, inserted.c.check_in_time, true()),
+        existing,
+    )
+
+
+async def _record_check_ins(
+    db: AsyncSession, rows: List[Dict[str, Any]]
+) -> Dict[Tuple[UUID, str], Tuple[datetime, bool]]:
+    """
+    Run _check_in_statement. Returns (user_id, event_type) -> (check_in_time,
+    created) for every row; the unique (user_id, event_type) constraint
+    settles scanners reading the same badge at once.
+    """
+    results = {
+        (user_id, event_type): (check_in_time, created)
+        for user_id, event_type, check_in_time, created in await db.execute(_check_in_statement(rows))
+    }
+    # Conflicts with check-ins committed by a concurrent scan after the
+    # statement began are only visible to the next one
+    keys = [(row["user_id"], row["event_type"]) for row in rows]
+    missing = [key for key in keys if key not in results]
+    if missing:
+        result = await db.execute(
+            select(CheckInLog.user_id, CheckInLog.event_type, CheckInLog.check_in_time)
+            .where(tuple_(CheckInLog.user_id, CheckInLog.event_type).in_(missing))
+        )
+        for user_id, event_type, check_in_time in result:
+            results[(user_id, event_type)] = (check_in_time, False)
+    return results
+
+
+def _checked_in(entry: RosterEntry, event_type: str, check_in_time: datetime) -> None:
+    """Count a committed check-in and tell the scanners following its event."""
+    CHECK_INS.labels(check_in_event_label(event_type)).inc()
+    check_in_feed.publish(event_type, "check_in", {
+        "user_id": str(entry.user_id),
+        "name": entry.full_name or "Unknown",
+        "first_name": entry.first_name,
+        "last_name": entry.last_name,
+        "time": check_in_time.strftime('%H:%M'),
+    })
 
-    user = db.query(User).filter(User.auth0_id == auth0_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
 
-    require_check_in(db, user.id)
-    return user
+def _scan_time(client_timestamp: datetime, now: datetime) -> datetime:
+    """A scanner's timestamp as a naive local time like datetime.now(), never in the future."""
+    if client_timestamp.tzinfo is not None:
+        client_timestamp = client_timestamp.astimezone().replace(tzinfo=None)
+    return min(client_timestamp, now)
 
 
 # Endpoints
 @router.post("/log_user", response_model=CheckInResponse)
 async def log_user(
     request: CheckInRequest,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_async_check_in_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Check in a user for an event. Requires check_in role."""
-    _verify_check_in_access(auth_payload, db)
+    """
+    Check in a user for an event. Requires check_in role. Whether the user
+    is admitted is read from the database on every scan, never from the
+    roster, so a status change takes effect on the next scan.
+    """
 
     user_id = request.qr_code.strip()
     event_type = request.event_type
@@ -150,47 +284,34 @@ async def log_user(
             raise HTTPException(status_code=400, detail="Invalid QR code: empty user ID")
 
         # Validate user_id is a valid UUID format
-        import re
-        uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
-        if not uuid_pattern.match(user_id):
+        if not QR_CODE_PATTERN.match(user_id):
             raise HTTPException(status_code=400, detail=f"Invalid QR code format: {user_id}")
 
-        # Look up application by user_id
-        application = db.query(Application).filter(
-            Application.user_id == user_id,
-            Application.form_key == CURRENT_FORM_KEY,
-            Application.status.in_([ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED])
-        ).first()
-
-        if not application:
+        entry = await get_attendee_async(db, UUID(user_id))
+        if entry is None:
             raise HTTPException(status_code=400, detail="User not confirmed or accepted")
 
-        # Extract name using user table 
-        # user = db.query(User).filter(User.id == user_id).first()
-
-        # if user is None:
-        #     # No user found → raise 404
-        #     raise HTTPException(status_code=404, detail="User not found")
-
-        # first_name = user.first_name
-        # last_name = user.last_name
-        # full_name = f"{first_name} {last_name}".strip() or "Unknown"
-
-        #Extract name from submission_json
-        submission = application.submission_json or {}
-        first_name = submission.get("first_name", "")
-        last_name = submission.get("last_name", "")
-        full_name = f"{first_name} {last_name}".strip() or "Unknown"
-
-        # Check if user has already checked in for this event type
-        existing_check_in = db.query(CheckInLog).filter(
-            CheckInLog.user_id == user_id,
-            CheckInLog.event_type == event_type
-        ).first()
-
-        if existing_check_in:
+        first_name = entry.first_name
+        last_name = entry.last_name
+        full_name = entry.full_name or "Unknown"
+
+        # Insert the check-in, or find the one already there, in a single
+        # statement
+        results = await _record_check_ins(db, [{
+            "user_id": entry.user_id,
+            "name": full_name,
+            "event_type": event_type,
+            "check_in_time": datetime.now(),
+        }])
+        recorded = results.get((entry.user_id, event_type))
+        if recorded is None:
+            # The check-in it conflicted with was deleted before it could be read
+            raise HTTPException(status_code=409, detail="Check-in changed while recording; scan again")
+        check_in_time, created = recorded
+
+        if not created:
             eastern_time = (
-                existing_check_in.check_in_time
+                check_in_time
                 .replace(tzinfo=ZoneInfo("UTC"))
                 .astimezone(ZoneInfo("America/New_York"))
             )
@@ -201,16 +322,8 @@ async def log_user(
                 detail=f"{full_name} already checked in at {check_in_time}"
             )
 
-        # Create new check-in
-        check_in = CheckInLog(
-            user_id=user_id,
-            name=full_name,
-            event_type=event_type,
-            check_in_time=datetime.now()
-        )
-        db.add(check_in)
-        db.commit()
-        db.refresh(check_in)
+        await db.commit()
+        _checked_in(entry, event_type, check_in_time)
 
         return CheckInResponse(
             message="Check-in successful",
@@ -219,8 +332,8 @@ async def log_user(
             last_name=last_name,
             full_name=full_name,
             event_type=event_type,
-            check_in_time=check_in.check_in_time.strftime('%H:%M'),
-            status=application.status.value
+            check_in_time=check_in_time.strftime('%H:%M'),
+            status=entry.status.value
         )
     except HTTPException:
         raise
@@ -235,62 +348,172 @@ async def log_user(
 
 
 
+@router.post("/log_batch", response_model=CheckInBatchResponse)
+async def log_batch(
+    request: CheckInBatchRequest,
+    principal: Principal = Depends(get_async_check_in_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Check in scans a scanner queued while offline, keeping each one's scan
+    time (client_timestamp, capped at the current time). Returns a result
+    per entry, in order. A user scanned more than once for an event is
+    checked in at the earliest scan; an entry whose check-in was deleted
+    mid-batch comes back as "retry". Admission is read from the database,
+    as in /log_user. Requires check_in role.
+    """
+    now = datetime.now()
+    user_ids = [
+        UUID(item.qr_code.strip()) if QR_CODE_PATTERN.match(item.qr_code.strip()) else None
+        for item in request.entries
+    ]
+    # One query for the whole batch
+    attendees = await get_attendees_async(db, {user_id for user_id in user_ids if user_id})
+
+    # Earliest scan per user and event, and which entry it came from
+    rows: Dict[Tuple[UUID, str], Dict[str, Any]] = {}
+    earliest: Dict[Tuple[UUID, str], int] = {}
+    for index, (item, user_id) in enumerate(zip(request.entries, user_ids)):
+        entry = attendees.get(user_id)
+        if entry is None:
+            continue
+        key = (user_id, item.event_type)
+        scanned_at = _scan_time(item.client_timestamp, now)
+        if key not in rows or scanned_at < rows[key]["check_in_time"]:
+            rows[key] = {
+                "user_id": user_id,
+                "name": entry.full_name or "Unknown",
+                "event_type": item.event_type,
+                "check_in_time": scanned_at,
+            }
+            earliest[key] = index
+
+    recorded = await _record_check_ins(db, list(rows.values())) if rows else {}
+    await db.commit()
+
+    results = []
+    for index, (item, user_id) in enumerate(zip(request.entries, user_ids)):
+        result = CheckInBatchResult(qr_code=item.qr_code, event_type=item.event_type, status="invalid_qr")
+        if user_id is not None:
+            entry = attendees.get(user_id)
+            result.status = "not_accepted"
+            if entry is not None:
+                key = (user_id, item.event_type)
+                result.full_name = entry.full_name or "Unknown"
+                if key not in recorded:
+                    result.status = "retry"
+                    results.append(result)
+                    continue
+                check_in_time, created = recorded[key]
+                result.check_in_time = check_in_time.isoformat()
+                if created and earliest[key] == index:
+                    result.status = "checked_in"
+                    _checked_in(entry, item.event_type, check_in_time)
+                else:
+                    result.status = "already_checked_in"
+        results.append(result)
+
+    return CheckInBatchResponse(
+        results=results,
+        checked_in=sum(result.status == "checked_in" for result in results),
+    )
+
+
 @router.get("/search_users", response_model=SearchUsersResponse)
 async def search_users(
     q: str = "",
-    auth_payload: Dict[str, Any] = Security(auth.verify),
-    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_async_check_in_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Search for users by name for manual check-in. Requires check_in role."""
-    _verify_check_in_access(auth_payload, db)
     query = q.strip().lower()
     if not query or len(query) < 2:
         return SearchUsersResponse(users=[])
 
-    # Get all applications with ACCEPTED or CONFIRMED status
-    applications = db.query(Application).filter(
-        Application.form_key == CURRENT_FORM_KEY,
-        Application.status.in_([ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED])
-    ).all()
-
-    # Filter by name in submission_json
-    matching_users = []
-    for application in applications:
-        submission = application.submission_json or {}
-        first_name = submission.get("first_name", "")
-        last_name = submission.get("last_name", "")
-        full_name = f"{first_name} {last_name}".strip()
-
-        # Check if query matches first_name, last_name, or full_name
-        if (query in first_name.lower() or
-            query in last_name.lower() or
-            query in full_name.lower()):
-            matching_users.append(UserInfo(
-                user_id=str(application.user_id),
-                name=full_name or "Unknown",
-                first_name=first_name,
-                last_name=last_name
-            ))
-
-        if len(matching_users) >= 10:
-            break
+    # Best name matches among ACCEPTED or CONFIRMED applications, served
+    # from the in-memory roster
+    matching_users = [
+        UserInfo(
+            user_id=str(entry.user_id),
+            name=entry.full_name or "Unknown",
+            first_name=entry.first_name,
+            last_name=entry.last_name
+        )
+        for entry in (await load_roster_async(db)).search(query, SEARCH_RESULTS_LIMIT)
+    ]
 
     return SearchUsersResponse(users=matching_users)
 
 
+def _encode_log_cursor(check_in_time: datetime, check_in_id: UUID) -> str:
+    """Opaque keyset cursor for this check-in's place in (check_in_time, id) order."""
+    raw = f"{check_in_time.isoformat()}|{check_in_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_log_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        check_in_time, check_in_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(check_in_time), UUID(check_in_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/log", response_model=AllCheckInsResponse)
 async def get_all_check_ins(
     event_type: Optional[str] = None,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    limit: Optional[int] = Query(None, ge=1, le=LOG_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    principal: Principal = Depends(get_check_in_principal),
     db: Session = Depends(get_db),
 ):
-    """Get all check-in logs ordered by most recent first. Requires check_in role."""
-    _verify_check_in_access(auth_payload, db)
+    """
+    Get check-in logs ordered by most recent first. Requires check_in role.
+
+    Pass `limit` to page through them; each page returns the `next_cursor`
+    to send back for older entries. The first page also returns a
+    `latest_cursor`: send it back as `since` to fetch only later check-ins,
+    the oldest `limit` of them if there are more (keep polling with each
+    response's `latest_cursor` until a page comes back short).
+    `total_users` always counts every matching check-in.
+
+    Check-ins are ordered by scan time, so scans uploaded late through
+    /log_batch with a time before `since` are not returned by it; /stream
+    delivers them.
+    """
     query = db.query(CheckInLog)
     if event_type:
         query = query.filter(CheckInLog.event_type == event_type)
 
-    logs = query.order_by(CheckInLog.check_in_time.desc()).all()
+    paged = bool(limit or cursor or since)
+    total = query.order_by(None).count() if paged else None
+
+    # Stable keyset order: id breaks check_in_time ties
+    position = tuple_(CheckInLog.check_in_time, CheckInLog.id)
+    if since:
+        query = query.filter(position > tuple_(*_decode_log_cursor(since)))
+        query = query.order_by(CheckInLog.check_in_time, CheckInLog.id)
+        if limit:
+            query = query.limit(limit)
+        # Newest first, like every other page
+        logs = query.all()[::-1]
+    else:
+        if cursor:
+            query = query.filter(position < tuple_(*_decode_log_cursor(cursor)))
+        query = query.order_by(CheckInLog.check_in_time.desc(), CheckInLog.id.desc())
+        if limit:
+            query = query.limit(limit + 1)
+        logs = query.all()
+
+    next_cursor = None
+    if not since and limit and len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = _encode_log_cursor(logs[-1].check_in_time, logs[-1].id)
+
+    latest_cursor = since
+    if logs and not cursor:
+        latest_cursor = _encode_log_cursor(logs[0].check_in_time, logs[0].id)
 
     return AllCheckInsResponse(
         log=[
@@ -302,18 +525,152 @@ async def get_all_check_ins(
             )
             for log in logs
         ],
-        total_users=len(logs)
+        total_users=total if paged else len(logs),
+        next_cursor=next_cursor,
+        latest_cursor=latest_cursor,
+    )
+
+
+class DashboardCache:
+    """
+    Process-local copy of the /dashboard arrival counts, so a wall of door
+    dashboards costs one query every ttl_seconds rather than one per
+    refresh.
+    """
+
+    def __init__(self, ttl_seconds: float = CHECK_IN_DASHBOARD_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entry: Optional[Tuple[float, datetime, List[Tuple]]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Tuple[datetime, List[Tuple]]]:
+        with self._lock:
+            if self._entry is None or self._entry[0] <= time.monotonic():
+                return None
+            return self._entry[1], self._entry[2]
+
+    def set(self, generated_at: datetime, rows: List[Tuple]) -> None:
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entry = (time.monotonic() + self.ttl_seconds, generated_at, rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = None
+
+
+dashboard_cache = DashboardCache()
+
+
+def _arrivals_statement():
+    """
+    (event_type, slot start, check-ins, first, last) per event type and
+    ARRIVAL_BUCKET_MINUTES slot, read from the (event_type, check_in_time,
+    id) index alone.
+    """
+    bucket = func.date_bin(
+        literal_column(f"interval '{ARRIVAL_BUCKET_MINUTES} minutes'"),
+        CheckInLog.check_in_time,
+        literal_column("timestamp '2000-01-01'"),
+    )
+    return (
+        select(
+            CheckInLog.event_type,
+            bucket,
+            func.count(),
+            func.min(CheckInLog.check_in_time),
+            func.max(CheckInLog.check_in_time),
+        )
+        .group_by(CheckInLog.event_type, bucket)
+        .order_by(CheckInLog.event_type, bucket)
+    )
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    principal: Principal = Depends(get_async_check_in_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Attendance per event type: check-ins, admitted attendees still to
+    arrive, and arrivals per 15 minutes. Counts may be up to
+    CHECK_IN_DASHBOARD_SECONDS old. Requires check_in role.
+    """
+    cached = dashboard_cache.get()
+    if cached is None:
+        cached = (datetime.now(), [tuple(row) for row in await db.execute(_arrivals_statement())])
+        dashboard_cache.set(*cached)
+    generated_at, rows = cached
+    attendees = len(await load_roster_async(db))
+
+    events = []
+    for event_type, buckets in itertools.groupby(rows, key=lambda row: row[0]):
+        buckets = list(buckets)
+        arrivals = [ArrivalBucket(start=start.isoformat(), count=count) for _, start, count, _, _ in buckets]
+        checked_in = sum(bucket.count for bucket in arrivals)
+        events.append(EventAttendance(
+            event_type=event_type,
+            checked_in=checked_in,
+            # Check-ins of users admitted and later withdrawn aren't told apart
+            not_checked_in=max(attendees - checked_in, 0),
+            first_check_in=buckets[0][3].isoformat(),
+            last_check_in=buckets[-1][4].isoformat(),
+            arrivals=arrivals,
+        ))
+
+    return DashboardResponse(
+        attendees=attendees,
+        events=events,
+        generated_at=generated_at.isoformat(),
+    )
+
+
+@router.get("/stream")
+async def stream_check_ins(
+    event_type: str = "check-in",
+    principal: Principal = Depends(get_async_check_in_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Live check-ins and deletions for an event type, as Server-Sent Events.
+    Requires check_in role.
+
+    The first event is `ready`; load /log and /not_checked_in after it and
+    apply the events that follow:
+    - `check_in`: {user_id, name, first_name, last_name, time}
+    - `delete`: {user_id, name}
+    - `reset`: this client fell behind; reload both lists
+    Events are only published by this worker process.
+    """
+    # Streams stay open for hours; don't hold a pooled connection for them
+    await db.close()
+
+    async def events():
+        with check_in_feed.subscribe(event_type) as subscription:
+            yield f"retry: {STREAM_RETRY_MS}\nevent: ready\ndata: {{}}\n\n"
+            while True:
+                event = await subscription.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                if event is None:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                kind, data = event
+                yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.post("/delete_log_entry")
 async def delete_log_entry(
     request: DeleteCheckInRequest,
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    principal: Principal = Depends(get_check_in_principal),
     db: Session = Depends(get_db),
 ):
     """Delete a check-in entry. Requires check_in role."""
-    _verify_check_in_access(auth_payload, db)
     check_in = db.query(CheckInLog).filter(
         CheckInLog.user_id == request.user_id,
         CheckInLog.event_type == request.event_type
@@ -322,53 +679,87 @@ async def delete_log_entry(
     if not check_in:
         raise HTTPException(status_code=404, detail="Log entry not found")
 
+    name = check_in.name
     db.delete(check_in)
     db.commit()
+    check_in_feed.publish(request.event_type, "delete", {"user_id": request.user_id, "name": name})
 
     return {"message": "Log entry deleted successfully"}
 
 
+def _encode_name_cursor(sort_name: str, user_id: UUID) -> str:
+    """Opaque keyset cursor pointing just past this user in (name, user_id) order."""
+    raw = f"{sort_name}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_name_cursor(cursor: str) -> Tuple[str, UUID]:
+    try:
+        sort_name, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return sort_name, UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/not_checked_in", response_model=NotCheckedInResponse)
 async def get_not_checked_in(
     event_type: str = "check-in",
-    auth_payload: Dict[str, Any] = Security(auth.verify),
+    limit: Optional[int] = Query(None, ge=1, le=NOT_CHECKED_IN_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    principal: Principal = Depends(get_check_in_principal),
     db: Session = Depends(get_db),
 ):
-    """Get all accepted users who have NOT checked in for a specific event type. Requires check_in role."""
-    _verify_check_in_access(auth_payload, db)
-    # Get all accepted/confirmed applications
-    applications = db.query(Application).filter(
+    """
+    Get all accepted users who have NOT checked in for a specific event type,
+    sorted by name. Pass `limit` to page through them; each page returns the
+    `next_cursor` to send back for the following one, and `total` counts
+    every user still to check in. Requires check_in role.
+    """
+    first_name = Application.submission_json["first_name"].astext
+    last_name = Application.submission_json["last_name"].astext
+    sort_name = func.lower(func.trim(func.concat(first_name, " ", last_name)))
+
+    # Accepted/confirmed applications with no check-in for this event; the
+    # anti-join is answered from ix_check_in_event_type_user_id
+    conditions = [
         Application.form_key == CURRENT_FORM_KEY,
-        Application.status.in_([ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED])
-    ).all()
-
-    # Get all user_ids that have checked in for this event type
-    checked_in_user_ids = set(
-        str(log.user_id) for log in db.query(CheckInLog).filter(
-            CheckInLog.event_type == event_type
-        ).all()
-    )
-
-    # Filter to users who haven't checked in
-    not_checked_in = []
-    for application in applications:
-        user_id = str(application.user_id)
-        if user_id not in checked_in_user_ids:
-            submission = application.submission_json or {}
-            first_name = submission.get("first_name", "")
-            last_name = submission.get("last_name", "")
-            full_name = f"{first_name} {last_name}".strip() or "Unknown"
-            not_checked_in.append(UserInfo(
-                user_id=user_id,
-                name=full_name,
-                first_name=first_name,
-                last_name=last_name
-            ))
-
-    # Sort alphabetically by name
-    not_checked_in.sort(key=lambda u: u.name.lower())
+        Application.status.in_([ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED]),
+        ~exists().where(
+            CheckInLog.event_type == event_type,
+            CheckInLog.user_id == Application.user_id,
+        ),
+    ]
+
+    query = select(Application.user_id, first_name, last_name, sort_name.label("sort_name")).where(*conditions)
+    if cursor:
+        query = query.where(tuple_(sort_name, Application.user_id) > tuple_(*_decode_name_cursor(cursor)))
+    query = query.order_by(sort_name, Application.user_id)
+    if limit:
+        query = query.limit(limit + 1)
+    rows = db.execute(query).all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_name_cursor(rows[-1].sort_name, rows[-1].user_id)
+
+    if limit or cursor:
+        total = db.scalar(select(func.count()).select_from(Application).where(*conditions))
+    else:
+        total = len(rows)
+
+    not_checked_in = [
+        UserInfo(
+            user_id=str(user_id),
+            name=f"{first or ''} {last or ''}".strip() or "Unknown",
+            first_name=first or "",
+            last_name=last or ""
+        )
+        for user_id, first, last, _ in rows
+    ]
 
     return NotCheckedInResponse(
         users=not_checked_in,
-        total=len(not_checked_in)
+        total=total,
+        next_cursor=next_cursor,
     )
@@ -0,0 +1,250 @@
+"""Request-scoped identity resolution shared by the routers."""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Security
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from auth import get_verifier
+from db import get_async_db, get_db
+from models.user import User
+from models.user_role import UserRole, RoleEnum
+
+
+auth = get_verifier()
+
+ROLE_CACHE_TTL_SECONDS = float(os.getenv("ROLE_CACHE_TTL_SECONDS", "30"))
+ROLE_CACHE_MAX_SIZE = 4096
+
+
+class RoleCache:
+    """
+    Process-local cache of user_id -> roles.
+
+    /roles/grant and /roles/revoke invalidate entries explicitly; the short
+    TTL bounds how long a change made through another worker can go unseen.
+    Also remembers auth0_id -> user_id so the principal lookup can skip the
+    user_role join on a hit.
+    """
+
+    def __init__(self, ttl_seconds: float = ROLE_CACHE_TTL_SECONDS, max_size: int = ROLE_CACHE_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._roles: Dict[UUID, Tuple[float, FrozenSet[RoleEnum]]] = {}
+        self._user_ids: Dict[str, UUID] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> Optional[FrozenSet[RoleEnum]]:
+        with self._lock:
+            entry = self._roles.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._roles.pop(user_id, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def get_user_id(self, auth0_id: str) -> Optional[UUID]:
+        """User id for an auth0_id, only if that user's roles are also cached."""
+        with self._lock:
+            user_id = self._user_ids.get(auth0_id)
+            entry = self._roles.get(user_id) if user_id else None
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            return user_id
+
+    def set(self, user_id: UUID, roles, auth0_id: Optional[str] = None) -> None:
+        with self._lock:
+            if len(self._roles) >= self.max_size:
+                self._roles.clear()
+                self._user_ids.clear()
+            self._roles[user_id] = (time.monotonic() + self.ttl_seconds, frozenset(roles))
+            if auth0_id:
+                self._user_ids[auth0_id] = user_id
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._roles.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roles.clear()
+            self._user_ids.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._roles),
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+role_cache = RoleCache()
+
+
+@dataclass
+class Principal:
+    """The authenticated user together with their roles."""
+
+    user: User
+    roles: Set[RoleEnum] = field(default_factory=set)
+
+    @property
+    def id(self) -> UUID:
+        return self.user.id
+
+    @property
+    def current_session_id(self) -> Optional[str]:
+        return self.user.current_session_id
+
+    def has_role(self, role: RoleEnum) -> bool:
+        return role in self.roles
+
+
+def _principal_query(auth0_id: str):
+    return (
+        select(User, UserRole.role)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .where(User.auth0_id == auth0_id)
+    )
+
+
+def _principal_from_rows(rows, auth0_id: str) -> Optional[Principal]:
+    if not rows:
+        return None
+
+    user = rows[0][0]
+    roles = {role for _, role in rows if role is not None}
+    role_cache.set(user.id, roles, auth0_id=auth0_id)
+    return Principal(user=user, roles=roles)
+
+
+def load_principal(db: Session, auth0_id: str) -> Optional[Principal]:
+    """
+    Load a user and all of their roles with a single query.
+    When the roles are cached, only the user row is fetched.
+    """
+    cached_user_id = role_cache.get_user_id(auth0_id)
+    if cached_user_id:
+        roles = role_cache.get(cached_user_id)
+        user = db.get(User, cached_user_id)
+        if user and roles is not None:
+            return Principal(user=user, roles=set(roles))
+
+    return _principal_from_rows(db.execute(_principal_query(auth0_id)).all(), auth0_id)
+
+
+async def load_principal_async(db: AsyncSession, auth0_id: str) -> Optional[Principal]:
+    """load_principal for an AsyncSession."""
+    cached_user_id = role_cache.get_user_id(auth0_id)
+    if cached_user_id:
+        roles = role_cache.get(cached_user_id)
+        user = await db.get(User, cached_user_id)
+        if user and roles is not None:
+            return Principal(user=user, roles=set(roles))
+
+    result = await db.execute(_principal_query(auth0_id))
+    return _principal_from_rows(result.all(), auth0_id)
+
+
+# ============================================================================
+# Dependencies
+# ============================================================================
+
+def get_principal(
+    auth_payload: Dict[str, Any] = Security(auth.verify),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """Resolve the authenticated user once per request."""
+    auth0_id = auth_payload.get("sub")
+    if not auth0_id:
+        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
+
+    principal = load_principal(db, auth0_id)
+    if not principal:
+        raise HTTPException(status_code=401, detail="User not found")
+    return principal
+
+
+def get_session_principal(
+    session_id: str,
+    principal: Principal = Depends(get_principal),
+) -> Principal:
+    """Authenticated user whose admin panel session is still the active one."""
+    if principal.current_session_id != session_id:
+        raise HTTPException(status_code=403, detail="Session invalidated")
+    return principal
+
+
+def get_admin_principal(
+    principal: Principal = Depends(get_principal),
+) -> Principal:
+    """Authenticated user with the admin role."""
+    if not principal.has_role(RoleEnum.ADMIN):
+        raise HTTPException(status_code=403, detail="User is not an admin")
+    return principal
+
+
+def get_admin_session_principal(
+    session_id: str,
+    principal: Principal = Depends(get_admin_principal),
+) -> Principal:
+    """Admin whose admin panel session is still the active one."""
+    return get_session_principal(session_id, principal)
+
+
+def get_check_in_principal(
+    principal: Principal = Depends(get_principal),
+) -> Principal:
+    """Authenticated user with the check_in role."""
+    if not principal.has_role(RoleEnum.CHECK_IN):
+        raise HTTPException(status_code=403, detail="Check-in access required")
+    return principal
+
+
+# Async variants, for endpoints that run their queries on get_async_db.
+# They are coroutines so FastAPI doesn't hop to the threadpool to run them.
+
+async def get_async_principal(
+    auth_payload: Dict[str, Any] = Security(auth.verify),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """get_principal, resolved through the request's AsyncSession."""
+    auth0_id = auth_payload.get("sub")
+    if not auth0_id:
+        raise HTTPException(status_code=401, detail="Auth0 ID not found in token")
+
+    principal = await load_principal_async(db, auth0_id)
+    if not principal:
+        raise HTTPException(status_code=401, detail="User not found")
+    return principal
+
+
+async def get_async_admin_session_principal(
+    session_id: str,
+    principal: Principal = Depends(get_async_principal),
+) -> Principal:
+    """Admin whose admin panel session is still the active one."""
+    return get_session_principal(session_id, get_admin_principal(principal))
+
+
+async def get_async_check_in_principal(
+    principal: Principal = Depends(get_async_principal),
+) -> Principal:
+    """Authenticated user with the check_in role."""
+    return get_check_in_principal(principal)
@@ -1,45 +1,50 @@
 """Role management endpoints and utilities."""
 from fastapi import APIRouter, Depends, HTTPException, Security
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, FrozenSet, Iterable
 from uuid import UUID
 from pydantic import BaseModel
 
-from auth import VerifyToken
+from auth import get_verifier
 from db import get_db
 from models.user import User
 from models.user_role import UserRole, RoleEnum
 from services.auth0_management import search_users_by_email
+from routers.identity import Principal, get_admin_principal, role_cache
 
 
 router = APIRouter()
-auth = VerifyToken()
+auth = get_verifier()
 
 
 # ============================================================================
 # Helper Functions (for use in other routers)
 # ============================================================================
 
+def _cached_user_roles(db: Session, user_id: UUID) -> FrozenSet[RoleEnum]:
+    """Get all roles for a user, served from the role cache when possible."""
+    roles = role_cache.get(user_id)
+    if roles is None:
+        user_roles = db.query(UserRole).filter(UserRole.user_id == user_id).all()
+        roles = frozenset(ur.role for ur in user_roles)
+        role_cache.set(user_id, roles)
+    return roles
+
+
 def user_has_role(db: Session, user_id: UUID, role: RoleEnum) -> bool:
     """Check if a user has a specific role."""
-    return db.query(UserRole).filter(
-        UserRole.user_id == user_id,
-        UserRole.role == role
-    ).first() is not None
+    return role in _cached_user_roles(db, user_id)
 
 
 def user_has_any_role(db: Session, user_id: UUID, roles: List[RoleEnum]) -> bool:
     """Check if a user has any of the specified roles."""
-    return db.query(UserRole).filter(
-        UserRole.user_id == user_id,
-        UserRole.role.in_(roles)
-    ).first() is not None
+    return not _cached_user_roles(db, user_id).isdisjoint(roles)
 
 
 def get_user_roles(db: Session, user_id: UUID) -> List[RoleEnum]:
     """Get all roles for a user."""
-    user_roles = db.query(UserRole).filter(UserRole.user_id == user_id).all()
-    return [ur.role for ur in user_roles]
+    return sorted(_cached_user_roles(db, user_id), key=lambda role: role.value)
 
 
 def require_role(db: Session, user_id: UUID, role: RoleEnum) -> None:
@@ -107,6 +112,14 @@ class UsersWithRolesResponse(BaseModel):
     total: int
 
 
+class RoleCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    ttl_seconds: float
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -188,17 +201,16 @@ async def grant_role(
         db.add(target_user)
         db.flush()
 
-    # Check if role already exists
-    existing_role = db.query(UserRole).filter(
-        UserRole.user_id == target_user.id,
-        UserRole.role == role
-    ).first()
+    # Check if role already exists; the same rows build the response
+    current_roles = {
+        ur.role for ur in db.query(UserRole).filter(UserRole.user_id == target_user.id)
+    }
 
-    if existing_role:
+    if role in current_roles:
         return RoleActionResponse(
             success=True,
             message=f"User already has {role.value} role",
-            user=_build_user_with_roles(target_user, db)
+            user=_build_user_with_roles(target_user, db, roles=current_roles)
         )
 
     # Grant the role
@@ -209,11 +221,12 @@ async def grant_role(
     )
     db.add(user_role)
     db.commit()
+    role_cache.invalidate(target_user.id)
 
     return RoleActionResponse(
         success=True,
         message=f"Granted {role.value} role",
-        user=_build_user_with_roles(target_user, db)
+        user=_build_user_with_roles(target_user, db, roles=current_roles | {role})
     )
 
 
@@ -257,26 +270,26 @@ async def revoke_role(
     if target_user.id == admin_user.id and role == RoleEnum.ADMIN:
         raise HTTPException(status_code=400, detail="Cannot revoke your own admin role")
 
-    # Find and delete the role
-    user_role = db.query(UserRole).filter(
-        UserRole.user_id == target_user.id,
-        UserRole.role == role
-    ).first()
+    # Find and delete the role; the remaining rows build the response
+    user_roles = db.query(UserRole).filter(UserRole.user_id == target_user.id).all()
+    user_role = next((ur for ur in user_roles if ur.role == role), None)
+    remaining_roles = {ur.role for ur in user_roles if ur is not user_role}
 
     if not user_role:
         return RoleActionResponse(
             success=True,
             message=f"User does not have {role.value} role",
-            user=_build_user_with_roles(target_user, db)
+            user=_build_user_with_roles(target_user, db, roles=remaining_roles)
         )
 
     db.delete(user_role)
     db.commit()
+    role_cache.invalidate(target_user.id)
 
     return RoleActionResponse(
         success=True,
         message=f"Revoked {role.value} role",
-        user=_build_user_with_roles(target_user, db)
+        user=_build_user_with_roles(target_user, db, roles=remaining_roles)
     )
 
 
@@ -299,19 +312,41 @@ async def list_users_with_roles(
 
     require_admin(db, user.id)
 
-    # Get all users with roles
-    users_with_roles = db.query(User).join(UserRole, User.id == UserRole.user_id).distinct().all()
+    # Every user with at least one role, their roles aggregated in the same query
+    users_with_roles = (
+        db.query(User, func.array_agg(UserRole.role))
+        .join(UserRole, User.id == UserRole.user_id)
+        .group_by(User.id)
+        .all()
+    )
 
-    result = []
-    for u in users_with_roles:
-        result.append(_build_user_with_roles(u, db))
+    result = [_build_user_with_roles(u, db, roles=roles) for u, roles in users_with_roles]
 
     return UsersWithRolesResponse(users=result, total=len(result))
 
 
-def _build_user_with_roles(user: User, db: Session) -> UserWithRoles:
-    """Helper to build UserWithRoles response."""
-    roles = get_user_roles(db, user.id)
+@router.get("/cache-stats", response_model=RoleCacheStatsResponse)
+async def get_role_cache_stats(
+    principal: Principal = Depends(get_admin_principal),
+):
+    """
+    Hit/miss counters for the in-process role cache.
+    Only accessible by admins.
+    """
+    return RoleCacheStatsResponse(**role_cache.stats())
+
+
+def _build_user_with_roles(
+    user: User, db: Session, roles: Optional[Iterable[RoleEnum]] = None
+) -> UserWithRoles:
+    """
+    Helper to build UserWithRoles response.
+    Pass `roles` when they are already loaded to skip the role lookup.
+    """
+    if roles is None:
+        roles = get_user_roles(db, user.id)
+    else:
+        roles = sorted(roles, key=lambda role: role.value)
     return UserWithRoles(
         user_id=str(user.id),
         auth0_id=user.auth0_id,
@@ -1,17 +1,20 @@
 import pytest
 from fastapi.testclient import TestClient
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import json
 
 from models.user import User
 from models.application import Application, ApplicationStatus
 from models.form import Form
 from models.question import Question, QuestionType
+from models.response import Response
 from models.user_role import UserRole, RoleEnum
-from routers.admin import router
+from routers.admin import RESUME_QUESTION_ID, router, _claim_next_application, release_expired_locks, stats_snapshot
 from fastapi import FastAPI
-from db import get_db
+from db import get_async_db, get_db
 from routers.admin import auth
 
 app = FastAPI()
@@ -20,13 +23,14 @@ client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
-def setup_dependency_overrides(test_session):
+def setup_dependency_overrides(test_session, test_async_session):
     """Override FastAPI dependency injections for testing."""
     # Always clear before setting up
     app.dependency_overrides.clear()
     # Set default overrides
     app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|admin_user_123"}
     app.dependency_overrides[get_db] = lambda: (yield test_session)
+    app.dependency_overrides[get_async_db] = lambda: (yield test_async_session)
     yield
     # Clear overrides after test to prevent pollution
     app.dependency_overrides.clear()
@@ -503,6 +507,46 @@ class TestStats:
         assert data["user_accepted"] == 1
         assert data["user_rejected"] == 1
 
+    def test_stats_counted_in_one_query(
+        self, test_admin_user, test_form, pending_applications, query_log
+    ):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        query_log.clear()
+        response = client.get("/admin/stats", params={"session_id": session_id})
+
+        assert response.status_code == 200
+        assert response.json()["total_pending"] == len(pending_applications)
+        assert len([q for q in query_log if "FROM application" in q]) == 1
+
+    def test_snapshot_serves_counts_and_tracks_decisions(
+        self, test_admin_user, test_form, pending_applications, query_log, monkeypatch
+    ):
+        monkeypatch.setattr(stats_snapshot, "ttl_seconds", 60)
+        stats_snapshot.clear()
+        try:
+            session_id = client.post("/admin/auth/check").json()["session_id"]
+            client.get("/admin/stats", params={"session_id": session_id})
+
+            app_id = client.get(
+                "/admin/next-application", params={"session_id": session_id}
+            ).json()["id"]
+            client.post(
+                f"/admin/application/{app_id}/decision",
+                json={"decision": "accept"},
+                params={"session_id": session_id},
+            )
+
+            query_log.clear()
+            data = client.get("/admin/stats", params={"session_id": session_id}).json()
+
+            assert [q for q in query_log if "FROM application" in q] == []
+            assert data["total_pending"] == len(pending_applications) - 1
+            assert data["total_accepted"] == 1
+            assert data["user_accepted"] == 1
+        finally:
+            stats_snapshot.clear()
+
     def test_stats_requires_valid_session(self, test_admin_user, test_session):
         """Test that invalid session is rejected."""
         response = client.get(
@@ -513,6 +557,157 @@ class TestStats:
         assert response.status_code == 403
 
 
+class TestDbPoolStats:
+    def test_reports_both_pools(self, test_admin_user):
+        response = client.get("/admin/db-pool-stats")
+
+        assert response.status_code == 200
+        pools = response.json()["pools"]
+        assert set(pools) == {"sync", "async"}
+        for pool in pools.values():
+            assert pool["checked_out"] >= 0
+            assert len(pool["wait_seconds"]["buckets"]) > 0
+
+    def test_requires_admin(self, test_non_admin_user):
+        app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|regular_user_123"}
+
+        response = client.get("/admin/db-pool-stats")
+
+        assert response.status_code == 403
+
+
+class TestListApplications:
+    @pytest.fixture
+    def applicants(self, test_session, test_form, test_non_admin_user):
+        """Five applications, two of them sharing a created_at."""
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        created = [base, base + timedelta(minutes=1), base + timedelta(minutes=1),
+                   base + timedelta(minutes=2), base + timedelta(minutes=3)]
+        apps = []
+        for i, created_at in enumerate(created):
+            app = Application(
+                user_id=test_non_admin_user.id,
+                form_key=test_form.form_key,
+                status=ApplicationStatus.PENDING,
+                created_at=created_at,
+                submission_json={"first_name": f"Applicant{i}", "university": "Wexmoor" if i % 2 else "Tallis"},
+            )
+            test_session.add(app)
+            apps.append(app)
+        test_session.flush()
+        return apps
+
+    def test_cursor_pages_cover_every_application_once(self, test_admin_user, applicants):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        seen, cursor = [], None
+        while True:
+            params = {"session_id": session_id, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get("/admin/applications", params=params).json()
+            assert data["total"] == len(applicants)
+            assert len(data["applications"]) <= 2
+            seen.extend(item["id"] for item in data["applications"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        expected = sorted(applicants, key=lambda a: (a.created_at, a.id), reverse=True)
+        assert seen == [str(a.id) for a in expected]
+
+    def test_without_limit_returns_everything(self, test_admin_user, applicants):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        data = client.get("/admin/applications", params={"session_id": session_id}).json()
+
+        assert len(data["applications"]) == data["total"] == len(applicants)
+        assert data["next_cursor"] is None
+
+    def test_search_filters_before_paging(self, test_admin_user, applicants):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        data = client.get(
+            "/admin/applications",
+            params={"session_id": session_id, "search": "wexm", "limit": 1},
+        ).json()
+
+        assert data["total"] == 2
+        assert data["applications"][0]["university"] == "Wexmoor"
+        assert data["next_cursor"] is not None
+
+    @pytest.mark.parametrize("search", ["ada.quorwell@zyxmoor.edu", "zyxmoor.edu", "ADA.QUORWELL"])
+    def test_search_matches_email_and_domain(
+        self, test_admin_user, test_session, test_form, test_non_admin_user, search
+    ):
+        applicant = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+            submission_json={"first_name": "Ada", "email": "ada.quorwell@zyxmoor.edu"},
+        )
+        test_session.add(applicant)
+        test_session.flush()
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        data = client.get(
+            "/admin/applications",
+            params={"session_id": session_id, "search": search},
+        ).json()
+
+        assert [a["id"] for a in data["applications"]] == [str(applicant.id)]
+
+    def test_invalid_cursor_rejected(self, test_admin_user, applicants):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        response = client.get(
+            "/admin/applications",
+            params={"session_id": session_id, "limit": 2, "cursor": "not-a-cursor"},
+        )
+
+        assert response.status_code == 400
+
+
+class TestResumeLink:
+    @pytest.mark.parametrize("upload_pending", [False, True])
+    def test_pending_upload_has_no_url(
+        self, upload_pending, test_admin_user, test_session, test_form, test_non_admin_user
+    ):
+        question = test_session.get(Question, UUID(RESUME_QUESTION_ID))
+        if question is None:
+            question = Question(
+                id=UUID(RESUME_QUESTION_ID), form_key=test_form.form_key,
+                question_key="resume", question_type=QuestionType.FILE,
+            )
+            test_session.add(question)
+        app_obj = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+        )
+        test_session.add(app_obj)
+        test_session.flush()
+        test_session.add(Response(
+            user_id=test_non_admin_user.id,
+            question_id=question.id,
+            application_id=app_obj.id,
+            file_s3_key=f"{test_form.form_key}/{app_obj.id}/resume/cv.pdf",
+            upload_pending=upload_pending,
+        ))
+        test_session.flush()
+
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+        data = client.get(
+            f"/admin/application/{app_obj.id}", params={"session_id": session_id}
+        ).json()
+
+        assert data["upload_pending"] is upload_pending
+        if upload_pending:
+            assert data["resume_url"] is None
+        else:
+            assert data["resume_url"].endswith(f"{app_obj.id}/resume/cv.pdf")
+
+
 class TestPing:
     def test_ping_success(self, test_admin_user, test_session):
         """Test that valid session responds to ping."""
@@ -622,3 +817,251 @@ class TestLockTimeout:
         # Should be able to get the old app (lock was expired)
         assert app_response.status_code == 200
         assert app_response.json()["id"] == str(app_with_expired_lock.id)
+
+    def test_sweep_releases_only_expired_locks(
+        self, test_admin_user, test_session, test_form, test_non_admin_user
+    ):
+        expired = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+            locked_by=test_admin_user.id,
+            locked_at=datetime.utcnow() - timedelta(hours=2),
+        )
+        skipped = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+            locked_at=datetime.utcnow() - timedelta(hours=2),
+        )
+        fresh = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+            locked_by=test_admin_user.id,
+            locked_at=datetime.utcnow(),
+        )
+        test_session.add_all([expired, skipped, fresh])
+        test_session.flush()
+
+        released = release_expired_locks(test_session)
+
+        assert released >= 2
+        for app_obj in (expired, skipped, fresh):
+            test_session.refresh(app_obj)
+        assert expired.locked_by is None and expired.locked_at is None
+        assert skipped.locked_at is None
+        assert fresh.locked_by == test_admin_user.id
+
+    def test_expired_lock_not_reported_as_locked_by_other(
+        self, test_admin_user, test_session, test_form, test_non_admin_user
+    ):
+        other_admin = User(auth0_id=f"auth0|admin_user_{uuid4()}")
+        test_session.add(other_admin)
+        test_session.flush()
+
+        app_obj = Application(
+            user_id=test_non_admin_user.id,
+            form_key=test_form.form_key,
+            status=ApplicationStatus.PENDING,
+            locked_by=other_admin.id,
+            locked_at=datetime.utcnow() - timedelta(hours=2),
+        )
+        test_session.add(app_obj)
+        test_session.flush()
+
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+        response = client.get(
+            f"/admin/application/{app_obj.id}",
+            params={"session_id": session_id},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["is_locked_by_other"] is False
+        test_session.refresh(app_obj)
+        assert app_obj.locked_by == test_admin_user.id
+
+
+ADMIN_SESSION_ENDPOINTS = [
+    ("get", "/admin/next-application", {}),
+    ("post", f"/admin/application/{uuid4()}/decision", {"json": {"decision": "accept"}}),
+    ("get", "/admin/stats", {}),
+    ("get", "/admin/applications", {}),
+    ("get", f"/admin/application/{uuid4()}", {}),
+    ("post", f"/admin/application/{uuid4()}/release-lock", {}),
+    ("post", "/admin/export-to-sheets", {}),
+    ("get", "/admin/exceptions", {}),
+    ("post", "/admin/exceptions/add", {"json": {"email": "a@example.com"}}),
+    ("post", "/admin/exceptions/remove", {"json": {"email": "a@example.com"}}),
+]
+
+
+class TestIdentityQueries:
+    @pytest.mark.parametrize("method,path,kwargs", ADMIN_SESSION_ENDPOINTS)
+    def test_invalid_session_rejected_after_one_query(
+        self, method, path, kwargs, test_admin_user, query_log
+    ):
+        """User, roles and session are resolved with a single query."""
+        query_log.clear()
+        response = getattr(client, method)(
+            path, params={"session_id": "invalid_session_id"}, **kwargs
+        )
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Session invalidated"
+        assert len(query_log) == 1
+
+    @pytest.mark.parametrize("method,path,kwargs", ADMIN_SESSION_ENDPOINTS)
+    def test_non_admin_rejected_after_one_query(
+        self, method, path, kwargs, test_non_admin_user, query_log
+    ):
+        app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|regular_user_123"}
+
+        query_log.clear()
+        response = getattr(client, method)(
+            path, params={"session_id": "any_session_id"}, **kwargs
+        )
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "User is not an admin"
+        assert len(query_log) == 1
+
+    def test_ping_uses_one_query(self, test_admin_user, query_log):
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        query_log.clear()
+        response = client.get("/admin/ping", params={"session_id": session_id})
+
+        assert response.status_code == 200
+        assert len(query_log) == 1
+
+    def test_warm_role_cache_skips_role_join(self, test_admin_user, test_form, query_log):
+        # /auth/check loads the roles and primes the role cache
+        session_id = client.post("/admin/auth/check").json()["session_id"]
+
+        query_log.clear()
+        response = client.get("/admin/stats", params={"session_id": session_id})
+
+        assert response.status_code == 200
+        assert 'FROM "user"' in query_log[0]
+        assert not [q for q in query_log if "user_role" in q]
+
+
+class TestQueryBudgets:
+    """Statements per request on the reviewer hot path, with a warm role cache."""
+
+    @pytest.fixture
+    def session_id(self, test_admin_user):
+        return client.post("/admin/auth/check").json()["session_id"]
+
+    def test_next_application(self, session_id, pending_applications, query_budget):
+        with query_budget(3):
+            response = client.get("/admin/next-application", params={"session_id": session_id})
+        assert response.status_code == 200
+
+    def test_decision(self, session_id, pending_applications, query_budget):
+        app_id = client.get("/admin/next-application", params={"session_id": session_id}).json()["id"]
+
+        with query_budget(3):
+            response = client.post(
+                f"/admin/application/{app_id}/decision",
+                params={"session_id": session_id},
+                json={"decision": "accept"},
+            )
+        assert response.status_code == 200
+
+    def test_stats(self, session_id, test_form, query_budget):
+        with query_budget(2):
+            response = client.get("/admin/stats", params={"session_id": session_id})
+        assert response.status_code == 200
+
+
+class TestReviewerQueue:
+    NUM_REVIEWERS = 8
+    NUM_APPLICATIONS = 40
+
+    @pytest.fixture
+    def committed_queue(self, test_sessionmaker):
+        """
+        Reviewers and pending apps committed for real, so concurrent
+        sessions on separate connections can see them.
+        """
+        form_key = f"queue-test-{uuid4()}"
+        session = test_sessionmaker()
+        session.add(Form(form_key=form_key, year=2026, is_open=True))
+        applicant = User(auth0_id=f"auth0|queue_applicant_{uuid4()}")
+        reviewers = [
+            User(auth0_id=f"auth0|queue_reviewer_{uuid4()}")
+            for _ in range(self.NUM_REVIEWERS)
+        ]
+        session.add_all([applicant, *reviewers])
+        session.flush()
+        session.add_all([
+            Application(
+                user_id=applicant.id,
+                form_key=form_key,
+                status=ApplicationStatus.PENDING,
+            )
+            for _ in range(self.NUM_APPLICATIONS)
+        ])
+        session.commit()
+        reviewer_ids = [r.id for r in reviewers]
+
+        yield form_key, reviewer_ids
+
+        session.query(Form).filter(Form.form_key == form_key).delete()
+        session.query(User).filter(User.id.in_([applicant.id, *reviewer_ids])).delete()
+        session.commit()
+        session.close()
+
+    def test_concurrent_reviewers_never_share_an_application(
+        self, committed_queue, test_sessionmaker
+    ):
+        form_key, reviewer_ids = committed_queue
+        barrier = threading.Barrier(len(reviewer_ids))
+
+        def review(reviewer_id):
+            session = test_sessionmaker()
+            claimed = []
+            try:
+                barrier.wait()
+                while True:
+                    app_obj = _claim_next_application(session, reviewer_id, form_key)
+                    if app_obj is None:
+                        session.commit()
+                        return claimed
+                    claimed.append(app_obj.id)
+                    # Decide right away so the reviewer moves on to a new app
+                    app_obj.status = ApplicationStatus.ACCEPTED
+                    app_obj.decided_by = reviewer_id
+                    app_obj.locked_by = None
+                    app_obj.locked_at = None
+                    session.commit()
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=len(reviewer_ids)) as pool:
+            results = list(pool.map(review, reviewer_ids))
+
+        all_claimed = [app_id for claimed in results for app_id in claimed]
+        assert len(all_claimed) == self.NUM_APPLICATIONS
+        assert len(set(all_claimed)) == self.NUM_APPLICATIONS
+
+    def test_first_claims_are_distinct(self, committed_queue, test_sessionmaker):
+        form_key, reviewer_ids = committed_queue
+        barrier = threading.Barrier(len(reviewer_ids))
+
+        def claim_once(reviewer_id):
+            session = test_sessionmaker()
+            try:
+                barrier.wait()
+                app_obj = _claim_next_application(session, reviewer_id, form_key)
+                session.commit()
+                return app_obj.id
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=len(reviewer_ids)) as pool:
+            claimed = list(pool.map(claim_once, reviewer_ids))
+
+        assert len(set(claimed)) == len(reviewer_ids)
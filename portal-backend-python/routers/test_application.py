@@ -6,13 +6,16 @@ from models.application import Application, ApplicationStatus
 from models.user import User
 from models.form import Form
 from models.question import Question, QuestionType
-from routers.application import router
+from routers.application import router, load_question_map
 from fastapi import FastAPI
-from db import get_db
+from db import get_async_db, get_db
 from routers.application import auth
 from routers.schema import GetApplicationResponse, SubmitApplicationResponse
 from moto import mock_aws
 from models.response import Response
+from models.upload_outbox import UploadOutbox
+from services.upload_outbox import stage_uploads
+from sqlalchemy.exc import IntegrityError
 import boto3
 import json
 
@@ -23,10 +26,11 @@ client = TestClient(app)
 
 @pytest.fixture(autouse=True)
 def setup_dependency_overrides(
-    test_session,
+    test_session, test_async_session,
 ):  # override fastapi dependency injections (https://fastapi.tiangolo.com/advanced/testing-dependencies/)
     app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|test_user_123"}
     app.dependency_overrides[get_db] = lambda: (yield test_session)
+    app.dependency_overrides[get_async_db] = lambda: (yield test_async_session)
 
 
 @pytest.fixture
@@ -165,3 +169,161 @@ class TestApplication:
         s3_key = response[2].file_s3_key
         file_obj = s3.Object("test", s3_key)
         assert file_obj.get()["Body"].read() == b"I love HackDuke!"
+
+
+def _form_with_questions(test_session, form_key, count):
+    test_session.add(Form(form_key=form_key, year=2025, is_open=True))
+    test_session.flush()
+    test_session.add_all(
+        Question(form_key=form_key, question_key=f"q{i}", question_type=QuestionType.TEXT)
+        for i in range(count)
+    )
+    test_session.flush()
+    return {f"q{i}": f"answer {i}" for i in range(count)}
+
+
+class TestSubmitQueries:
+    def test_query_count_independent_of_question_count(self, test_session, query_log):
+        auth0_id = f"auth0|applicant_{uuid4()}"
+        test_session.add(User(auth0_id=auth0_id))
+        test_session.flush()
+        app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+
+        counts = []
+        for count in (3, 20):
+            form_key = f"form_{uuid4()}"
+            form_data = _form_with_questions(test_session, form_key, count)
+
+            query_log.clear()
+            response = client.post(
+                "application/submit",
+                data={"form_key": form_key, "form_data": json.dumps(form_data)},
+            )
+            assert response.status_code == 200
+            counts.append(len(query_log))
+
+            saved = test_session.query(Response).filter(
+                Response.application_id == response.json()["applicationId"]
+            ).count()
+            assert saved == count
+
+        assert counts[0] == counts[1]
+
+    def test_submit_query_budget(self, test_session, query_budget):
+        auth0_id = f"auth0|applicant_{uuid4()}"
+        app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+        form_key = f"form_{uuid4()}"
+        form_data = _form_with_questions(test_session, form_key, 20)
+
+        # Includes creating the user on first submission
+        with query_budget(9):
+            response = client.post(
+                "application/submit",
+                data={"form_key": form_key, "form_data": json.dumps(form_data)},
+            )
+        assert response.status_code == 200
+
+    def test_question_map_cached_until_questions_change(self, test_session, query_log):
+        form_key = f"form_{uuid4()}"
+        _form_with_questions(test_session, form_key, 2)
+
+        assert set(load_question_map(test_session, form_key)) == {"q0", "q1"}
+        query_log.clear()
+        load_question_map(test_session, form_key)
+        assert query_log == []
+
+        test_session.add(
+            Question(form_key=form_key, question_key="q2", question_type=QuestionType.TEXT)
+        )
+        test_session.flush()
+
+        assert set(load_question_map(test_session, form_key)) == {"q0", "q1", "q2"}
+
+
+class TestDeferredUploads:
+    def test_submission_queues_files_without_touching_s3(
+        self, monkeypatch, tmp_path, test_session
+    ):
+        auth0_id = f"auth0|applicant_{uuid4()}"
+        test_session.add(User(auth0_id=auth0_id))
+        form_key = f"form_{uuid4()}"
+        _form_with_questions(test_session, form_key, 1)
+        test_session.add(
+            Question(form_key=form_key, question_key="file", question_type=QuestionType.FILE)
+        )
+        test_session.flush()
+        app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+
+        monkeypatch.setattr("routers.application.DEFERRED_UPLOADS", True)
+        monkeypatch.setattr("services.upload_outbox.UPLOAD_STAGING_DIR", str(tmp_path))
+        monkeypatch.setattr(
+            "routers.application.upload_files_to_s3",
+            lambda uploads: pytest.fail("S3 must not be called in deferred mode"),
+        )
+
+        response = client.post(
+            "application/submit",
+            data={
+                "form_key": form_key,
+                "form_data": json.dumps({"q0": "John Doe", "file": "test.pdf"}),
+            },
+            files=[("files", ("test.pdf", b"I love HackDuke!", "application/pdf"))],
+        )
+
+        assert response.status_code == 200
+        file_response = (
+            test_session.query(Response)
+            .filter(
+                Response.application_id == response.json()["applicationId"],
+                Response.file_s3_key.isnot(None),
+            )
+            .one()
+        )
+        assert file_response.upload_pending is True
+
+        entry = (
+            test_session.query(UploadOutbox)
+            .filter(UploadOutbox.response_id == file_response.id)
+            .one()
+        )
+        assert entry.s3_key == file_response.file_s3_key
+        assert entry.content_type == "application/pdf"
+        with open(entry.staged_path, "rb") as staged:
+            assert staged.read() == b"I love HackDuke!"
+
+        # The submission was committed; keep its outbox row from reaching
+        # other tests' workers
+        test_session.delete(entry)
+        test_session.commit()
+
+    def test_failed_submission_removes_staged_files(self, monkeypatch, tmp_path, test_session):
+        auth0_id = f"auth0|applicant_{uuid4()}"
+        test_session.add(User(auth0_id=auth0_id))
+        form_key = f"form_{uuid4()}"
+        _form_with_questions(test_session, form_key, 1)
+        test_session.add(
+            Question(form_key=form_key, question_key="file", question_type=QuestionType.FILE)
+        )
+        test_session.flush()
+        app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+
+        monkeypatch.setattr("routers.application.DEFERRED_UPLOADS", True)
+        monkeypatch.setattr("services.upload_outbox.UPLOAD_STAGING_DIR", str(tmp_path))
+
+        async def stage_for_missing_response(uploads):
+            # The outbox row's response never exists, so its insert fails
+            return [dict(row, response_id=uuid4()) for row in await stage_uploads(uploads)]
+
+        monkeypatch.setattr("routers.application.stage_uploads", stage_for_missing_response)
+
+        with pytest.raises(IntegrityError):
+            client.post(
+                "application/submit",
+                data={
+                    "form_key": form_key,
+                    "form_data": json.dumps({"q0": "John Doe", "file": "test.pdf"}),
+                },
+                files=[("files", ("test.pdf", b"I love HackDuke!", "application/pdf"))],
+            )
+
+        assert list(tmp_path.iterdir()) == []
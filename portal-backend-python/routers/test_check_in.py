@@ -0,0 +1,587 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from models.user import User
+from models.application import Application, ApplicationStatus
+from models.check_in_log import CheckInLog
+from models.form import Form
+from models.user_role import UserRole, RoleEnum
+from routers.check_in import router, CHECK_IN_BATCH_MAX, CURRENT_FORM_KEY, check_in_feed, stream_check_ins
+from routers.identity import Principal
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import FastAPI
+from db import get_async_db, get_db
+from metrics import CHECK_INS
+from services.roster import roster_index
+from routers.check_in import auth
+
+app = FastAPI()
+app.include_router(prefix="/check_in", router=router)
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def setup_dependency_overrides(test_session, test_async_session):
+    """Override FastAPI dependency injections for testing."""
+    app.dependency_overrides.clear()
+    app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|check_in_staff_123"}
+    app.dependency_overrides[get_db] = lambda: (yield test_session)
+    app.dependency_overrides[get_async_db] = lambda: (yield test_async_session)
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def check_in_staff(test_session):
+    """Create a staff user with the check_in role."""
+    auth0_id = "auth0|check_in_staff_123"
+    test_session.query(User).filter(User.auth0_id == auth0_id).delete()
+    test_session.flush()
+
+    user = User(auth0_id=auth0_id)
+    test_session.add(user)
+    test_session.flush()
+
+    test_session.add(UserRole(user_id=user.id, role=RoleEnum.CHECK_IN))
+    test_session.flush()
+    return user
+
+
+@pytest.fixture
+def current_form(test_session):
+    form = test_session.query(Form).filter(Form.form_key == CURRENT_FORM_KEY).first()
+    if not form:
+        form = Form(form_key=CURRENT_FORM_KEY, year=2026, is_open=True)
+        test_session.add(form)
+        test_session.flush()
+    return form
+
+
+def _make_attendee(test_session, form, first_name, last_name, status):
+    user = User(auth0_id=f"auth0|attendee_{uuid4()}")
+    test_session.add(user)
+    test_session.flush()
+
+    application = Application(
+        user_id=user.id,
+        form_key=form.form_key,
+        status=status,
+        submission_json={"first_name": first_name, "last_name": last_name},
+    )
+    test_session.add(application)
+    test_session.flush()
+    return user
+
+
+@pytest.fixture
+def attendee(test_session, current_form):
+    return _make_attendee(
+        test_session, current_form, "Zyxie", "Quorwell", ApplicationStatus.CONFIRMED
+    )
+
+
+@pytest.fixture
+def event_type():
+    """A fresh event type so check-ins from other tests never collide."""
+    return f"test-event-{uuid4()}"
+
+
+@pytest.fixture
+def counted_check_ins():
+    """check_ins_total increments during the test; fresh event types count as "other"."""
+    before = CHECK_INS.labels("other").value
+    return lambda: CHECK_INS.labels("other").value - before
+
+
+class TestLogUser:
+    def test_log_user_success(self, check_in_staff, attendee, event_type, test_session):
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(attendee.id), "event_type": event_type},
+        )
+
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["full_name"] == "Zyxie Quorwell"
+        assert data["status"] == "confirmed"
+
+        logs = test_session.query(CheckInLog).filter(
+            CheckInLog.user_id == attendee.id,
+            CheckInLog.event_type == event_type,
+        ).all()
+        assert len(logs) == 1
+
+    def test_log_user_query_budget(self, check_in_staff, attendee, event_type, query_budget):
+        # Identity, the admission lookup, and the check-in upsert
+        with query_budget(3):
+            response = client.post(
+                "/check_in/log_user",
+                json={"qr_code": str(attendee.id), "event_type": event_type},
+            )
+        assert response.status_code == 200
+
+    def test_check_in_deleted_mid_scan_asks_for_a_rescan(self, check_in_staff, attendee, event_type, monkeypatch):
+        async def deleted_before_read(db, rows):
+            return {}
+
+        monkeypatch.setattr("routers.check_in._record_check_ins", deleted_before_read)
+
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(attendee.id), "event_type": event_type},
+        )
+
+        assert response.status_code == 409
+
+    def test_log_user_twice_rejected(self, check_in_staff, attendee, event_type, test_session, counted_check_ins):
+        body = {"qr_code": str(attendee.id), "event_type": event_type}
+        client.post("/check_in/log_user", json=body)
+
+        response = client.post("/check_in/log_user", json=body)
+
+        assert response.status_code == 400
+        # Only the successful check-in is counted
+        assert counted_check_ins() == 1
+        assert response.json()["detail"].startswith("Zyxie Quorwell already checked in at ")
+        assert test_session.query(CheckInLog).filter(
+            CheckInLog.user_id == attendee.id,
+            CheckInLog.event_type == event_type,
+        ).count() == 1
+
+    def test_duplicate_check_in_rejected_by_database(self, attendee, event_type, test_session):
+        for _ in range(2):
+            test_session.add(CheckInLog(
+                user_id=attendee.id, name="Zyxie Quorwell", event_type=event_type
+            ))
+        with pytest.raises(IntegrityError):
+            test_session.flush()
+
+    def test_log_user_pending_rejected(self, check_in_staff, current_form, event_type, test_session):
+        pending = _make_attendee(
+            test_session, current_form, "Pending", "Person", ApplicationStatus.PENDING
+        )
+
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(pending.id), "event_type": event_type},
+        )
+
+        assert response.status_code == 400
+
+    def test_log_user_admitted_after_roster_loaded(
+        self, check_in_staff, current_form, event_type, test_session
+    ):
+        client.get("/check_in/search_users", params={"q": "zz"})  # loads the roster
+        late = _make_attendee(
+            test_session, current_form, "Late", "Arrival", ApplicationStatus.ACCEPTED
+        )
+
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(late.id), "event_type": event_type},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["full_name"] == "Late Arrival"
+        assert roster_index.get(late.id) is not None
+
+    def test_log_user_revoked_after_roster_loaded(
+        self, check_in_staff, attendee, event_type, test_session
+    ):
+        client.get("/check_in/search_users", params={"q": "zz"})  # loads the roster
+        assert roster_index.get(attendee.id) is not None
+        # A bulk UPDATE, like another process's, leaves the roster untouched
+        test_session.execute(
+            update(Application)
+            .where(Application.user_id == attendee.id)
+            .values(status=ApplicationStatus.REJECTED)
+        )
+        test_session.flush()
+
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(attendee.id), "event_type": event_type},
+        )
+
+        assert response.status_code == 400
+        assert roster_index.get(attendee.id) is None
+
+    def test_log_user_invalid_qr(self, check_in_staff, event_type):
+        response = client.post(
+            "/check_in/log_user",
+            json={"qr_code": "not-a-uuid", "event_type": event_type},
+        )
+
+        assert response.status_code == 400
+
+
+class TestLogBatch:
+    def test_results_per_entry(self, check_in_staff, attendee, current_form, event_type, test_session, query_budget, counted_check_ins):
+        pending = _make_attendee(
+            test_session, current_form, "Pending", "Person", ApplicationStatus.PENDING
+        )
+        scans = [
+            {"qr_code": str(attendee.id), "event_type": event_type, "client_timestamp": "2026-03-01T10:05:00"},
+            {"qr_code": str(attendee.id), "event_type": event_type, "client_timestamp": "2026-03-01T10:01:00"},
+            {"qr_code": str(pending.id), "event_type": event_type, "client_timestamp": "2026-03-01T10:02:00"},
+            {"qr_code": "not-a-uuid", "event_type": event_type, "client_timestamp": "2026-03-01T10:03:00"},
+        ]
+
+        # Identity, one admission lookup for the batch, the upsert
+        with query_budget(3):
+            response = client.post("/check_in/log_batch", json={"entries": scans})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == [
+            "already_checked_in", "checked_in", "not_accepted", "invalid_qr"
+        ]
+        assert data["checked_in"] == 1
+        # Checked in at the earliest scan, not when the batch arrived
+        assert data["results"][1]["check_in_time"] == "2026-03-01T10:01:00"
+        assert data["results"][0]["full_name"] == "Zyxie Quorwell"
+        assert counted_check_ins() == 1
+
+        log = test_session.query(CheckInLog).filter(CheckInLog.event_type == event_type).all()
+        assert [(entry.user_id, entry.check_in_time.isoformat()) for entry in log] == [
+            (attendee.id, "2026-03-01T10:01:00")
+        ]
+
+    def test_resent_batch_is_idempotent(self, check_in_staff, attendee, event_type, counted_check_ins):
+        scans = [{"qr_code": str(attendee.id), "event_type": event_type, "client_timestamp": "2026-03-01T10:01:00Z"}]
+        client.post("/check_in/log_batch", json={"entries": scans})
+
+        response = client.post("/check_in/log_batch", json={"entries": scans})
+
+        assert [r["status"] for r in response.json()["results"]] == ["already_checked_in"]
+        assert counted_check_ins() == 1
+
+    def test_future_scan_times_are_capped(self, check_in_staff, attendee, event_type):
+        scans = [{"qr_code": str(attendee.id), "event_type": event_type, "client_timestamp": "2099-01-01T00:00:00"}]
+
+        response = client.post("/check_in/log_batch", json={"entries": scans})
+
+        assert response.json()["results"][0]["check_in_time"] < "2099"
+
+    def test_batch_size_is_limited(self, check_in_staff, event_type):
+        scans = [{"qr_code": str(uuid4()), "event_type": event_type, "client_timestamp": "2026-03-01T10:00:00"}]
+
+        response = client.post("/check_in/log_batch", json={"entries": scans * (CHECK_IN_BATCH_MAX + 1)})
+
+        assert response.status_code == 422
+
+    def test_check_in_deleted_mid_batch_is_retried(self, check_in_staff, attendee, event_type, monkeypatch):
+        async def deleted_before_read(db, rows):
+            return {}
+
+        monkeypatch.setattr("routers.check_in._record_check_ins", deleted_before_read)
+        scans = [{"qr_code": str(attendee.id), "event_type": event_type, "client_timestamp": "2026-03-01T10:00:00"}]
+
+        response = client.post("/check_in/log_batch", json={"entries": scans})
+
+        assert response.status_code == 200
+        assert [r["status"] for r in response.json()["results"]] == ["retry"]
+        assert response.json()["checked_in"] == 0
+
+
+class TestCheckInViews:
+    def test_search_users(self, check_in_staff, attendee):
+        response = client.get("/check_in/search_users", params={"q": "quorw"})
+
+        assert response.status_code == 200
+        user_ids = [u["user_id"] for u in response.json()["users"]]
+        assert str(attendee.id) in user_ids
+
+    def test_search_users_matches_full_name_prefixes(
+        self, check_in_staff, current_form, test_session
+    ):
+        last_name = f"Quorwell{uuid4().hex[:8]}"
+        user = _make_attendee(
+            test_session, current_form, "Zyxie", last_name, ApplicationStatus.CONFIRMED
+        )
+
+        response = client.get("/check_in/search_users", params={"q": f"zyx {last_name[:12]}"})
+
+        assert [u["user_id"] for u in response.json()["users"]] == [str(user.id)]
+
+    def test_search_users_skips_pending_and_limits_results(
+        self, check_in_staff, current_form, test_session
+    ):
+        surname = f"Vellamoth{uuid4().hex[:8]}"
+        pending = _make_attendee(
+            test_session, current_form, surname, "Pending", ApplicationStatus.PENDING
+        )
+        for i in range(12):
+            _make_attendee(
+                test_session, current_form, f"Guest{i}", surname, ApplicationStatus.ACCEPTED
+            )
+
+        response = client.get("/check_in/search_users", params={"q": surname})
+
+        user_ids = [u["user_id"] for u in response.json()["users"]]
+        assert len(user_ids) == 10
+        assert str(pending.id) not in user_ids
+
+    def test_not_checked_in(self, check_in_staff, attendee, event_type):
+        response = client.get("/check_in/not_checked_in", params={"event_type": event_type})
+        assert str(attendee.id) in [u["user_id"] for u in response.json()["users"]]
+
+        client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(attendee.id), "event_type": event_type},
+        )
+
+        response = client.get("/check_in/not_checked_in", params={"event_type": event_type})
+        assert str(attendee.id) not in [u["user_id"] for u in response.json()["users"]]
+
+    def test_not_checked_in_sorted_and_paged(
+        self, check_in_staff, current_form, event_type, test_session
+    ):
+        surname = f"Ostrander{uuid4().hex[:8]}"
+        users = [
+            _make_attendee(test_session, current_form, first, surname, ApplicationStatus.ACCEPTED)
+            for first in ["Cleo", "abel", "Bryn"]
+        ]
+        client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(users[2].id), "event_type": event_type},
+        )
+
+        everyone = client.get("/check_in/not_checked_in", params={"event_type": event_type}).json()
+        paged, cursor = [], None
+        while True:
+            params = {"event_type": event_type, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/check_in/not_checked_in", params=params).json()
+            assert page["total"] == everyone["total"]
+            paged.extend(page["users"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert paged == everyone["users"]
+        ours = [u["name"] for u in everyone["users"] if u["last_name"] == surname]
+        # Case-insensitive by name; Bryn has checked in
+        assert ours == [f"abel {surname}", f"Cleo {surname}"]
+
+    def test_not_checked_in_query_budget(self, check_in_staff, attendee, event_type, query_budget):
+        with query_budget(2):
+            response = client.get("/check_in/not_checked_in", params={"event_type": event_type})
+        assert response.status_code == 200
+
+    def test_not_checked_in_invalid_cursor(self, check_in_staff, event_type):
+        response = client.get(
+            "/check_in/not_checked_in", params={"event_type": event_type, "cursor": "bm9wZQ=="}
+        )
+        assert response.status_code == 400
+
+    def test_log_and_delete_entry(self, check_in_staff, attendee, event_type):
+        client.post(
+            "/check_in/log_user",
+            json={"qr_code": str(attendee.id), "event_type": event_type},
+        )
+
+        response = client.get("/check_in/log", params={"event_type": event_type})
+        assert [entry["user_id"] for entry in response.json()["log"]] == [str(attendee.id)]
+
+        response = client.post(
+            "/check_in/delete_log_entry",
+            json={"user_id": str(attendee.id), "event_type": event_type},
+        )
+        assert response.status_code == 200
+
+        response = client.get("/check_in/log", params={"event_type": event_type})
+        assert response.json()["log"] == []
+
+
+class TestLogPages:
+    def _log(self, test_session, event_type, minutes):
+        """Check-ins for new users at 09:00 plus each of `minutes`."""
+        for minute in minutes:
+            user = User(auth0_id=f"auth0|log_{uuid4()}")
+            test_session.add(user)
+            test_session.flush()
+            test_session.add(CheckInLog(
+                user_id=user.id,
+                name=f"Guest {minute}",
+                event_type=event_type,
+                check_in_time=datetime(2026, 3, 1, 9, minute),
+            ))
+        test_session.flush()
+
+    def _names(self, response):
+        return [entry["name"] for entry in response.json()["log"]]
+
+    def test_pages_newest_first(self, check_in_staff, event_type, test_session):
+        self._log(test_session, event_type, [1, 2, 3, 4, 5])
+
+        everything = client.get("/check_in/log", params={"event_type": event_type})
+        assert self._names(everything) == [f"Guest {m}" for m in [5, 4, 3, 2, 1]]
+
+        paged, cursor = [], None
+        while True:
+            params = {"event_type": event_type, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/check_in/log", params=params)
+            assert page.json()["total_users"] == 5
+            paged.extend(self._names(page))
+            cursor = page.json()["next_cursor"]
+            if not cursor:
+                break
+        assert paged == self._names(everything)
+
+    def test_since_returns_only_later_check_ins(self, check_in_staff, event_type, test_session, query_budget):
+        self._log(test_session, event_type, [1, 2])
+        latest = client.get("/check_in/log", params={"event_type": event_type, "limit": 50}).json()["latest_cursor"]
+        self._log(test_session, event_type, [3, 4, 5])
+
+        # Identity, count, page
+        with query_budget(3):
+            page = client.get("/check_in/log", params={"event_type": event_type, "since": latest, "limit": 2})
+        assert self._names(page) == ["Guest 4", "Guest 3"]
+        assert page.json()["total_users"] == 5
+
+        page = client.get(
+            "/check_in/log", params={"event_type": event_type, "since": page.json()["latest_cursor"], "limit": 2}
+        )
+        assert self._names(page) == ["Guest 5"]
+
+        latest = page.json()["latest_cursor"]
+        page = client.get("/check_in/log", params={"event_type": event_type, "since": latest, "limit": 2})
+        assert self._names(page) == []
+        assert page.json()["latest_cursor"] == latest
+
+    def test_invalid_cursor(self, check_in_staff, event_type):
+        response = client.get("/check_in/log", params={"event_type": event_type, "since": "bm9wZQ=="})
+        assert response.status_code == 400
+
+
+class TestDashboard:
+    def test_counts_and_arrivals_per_event(
+        self, check_in_staff, attendee, current_form, event_type, test_session, query_budget
+    ):
+        other = _make_attendee(test_session, current_form, "Other", "Guest", ApplicationStatus.ACCEPTED)
+        for user, minute in [(attendee, 1), (other, 20)]:
+            test_session.add(CheckInLog(
+                user_id=user.id, name="x", event_type=event_type, check_in_time=datetime(2026, 3, 1, 9, minute)
+            ))
+        test_session.flush()
+
+        # Identity, roster load, the grouped arrivals query
+        with query_budget(3):
+            response = client.get("/check_in/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()
+        [event] = [e for e in data["events"] if e["event_type"] == event_type]
+        assert event["checked_in"] == 2
+        assert event["not_checked_in"] == data["attendees"] - 2
+        assert event["first_check_in"] == "2026-03-01T09:01:00"
+        assert event["last_check_in"] == "2026-03-01T09:20:00"
+        assert event["arrivals"] == [
+            {"start": "2026-03-01T09:00:00", "count": 1},
+            {"start": "2026-03-01T09:15:00", "count": 1},
+        ]
+
+    def test_served_from_cache(self, check_in_staff, event_type, test_session, query_log):
+        client.get("/check_in/dashboard")
+        test_session.add(CheckInLog(
+            user_id=check_in_staff.id, name="x", event_type=event_type, check_in_time=datetime(2026, 3, 1, 9)
+        ))
+        test_session.flush()
+
+        query_log.clear()
+        response = client.get("/check_in/dashboard")
+
+        assert event_type not in [e["event_type"] for e in response.json()["events"]]
+        assert not [q for q in query_log if "check_in_log" in q]
+
+
+class TestStream:
+    @pytest.mark.asyncio
+    async def test_streams_check_ins_and_deletions(
+        self, check_in_staff, attendee, event_type, test_session
+    ):
+        principal = Principal(user=check_in_staff, roles={RoleEnum.CHECK_IN})
+        response = await stream_check_ins(event_type=event_type, principal=principal, db=AsyncSession())
+        events = response.body_iterator
+        try:
+            assert "event: ready" in await anext(events)
+
+            body = {"qr_code": str(attendee.id), "event_type": event_type}
+            client.post("/check_in/log_user", json=body)
+            client.post("/check_in/log_user", json={**body, "event_type": f"{event_type}-other"})
+            message = await asyncio.wait_for(anext(events), 1)
+            assert message.startswith("event: check_in\n")
+            data = json.loads(message.split("data: ", 1)[1])
+            assert data["user_id"] == str(attendee.id)
+            assert data["name"] == "Zyxie Quorwell"
+
+            client.post(
+                "/check_in/delete_log_entry",
+                json={"user_id": str(attendee.id), "event_type": event_type},
+            )
+            message = await asyncio.wait_for(anext(events), 1)
+            assert message.startswith("event: delete\n")
+            assert json.loads(message.split("data: ", 1)[1]) == {
+                "user_id": str(attendee.id), "name": "Zyxie Quorwell"
+            }
+        finally:
+            await events.aclose()
+
+        assert check_in_feed.subscriber_count(event_type) == 0
+
+
+class TestRosterReads:
+    @pytest.mark.parametrize("path", ["/check_in/search_users?q=quorw", "/check_in/dashboard"])
+    def test_stay_off_the_blocking_session(self, path, check_in_staff, attendee):
+        """A roster rebuild must not run on the event loop through get_db."""
+        app.dependency_overrides[get_db] = lambda: pytest.fail("get_db used")
+
+        response = client.get(path)
+
+        assert response.status_code == 200
+
+
+CHECK_IN_ENDPOINTS = [
+    ("post", "/check_in/log_user", {"json": {"qr_code": str(uuid4()), "event_type": "check-in"}}),
+    ("get", "/check_in/search_users", {"params": {"q": "ab"}}),
+    ("get", "/check_in/log", {}),
+    ("post", "/check_in/log_batch", {"json": {"entries": []}}),
+    ("get", "/check_in/dashboard", {}),
+    ("post", "/check_in/delete_log_entry", {"json": {"user_id": str(uuid4()), "event_type": "check-in"}}),
+    ("get", "/check_in/not_checked_in", {}),
+]
+
+
+class TestIdentityQueries:
+    @pytest.mark.parametrize("method,path,kwargs", CHECK_IN_ENDPOINTS)
+    def test_missing_role_rejected_after_one_query(
+        self, method, path, kwargs, test_session, query_log
+    ):
+        auth0_id = f"auth0|no_role_{uuid4()}"
+        test_session.add(User(auth0_id=auth0_id))
+        test_session.flush()
+        app.dependency_overrides[auth.verify] = lambda: {"sub": auth0_id}
+
+        query_log.clear()
+        response = getattr(client, method)(path, **kwargs)
+
+        assert response.status_code == 403
+        assert len(query_log) == 1
+
+    def test_search_identity_costs_one_query(self, check_in_staff, attendee, query_log):
+        query_log.clear()
+        response = client.get("/check_in/search_users", params={"q": "quorw"})
+
+        assert response.status_code == 200
+        assert len([q for q in query_log if "user_role" in q]) == 1
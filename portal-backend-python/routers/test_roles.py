@@ -0,0 +1,144 @@
+import pytest
+from fastapi.testclient import TestClient
+from uuid import uuid4
+
+from models.user import User
+from models.user_role import UserRole, RoleEnum
+from routers.roles import router, user_has_role
+from routers.identity import role_cache
+from fastapi import FastAPI
+from db import get_db
+from routers.roles import auth
+
+app = FastAPI()
+app.include_router(prefix="/roles", router=router)
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def setup_dependency_overrides(test_session):
+    """Override FastAPI dependency injections for testing."""
+    app.dependency_overrides.clear()
+    app.dependency_overrides[auth.verify] = lambda: {"sub": "auth0|roles_admin_123"}
+    app.dependency_overrides[get_db] = lambda: (yield test_session)
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def roles_admin(test_session):
+    auth0_id = "auth0|roles_admin_123"
+    test_session.query(User).filter(User.auth0_id == auth0_id).delete()
+    test_session.flush()
+
+    user = User(auth0_id=auth0_id)
+    test_session.add(user)
+    test_session.flush()
+
+    test_session.add(UserRole(user_id=user.id, role=RoleEnum.ADMIN))
+    test_session.flush()
+    return user
+
+
+@pytest.fixture
+def staff_user(test_session):
+    user = User(auth0_id=f"auth0|staff_{uuid4()}", email="staff@example.com")
+    test_session.add(user)
+    test_session.flush()
+    return user
+
+
+class TestRoleCache:
+    def test_repeated_role_checks_hit_cache(self, roles_admin, test_session, query_log):
+        assert user_has_role(test_session, roles_admin.id, RoleEnum.ADMIN)
+
+        query_log.clear()
+        for _ in range(5):
+            assert user_has_role(test_session, roles_admin.id, RoleEnum.ADMIN)
+
+        assert query_log == []
+        assert role_cache.stats()["hits"] == 5
+
+    def test_grant_invalidates_cache(self, roles_admin, staff_user, test_session):
+        # Prime the cache with "no roles"
+        assert not user_has_role(test_session, staff_user.id, RoleEnum.CHECK_IN)
+
+        response = client.post(
+            "/roles/grant",
+            json={
+                "auth0_id": staff_user.auth0_id,
+                "email": staff_user.email,
+                "role": "check_in",
+                "name": "Staff Person",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["user"]["roles"] == ["check_in"]
+        assert user_has_role(test_session, staff_user.id, RoleEnum.CHECK_IN)
+
+    def test_revoke_invalidates_cache(self, roles_admin, staff_user, test_session):
+        test_session.add(UserRole(user_id=staff_user.id, role=RoleEnum.CHECK_IN))
+        test_session.flush()
+        assert user_has_role(test_session, staff_user.id, RoleEnum.CHECK_IN)
+
+        response = client.post(
+            "/roles/revoke",
+            json={"user_id": str(staff_user.id), "role": "check_in"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["user"]["roles"] == []
+        assert not user_has_role(test_session, staff_user.id, RoleEnum.CHECK_IN)
+
+    def test_cache_stats_endpoint(self, roles_admin):
+        response = client.get("/roles/cache-stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["misses"] >= 1
+        assert set(data) == {"hits", "misses", "hit_rate", "size", "ttl_seconds"}
+
+    def test_cache_stats_requires_admin(self, staff_user):
+        app.dependency_overrides[auth.verify] = lambda: {"sub": staff_user.auth0_id}
+
+        response = client.get("/roles/cache-stats")
+
+        assert response.status_code == 403
+
+
+class TestListUsersWithRoles:
+    def _add_staff(self, test_session, count):
+        users = []
+        for i in range(count):
+            user = User(auth0_id=f"auth0|staff_{uuid4()}")
+            test_session.add(user)
+            test_session.flush()
+            roles = [RoleEnum.CHECK_IN] if i % 2 else [RoleEnum.CHECK_IN, RoleEnum.ADMIN]
+            test_session.add_all([UserRole(user_id=user.id, role=role) for role in roles])
+            users.append(user)
+        test_session.flush()
+        return users
+
+    def test_roles_aggregated_per_user(self, roles_admin, test_session):
+        both, check_in_only = self._add_staff(test_session, 2)
+
+        response = client.get("/roles/users")
+
+        assert response.status_code == 200
+        by_id = {u["user_id"]: u for u in response.json()["users"]}
+        assert by_id[str(both.id)]["roles"] == ["admin", "check_in"]
+        assert by_id[str(check_in_only.id)]["roles"] == ["check_in"]
+
+    def test_query_count_independent_of_staff_size(self, roles_admin, test_session, query_log):
+        counts = []
+        for count in (2, 10):
+            self._add_staff(test_session, count)
+            role_cache.clear()
+            query_log.clear()
+            response = client.get("/roles/users")
+            assert response.status_code == 200
+            counts.append(len(query_log))
+
+        # Requesting admin, their roles, then the one aggregated listing
+        assert counts == [3, 3]
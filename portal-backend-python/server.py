@@ -1,11 +1,19 @@
-from fastapi import FastAPI, Security
-from auth import VerifyToken
+import asyncio
+import hmac
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Security
+from fastapi.responses import PlainTextResponse
+from auth import get_verifier
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from routers import application, check_in, admin, roles
 from fastapi.staticfiles import StaticFiles
 import sentry_sdk
 from config import Env
+from db import async_engine
+from metrics import METRICS_TOKEN, REGISTRY, MetricsMiddleware
+from services.upload_outbox import process_upload_outbox_periodically, upload_outbox_needed
 
 
 frontend_url = os.getenv("FRONTEND_URL")
@@ -18,8 +26,27 @@ if env == Env.PROD:
         send_default_pii=True,
     )
 
-app = FastAPI()
-auth = VerifyToken()
+auth = get_verifier()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process-wide background work: cache refresh, lock reaping, deferred uploads
+    tasks = [
+        asyncio.create_task(auth.refresh_jwks_periodically()),
+        asyncio.create_task(admin.reap_expired_locks_periodically()),
+    ]
+    if await upload_outbox_needed():
+        tasks.append(asyncio.create_task(process_upload_outbox_periodically()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Close pooled async connections while their event loop is still running
+    await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +56,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost of our middleware, so CORS preflights are counted too
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(prefix="/application", router=application.router)
 app.include_router(prefix="/check_in", router=check_in.router)
 app.include_router(prefix="/admin", router=admin.router)
@@ -41,3 +71,16 @@ app.mount("/qr", StaticFiles(directory="static/qr", html=True), name="qr")
 @app.get("/health")
 def health():
     return {"message": "OK"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus scrape target, behind `Bearer $METRICS_TOKEN`. Without a
+    METRICS_TOKEN the endpoint doesn't exist: Caddy proxies every path here.
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,253 @@
+"""
+Process-local roster of the current form's admitted attendees.
+
+Check-in looks people up on every QR scan and every keystroke of a manual
+search. The roster answers both from memory: user_id -> RosterEntry, plus
+a sorted (name token, name key) list searched by prefix with bisect. Name
+tokens follow the names-only search_vector query: lowercased \\w+ words of
+the first and last name, each query word matching the start of one.
+
+Freshness:
+- the whole roster is rebuilt with one query every ROSTER_REFRESH_SECONDS,
+  which bounds staleness for changes made by other processes (other
+  workers, bulk_confirm.py);
+- ORM inserts, updates and deletes of applications in this process mark
+  their users stale once the session commits; the next lookup re-reads
+  just those users;
+- check-ins (get_attendees_async) don't trust the roster at all: each
+  scan's users are re-read with one query on (user_id, form_key), so
+  someone admitted or revoked moments ago is never let in or turned away
+  on stale data. What they read refreshes the roster as it goes.
+"""
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from models.application import Application, ApplicationStatus
+
+CURRENT_FORM_KEY = "2026-cfg-application"
+ROSTER_REFRESH_SECONDS = float(os.getenv("ROSTER_REFRESH_SECONDS", "300"))
+ADMITTED_STATUSES = (ApplicationStatus.ACCEPTED, ApplicationStatus.CONFIRMED)
+
+_WORD = re.compile(r"\w+")
+
+
+class RosterEntry(NamedTuple):
+    user_id: UUID
+    first_name: str
+    last_name: str
+    status: ApplicationStatus
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+def _tokens(entry: RosterEntry) -> Set[str]:
+    return set(_WORD.findall(f"{entry.first_name} {entry.last_name}".lower()))
+
+
+def _name_key(entry: RosterEntry) -> str:
+    # Orders search results by name and, being a str, hashes far faster
+    # than a UUID when intersecting matches
+    return f"{entry.full_name.lower()}\0{entry.user_id}"
+
+
+class RosterIndex:
+    def __init__(self, ttl_seconds: float = ROSTER_REFRESH_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[UUID, RosterEntry] = {}
+        self._by_name_key: Dict[str, RosterEntry] = {}
+        self._names: List[Tuple[str, str]] = []  # (token, name key)
+        self._expires_at = 0.0
+        self._stale: Set[UUID] = set()
+        self._lock = threading.Lock()
+
+    # Maintenance ------------------------------------------------------------
+
+    def needs_rebuild(self) -> bool:
+        return self._expires_at <= time.monotonic()
+
+    def replace(self, entries: Iterable[RosterEntry]) -> None:
+        """Swap in a complete roster."""
+        by_id = {entry.user_id: entry for entry in entries}
+        by_name_key = {_name_key(entry): entry for entry in by_id.values()}
+        names = sorted((token, key) for key, entry in by_name_key.items() for token in _tokens(entry))
+        with self._lock:
+            self._entries, self._by_name_key, self._names = by_id, by_name_key, names
+            self._expires_at = time.monotonic() + self.ttl_seconds
+            self._stale.clear()
+
+    def mark_stale(self, user_ids: Iterable[UUID]) -> None:
+        with self._lock:
+            self._stale.update(user_ids)
+
+    def take_stale(self) -> Set[UUID]:
+        with self._lock:
+            stale, self._stale = self._stale, set()
+            return stale
+
+    def update(self, user_ids: Iterable[UUID], entries: Iterable[RosterEntry]) -> None:
+        """Replace these users' entries; users without an entry leave the roster."""
+        fresh = {entry.user_id: entry for entry in entries}
+        with self._lock:
+            # Copy on write, so searches can read without the lock
+            by_id, by_name_key, names = dict(self._entries), dict(self._by_name_key), list(self._names)
+            for user_id in set(user_ids) | set(fresh):
+                old = by_id.pop(user_id, None)
+                if old:
+                    key = _name_key(old)
+                    del by_name_key[key]
+                    for token in _tokens(old):
+                        index = bisect.bisect_left(names, (token, key))
+                        if index < len(names) and names[index] == (token, key):
+                            del names[index]
+                new = fresh.get(user_id)
+                if new:
+                    key = _name_key(new)
+                    by_id[user_id] = by_name_key[key] = new
+                    for token in _tokens(new):
+                        bisect.insort(names, (token, key))
+            self._entries, self._by_name_key, self._names = by_id, by_name_key, names
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries, self._by_name_key, self._names = {}, {}, []
+            self._expires_at = 0.0
+            self._stale.clear()
+
+    # Lookups ----------------------------------------------------------------
+
+    def get(self, user_id: UUID) -> Optional[RosterEntry]:
+        return self._entries.get(user_id)
+
+    @staticmethod
+    def _prefix_matches(names: List[Tuple[str, str]], prefix: str) -> Dict[str, int]:
+        """Name key -> 1 if some name token equals the prefix exactly, else 0."""
+        matches: Dict[str, int] = {}
+        index = bisect.bisect_left(names, (prefix,))
+        while index < len(names):
+            token, key = names[index]
+            if not token.startswith(prefix):
+                break
+            if token == prefix:
+                matches[key] = 1
+            else:
+                matches.setdefault(key, 0)
+            index += 1
+        return matches
+
+    def search(self, query: str, limit: int) -> List[RosterEntry]:
+        """
+        Entries whose names contain a word starting with every query word.
+        Whole-word matches rank first, then by name.
+        """
+        words = _WORD.findall(query.lower())
+        if not words:
+            return []
+        with self._lock:
+            by_name_key, names = self._by_name_key, self._names
+        # Snapshots: replace() and update() swap in new containers
+        ranked = self._prefix_matches(names, words[0])
+        for word in words[1:]:
+            matches = self._prefix_matches(names, word)
+            ranked = {key: whole + matches[key] for key, whole in ranked.items() if key in matches}
+        best = heapq.nsmallest(limit, ranked.items(), key=lambda item: (-item[1], item[0]))
+        return [by_name_key[key] for key, _ in best]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+roster_index = RosterIndex()
+
+
+# Loading --------------------------------------------------------------------
+
+def _roster_query(user_ids: Optional[Set[UUID]] = None):
+    query = select(
+        Application.user_id,
+        Application.submission_json["first_name"].astext,
+        Application.submission_json["last_name"].astext,
+        Application.status,
+    ).where(
+        Application.form_key == CURRENT_FORM_KEY,
+        Application.status.in_(ADMITTED_STATUSES),
+    )
+    if user_ids is not None:
+        query = query.where(Application.user_id.in_(user_ids))
+    return query
+
+
+def _entries(rows) -> List[RosterEntry]:
+    return [RosterEntry(user_id, first or "", last or "", status) for user_id, first, last, status in rows]
+
+
+def load_roster(db: Session) -> RosterIndex:
+    """The roster, rebuilt or patched first if it has gone stale."""
+    if roster_index.needs_rebuild():
+        roster_index.replace(_entries(db.execute(_roster_query())))
+    elif stale := roster_index.take_stale():
+        roster_index.update(stale, _entries(db.execute(_roster_query(stale))))
+    return roster_index
+
+
+async def load_roster_async(db: AsyncSession) -> RosterIndex:
+    """load_roster for an AsyncSession."""
+    if roster_index.needs_rebuild():
+        roster_index.replace(_entries(await db.execute(_roster_query())))
+    elif stale := roster_index.take_stale():
+        roster_index.update(stale, _entries(await db.execute(_roster_query(stale))))
+    return roster_index
+
+
+async def get_attendees_async(db: AsyncSession, user_ids: Iterable[UUID]) -> Dict[UUID, RosterEntry]:
+    """
+    The admitted attendees among `user_ids`, read from the database in one
+    query rather than the roster, which may be up to ROSTER_REFRESH_SECONDS
+    behind another process. The roster's entries for these users are
+    replaced with what was read.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    entries = _entries(await db.execute(_roster_query(user_ids)))
+    roster_index.update(user_ids, entries)
+    return {entry.user_id: entry for entry in entries}
+
+
+async def get_attendee_async(db: AsyncSession, user_id: UUID) -> Optional[RosterEntry]:
+    """The admitted attendee with this user_id, or None; see get_attendees_async."""
+    return (await get_attendees_async(db, [user_id])).get(user_id)
+
+
+# Invalidation ---------------------------------------------------------------
+
+@event.listens_for(Application, "after_insert")
+@event.listens_for(Application, "after_update")
+@event.listens_for(Application, "after_delete")
+def _track_roster_change(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None and target.form_key == CURRENT_FORM_KEY:
+        session.info.setdefault("roster_changes", set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_roster_changes(session) -> None:
+    changed = session.info.pop("roster_changes", None)
+    if changed:
+        roster_index.mark_stale(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_roster_changes(session) -> None:
+    session.info.pop("roster_changes", None)
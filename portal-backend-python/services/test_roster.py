@@ -0,0 +1,108 @@
+from uuid import uuid4
+
+import pytest
+
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+from services.roster import CURRENT_FORM_KEY, RosterEntry, RosterIndex, load_roster, roster_index
+
+
+def _entry(first_name, last_name, status=ApplicationStatus.ACCEPTED):
+    return RosterEntry(uuid4(), first_name, last_name, status)
+
+
+class TestRosterIndex:
+    @pytest.fixture
+    def roster(self):
+        roster = RosterIndex()
+        roster.replace([
+            _entry("Ada", "Lovelace"),
+            _entry("Adam", "Smith"),
+            _entry("Grace", "Hopper"),
+            _entry("Mary-Ann", "Adams"),
+        ])
+        return roster
+
+    def _names(self, entries):
+        return [entry.full_name for entry in entries]
+
+    def test_every_word_must_prefix_a_name(self, roster):
+        assert self._names(roster.search("ada lov", 10)) == ["Ada Lovelace"]
+        assert self._names(roster.search("gr hop", 10)) == ["Grace Hopper"]
+        assert roster.search("ada hopper", 10) == []
+        # Prefixes only, never the middle of a name
+        assert roster.search("ovelace", 10) == []
+
+    def test_whole_word_matches_rank_first(self, roster):
+        assert self._names(roster.search("ada", 10)) == ["Ada Lovelace", "Adam Smith", "Mary-Ann Adams"]
+        assert self._names(roster.search("ada", 2)) == ["Ada Lovelace", "Adam Smith"]
+
+    def test_punctuation_splits_words(self, roster):
+        assert self._names(roster.search("ann", 10)) == ["Mary-Ann Adams"]
+        assert roster.search("--", 10) == []
+
+    def test_update_replaces_and_removes_entries(self, roster):
+        [ada] = roster.search("lovelace", 10)
+        [grace] = roster.search("hopper", 10)
+
+        roster.update([ada.user_id, grace.user_id], [ada._replace(last_name="King")])
+
+        assert roster.search("lovelace", 10) == []
+        assert self._names(roster.search("king", 10)) == ["Ada King"]
+        assert roster.get(grace.user_id) is None
+        assert roster.search("hopper", 10) == []
+
+
+class TestLoadRoster:
+    @pytest.fixture
+    def current_form(self, test_session):
+        form = test_session.get(Form, CURRENT_FORM_KEY)
+        if form is None:
+            form = Form(form_key=CURRENT_FORM_KEY, year=2026, is_open=True)
+            test_session.add(form)
+            test_session.flush()
+        return form
+
+    @pytest.fixture
+    def application(self, test_session, current_form):
+        user = User(auth0_id=f"auth0|roster_{uuid4()}")
+        test_session.add(user)
+        test_session.flush()
+        application = Application(
+            user_id=user.id,
+            form_key=CURRENT_FORM_KEY,
+            status=ApplicationStatus.PENDING,
+            submission_json={"first_name": "Roster", "last_name": f"Vexley{uuid4().hex[:6]}"},
+        )
+        test_session.add(application)
+        test_session.commit()
+        return application
+
+    def test_committed_status_changes_refresh_only_those_users(self, test_session, application, query_log):
+        user_id = application.user_id
+        assert load_roster(test_session).get(user_id) is None
+
+        application.status = ApplicationStatus.ACCEPTED
+        test_session.commit()
+
+        query_log.clear()
+        entry = load_roster(test_session).get(user_id)
+        assert entry.status == ApplicationStatus.ACCEPTED
+        assert entry.first_name == "Roster"
+        # One query for the changed user, not a full rebuild
+        assert len(query_log) == 1
+        assert "IN" in query_log[0]
+
+        application.status = ApplicationStatus.REJECTED
+        test_session.commit()
+        assert load_roster(test_session).get(user_id) is None
+
+    def test_rolled_back_changes_are_ignored(self, test_session, application):
+        load_roster(test_session)
+
+        application.status = ApplicationStatus.ACCEPTED
+        test_session.flush()
+        test_session.rollback()
+
+        assert roster_index.take_stale() == set()
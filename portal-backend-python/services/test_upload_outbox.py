@@ -0,0 +1,134 @@
+import os
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from models.application import Application
+from models.form import Form
+from models.question import Question, QuestionType
+from models.response import Response
+from models.upload_outbox import UploadOutbox
+from models.user import User
+from services.upload_outbox import (
+    UPLOAD_LEASE_SECONDS,
+    UPLOAD_MAX_ATTEMPTS,
+    claim_uploads,
+    complete_upload,
+    fail_upload,
+    outbox_has_rows,
+    sweep_orphaned_staged_files,
+    upload_staged_file,
+)
+
+BUCKET = "test-outbox"
+
+
+@pytest.fixture
+def queued_upload(test_session, tmp_path):
+    """A committed-looking submission whose resume is still in the outbox."""
+    form = Form(form_key=f"form_{uuid4()}", year=2026, is_open=True)
+    user = User(auth0_id=f"auth0|outbox_{uuid4()}")
+    test_session.add_all([form, user])
+    test_session.flush()
+    question = Question(form_key=form.form_key, question_key="resume", question_type=QuestionType.FILE)
+    application = Application(user_id=user.id, form_key=form.form_key)
+    test_session.add_all([question, application])
+    test_session.flush()
+    response = Response(
+        user_id=user.id,
+        question_id=question.id,
+        application_id=application.id,
+        file_s3_key=f"{form.form_key}/{application.id}/resume/resume.pdf",
+        upload_pending=True,
+    )
+    test_session.add(response)
+    test_session.flush()
+
+    staged = tmp_path / "staged"
+    staged.write_bytes(b"resume bytes")
+    entry = UploadOutbox(
+        response_id=response.id,
+        s3_key=response.file_s3_key,
+        staged_path=str(staged),
+        content_type="application/pdf",
+        next_attempt_at=datetime.now() - timedelta(seconds=1),
+    )
+    test_session.add(entry)
+    test_session.flush()
+    return entry
+
+
+def _claim_own(test_session, entry):
+    return [row for row in claim_uploads(test_session, limit=1000) if row.id == entry.id]
+
+
+class TestUploadOutbox:
+    def test_claim_leases_the_row(self, test_session, queued_upload):
+        [claimed] = _claim_own(test_session, queued_upload)
+
+        assert claimed.attempts == 1
+        assert _claim_own(test_session, queued_upload) == []
+
+    def test_lapsed_lease_is_claimed_again(self, test_session, queued_upload):
+        """A worker that dies mid-upload leaves a lease that simply expires."""
+        _claim_own(test_session, queued_upload)
+        test_session.refresh(queued_upload)
+        queued_upload.next_attempt_at = datetime.now() - timedelta(seconds=1)
+        test_session.flush()
+
+        [claimed] = _claim_own(test_session, queued_upload)
+
+        assert claimed.attempts == 2
+
+    def test_failure_backs_off_then_success_completes(self, test_session, queued_upload, monkeypatch):
+        [claimed] = _claim_own(test_session, queued_upload)
+        fail_upload(test_session, claimed, ConnectionError("S3 unavailable"))
+        test_session.refresh(queued_upload)
+
+        assert "S3 unavailable" in queued_upload.last_error
+        assert queued_upload.next_attempt_at > datetime.now() + timedelta(seconds=5)
+        assert _claim_own(test_session, queued_upload) == []
+
+        queued_upload.next_attempt_at = datetime.now() - timedelta(seconds=1)
+        test_session.flush()
+        [claimed] = _claim_own(test_session, queued_upload)
+        with mock_aws():
+            monkeypatch.setenv("S3_BUCKET_NAME", BUCKET)
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket=BUCKET)
+            upload_staged_file(claimed)
+            assert s3.get_object(Bucket=BUCKET, Key=claimed.s3_key)["Body"].read() == b"resume bytes"
+        complete_upload(test_session, claimed)
+
+        response = test_session.get(Response, claimed.response_id)
+        test_session.refresh(response)
+        assert response.upload_pending is False
+        assert test_session.get(UploadOutbox, claimed.id) is None
+
+    def test_gives_up_after_max_attempts(self, test_session, queued_upload):
+        queued_upload.attempts = UPLOAD_MAX_ATTEMPTS
+        test_session.flush()
+
+        assert _claim_own(test_session, queued_upload) == []
+
+    def test_sweep_removes_only_old_unqueued_files(self, test_session, queued_upload, tmp_path, monkeypatch):
+        monkeypatch.setattr("services.upload_outbox.UPLOAD_STAGING_DIR", str(tmp_path))
+        old = time.time() - UPLOAD_LEASE_SECONDS - 60
+        orphan = tmp_path / "orphan"
+        in_flight = tmp_path / "in-flight"
+        for path in (orphan, in_flight):
+            path.write_bytes(b"bytes")
+        for path in (orphan, queued_upload.staged_path):
+            os.utime(path, (old, old))
+
+        assert sweep_orphaned_staged_files(test_session) == 1
+        assert not orphan.exists()
+        assert in_flight.exists()
+        assert os.path.exists(queued_upload.staged_path)
+
+    def test_outbox_has_rows(self, test_session, queued_upload):
+        assert outbox_has_rows(test_session)
@@ -0,0 +1,304 @@
+"""
+Deferred S3 uploads for application submissions.
+
+With DEFERRED_UPLOADS enabled, /application/submit copies each file into
+UPLOAD_STAGING_DIR, commits its Response with upload_pending set together
+with an UploadOutbox row, and returns without waiting for S3. A background
+task drains the outbox:
+
+- rows are claimed with FOR UPDATE SKIP LOCKED, so several workers never
+  upload the same file;
+- claiming pushes next_attempt_at UPLOAD_LEASE_SECONDS ahead. If the
+  process dies mid-upload the lease lapses and another pass retries it;
+  uploads are idempotent PUTs of the same key;
+- a failed upload is retried with exponential backoff until
+  UPLOAD_MAX_ATTEMPTS, after which the row and its staged file are kept
+  for manual recovery;
+- a successful upload clears upload_pending and deletes the row in one
+  transaction, then removes the staged file;
+- staged files older than the lease that no outbox row refers to were left
+  by a submission that failed or died before committing, and are swept.
+
+The drain task only runs where DEFERRED_UPLOADS is on, or where the outbox
+still holds rows at startup (uploads queued before the flag was turned
+off).
+
+Every process that drains the outbox must see the same UPLOAD_STAGING_DIR,
+and it should live on a persistent volume so staged files survive restarts.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session
+
+from db import get_local_session
+from models.response import Response
+from models.upload_outbox import UploadOutbox
+from utils.s3 import TRANSFER_CONFIG, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+DEFERRED_UPLOADS = os.getenv("DEFERRED_UPLOADS", "false").lower() == "true"
+UPLOAD_STAGING_DIR = os.getenv(
+    "UPLOAD_STAGING_DIR", os.path.join(tempfile.gettempdir(), "portal-uploads")
+)
+UPLOAD_OUTBOX_INTERVAL_SECONDS = float(os.getenv("UPLOAD_OUTBOX_INTERVAL_SECONDS", "5"))
+UPLOAD_OUTBOX_BATCH_SIZE = 10
+UPLOAD_LEASE_SECONDS = 300
+UPLOAD_MAX_ATTEMPTS = 8
+UPLOAD_RETRY_BASE_SECONDS = 10
+UPLOAD_RETRY_MAX_SECONDS = 3600
+
+
+def _write_staged_files(entries: Sequence[Tuple[UploadFile, str]]) -> None:
+    os.makedirs(UPLOAD_STAGING_DIR, exist_ok=True)
+    for file, path in entries:
+        file.file.seek(0)
+        partial = f"{path}.part"
+        with open(partial, "wb") as out:
+            shutil.copyfileobj(file.file, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(partial, path)
+
+
+async def stage_uploads(uploads: Sequence[Tuple[UploadFile, str, UUID]]) -> List[dict]:
+    """
+    Copy each (file, s3_key, response_id) to durable local storage and
+    return the UploadOutbox rows to insert alongside the responses.
+    """
+    staged = [(file, os.path.join(UPLOAD_STAGING_DIR, str(uuid4()))) for file, _, _ in uploads]
+    await run_in_threadpool(_write_staged_files, staged)
+
+    return [
+        dict(
+            id=uuid4(),
+            response_id=response_id,
+            s3_key=s3_key,
+            staged_path=path,
+            content_type=file.content_type,
+        )
+        for (file, s3_key, response_id), (_, path) in zip(uploads, staged)
+    ]
+
+
+def discard_staged_uploads(outbox: Sequence[dict]) -> None:
+    """Remove the files stage_uploads wrote, when their rows won't be committed."""
+    for row in outbox:
+        _remove_staged_file(row["staged_path"])
+
+
+def claim_uploads(db: Session, limit: int = UPLOAD_OUTBOX_BATCH_SIZE):
+    """
+    Lease up to `limit` due outbox rows to this worker. The caller commits
+    the claim before uploading so the lease is visible to other workers.
+    """
+    now = datetime.now(timezone.utc)
+    due = (
+        select(UploadOutbox.id)
+        .where(UploadOutbox.next_attempt_at <= now)
+        .where(UploadOutbox.attempts < UPLOAD_MAX_ATTEMPTS)
+        .order_by(UploadOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return db.execute(
+        update(UploadOutbox)
+        .where(UploadOutbox.id.in_(due.scalar_subquery()))
+        .values(
+            attempts=UploadOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=UPLOAD_LEASE_SECONDS),
+        )
+        .returning(
+            UploadOutbox.id,
+            UploadOutbox.response_id,
+            UploadOutbox.s3_key,
+            UploadOutbox.staged_path,
+            UploadOutbox.content_type,
+            UploadOutbox.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+
+def upload_staged_file(entry) -> None:
+    extra_args = {"ContentType": entry.content_type} if entry.content_type else {}
+    get_s3_client().upload_file(
+        entry.staged_path,
+        os.getenv("S3_BUCKET_NAME"),
+        entry.s3_key,
+        ExtraArgs=extra_args,
+        Config=TRANSFER_CONFIG,
+    )
+
+
+def complete_upload(db: Session, entry) -> None:
+    db.execute(
+        update(Response)
+        .where(Response.id == entry.response_id)
+        .values(upload_pending=False)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(delete(UploadOutbox).where(UploadOutbox.id == entry.id))
+
+
+def fail_upload(db: Session, entry, error: BaseException) -> None:
+    """Schedule the next attempt with exponential backoff."""
+    delay = min(UPLOAD_RETRY_BASE_SECONDS * 2 ** (entry.attempts - 1), UPLOAD_RETRY_MAX_SECONDS)
+    db.execute(
+        update(UploadOutbox)
+        .where(UploadOutbox.id == entry.id)
+        .values(
+            next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            last_error=repr(error)[:1000],
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if entry.attempts >= UPLOAD_MAX_ATTEMPTS:
+        logger.error(
+            "Giving up on %s after %d attempts; staged at %s: %r",
+            entry.s3_key, entry.attempts, entry.staged_path, error,
+        )
+    else:
+        logger.warning("Upload of %s failed (attempt %d): %r", entry.s3_key, entry.attempts, error)
+
+
+def _remove_staged_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_orphaned_staged_files(db: Session) -> int:
+    """
+    Delete staged files older than UPLOAD_LEASE_SECONDS that no outbox row
+    refers to. Staging to commit takes far less than the lease, so such a
+    file can never be claimed. Returns how many were removed.
+    """
+    cutoff = time.time() - UPLOAD_LEASE_SECONDS
+    try:
+        names = os.listdir(UPLOAD_STAGING_DIR)
+    except FileNotFoundError:
+        return 0
+    stale = []
+    for name in names:
+        path = os.path.join(UPLOAD_STAGING_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                stale.append(path)
+        except FileNotFoundError:
+            pass
+    if not stale:
+        return 0
+
+    queued = set(db.execute(
+        select(UploadOutbox.staged_path).where(UploadOutbox.staged_path.in_(stale))
+    ).scalars())
+    orphans = [path for path in stale if path not in queued]
+    for path in orphans:
+        _remove_staged_file(path)
+    return len(orphans)
+
+
+async def sweep_staging_dir() -> int:
+    def sweep():
+        db = get_local_session()
+        try:
+            return sweep_orphaned_staged_files(db)
+        finally:
+            db.close()
+
+    removed = await run_in_threadpool(sweep)
+    if removed:
+        logger.info("Removed %d orphaned staged uploads", removed)
+    return removed
+
+
+async def drain_upload_outbox() -> int:
+    """Claim one batch, upload it concurrently and record the outcomes."""
+    def claim():
+        db = get_local_session()
+        try:
+            entries = claim_uploads(db)
+            db.commit()
+            return entries
+        finally:
+            db.close()
+
+    def record(entries, results):
+        db = get_local_session()
+        try:
+            for entry, result in zip(entries, results):
+                if isinstance(result, BaseException):
+                    fail_upload(db, entry, result)
+                else:
+                    complete_upload(db, entry)
+            db.commit()
+        finally:
+            db.close()
+        for entry, result in zip(entries, results):
+            if not isinstance(result, BaseException):
+                _remove_staged_file(entry.staged_path)
+
+    entries = await run_in_threadpool(claim)
+    if not entries:
+        return 0
+    results = await asyncio.gather(
+        *(run_in_threadpool(upload_staged_file, entry) for entry in entries),
+        return_exceptions=True,
+    )
+    await run_in_threadpool(record, entries, results)
+    return len(entries)
+
+
+def outbox_has_rows(db: Session) -> bool:
+    return db.scalar(select(exists().select_from(UploadOutbox)))
+
+
+async def upload_outbox_needed() -> bool:
+    """Whether this process should run process_upload_outbox_periodically."""
+    if DEFERRED_UPLOADS:
+        return True
+
+    def check():
+        db = get_local_session()
+        try:
+            return outbox_has_rows(db)
+        finally:
+            db.close()
+
+    try:
+        return await run_in_threadpool(check)
+    except Exception as error:
+        # Better to poll for nothing than strand queued uploads
+        logger.warning("Could not check the upload outbox, draining it anyway: %s", error)
+        return True
+
+
+async def process_upload_outbox_periodically() -> None:
+    """
+    Background task that drains the outbox, a full batch at a time, and
+    sweeps the staging directory once per lease.
+    """
+    next_sweep = time.monotonic()
+    while True:
+        try:
+            while await drain_upload_outbox() == UPLOAD_OUTBOX_BATCH_SIZE:
+                pass
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + UPLOAD_LEASE_SECONDS
+                await sweep_staging_dir()
+        except Exception as error:
+            logger.warning("Upload outbox pass failed: %s", error)
+        await asyncio.sleep(UPLOAD_OUTBOX_INTERVAL_SECONDS)
@@ -1,8 +1,21 @@
+import asyncio
+import json
+import time
+
+import httpx
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 from unittest.mock import patch, MagicMock
 from fastapi.security import HTTPAuthorizationCredentials
 
-from auth import VerifyToken, UnauthorizedException, UnauthenticatedException
+from auth import (
+    VerifyToken,
+    TokenCache,
+    UnauthorizedException,
+    UnauthenticatedException,
+    get_verifier,
+)
 from jwt.exceptions import PyJWKClientError
 
 
@@ -63,3 +76,120 @@ async def test_verify_invalid_token(mock_jwks_cls, mock_decode):
 
     with pytest.raises(UnauthorizedException):
         await verifier.verify(security_scopes=[], token=creds)
+
+
+@pytest.mark.asyncio
+@patch("auth.jwt.decode")
+@patch("auth.jwt.PyJWKClient")
+async def test_verify_reuses_cached_payload(mock_jwks_cls, mock_decode):
+    fake_payload = {"sub": "123", "exp": time.time() + 3600}
+
+    mock_client = MagicMock()
+    mock_client.get_signing_key_from_jwt.return_value.key = "fake_key"
+    mock_jwks_cls.return_value = mock_client
+    mock_decode.return_value = fake_payload
+
+    verifier = VerifyToken()
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="fake.jwt.token")
+
+    first = await verifier.verify(security_scopes=[], token=creds)
+    second = await verifier.verify(security_scopes=[], token=creds)
+
+    assert first == second == fake_payload
+    mock_client.get_signing_key_from_jwt.assert_called_once()
+    mock_decode.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("auth.jwt.decode")
+@patch("auth.jwt.PyJWKClient")
+async def test_verify_does_not_reuse_expired_payload(mock_jwks_cls, mock_decode):
+    mock_client = MagicMock()
+    mock_client.get_signing_key_from_jwt.return_value.key = "fake_key"
+    mock_jwks_cls.return_value = mock_client
+    mock_decode.return_value = {"sub": "123", "exp": time.time() - 1}
+
+    verifier = VerifyToken()
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="fake.jwt.token")
+
+    await verifier.verify(security_scopes=[], token=creds)
+    await verifier.verify(security_scopes=[], token=creds)
+
+    assert mock_decode.call_count == 2
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2)
+    exp = time.time() + 3600
+
+    cache.put("a", {"sub": "a", "exp": exp})
+    cache.put("b", {"sub": "b", "exp": exp})
+    assert cache.get("a")["sub"] == "a"  # "b" is now least recently used
+
+    cache.put("c", {"sub": "c", "exp": exp})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_get_verifier_is_shared():
+    assert get_verifier() is get_verifier()
+
+
+@pytest.mark.asyncio
+async def test_verify_non_blocking_fetches_jwks_once(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk["kid"] = "test-key"
+
+    monkeypatch.setattr("auth.auth0_algorithms", ["RS256"])
+    monkeypatch.setattr("auth.auth0_api_audience", "test-audience")
+    monkeypatch.setattr("auth.auth0_issuer", "https://issuer.test/")
+
+    jwks_requests = []
+
+    async def jwks_handler(request):
+        jwks_requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    real_async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "auth.httpx.AsyncClient",
+        lambda **kwargs: real_async_client(
+            transport=httpx.MockTransport(jwks_handler), **kwargs
+        ),
+    )
+
+    verifier = VerifyToken(
+        non_blocking=True, jwks_url="https://issuer.test/.well-known/jwks.json"
+    )
+    tokens = [
+        jwt.encode(
+            {
+                "sub": f"auth0|user_{i}",
+                "aud": "test-audience",
+                "iss": "https://issuer.test/",
+                "exp": int(time.time()) + 3600,
+            },
+            private_key,
+            algorithm="RS256",
+            headers={"kid": "test-key"},
+        )
+        for i in range(5)
+    ]
+
+    payloads = await asyncio.gather(
+        *(
+            verifier.verify(
+                security_scopes=[],
+                token=HTTPAuthorizationCredentials(scheme="Bearer", credentials=t),
+            )
+            for t in tokens
+        )
+    )
+
+    assert [p["sub"] for p in payloads] == [f"auth0|user_{i}" for i in range(5)]
+    assert len(jwks_requests) == 1
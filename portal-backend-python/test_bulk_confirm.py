@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+
+from bulk_confirm import confirm
+from models.application import Application, ApplicationStatus
+from models.form import Form
+from models.user import User
+
+
+@pytest.fixture
+def form(test_session):
+    form = Form(form_key=f"bulk-confirm-{uuid4()}", year=2026, is_open=False)
+    test_session.add(form)
+    test_session.flush()
+    return form
+
+
+@pytest.fixture
+def make_application(test_session, form):
+    def make(status, email, form_key=None):
+        user = User(auth0_id=f"auth0|bulk_{uuid4()}")
+        test_session.add(user)
+        test_session.flush()
+        application = Application(
+            user_id=user.id,
+            form_key=form_key or form.form_key,
+            status=status,
+            submission_json={"email": email},
+        )
+        test_session.add(application)
+        test_session.flush()
+        return application
+
+    return make
+
+
+def _status(test_session, application):
+    test_session.expire(application)
+    return application.status
+
+
+def test_confirms_by_uuid_and_email(test_session, form, make_application):
+    by_id = make_application(ApplicationStatus.ACCEPTED, "ada@example.com")
+    by_email = make_application(ApplicationStatus.ACCEPTED, "Grace@Example.com")
+
+    results = confirm(test_session, [str(by_id.user_id), "grace@example.COM"], form.form_key)
+
+    assert [(r.application_id, r.confirmed) for r in results] == [(by_id.id, True), (by_email.id, True)]
+    assert _status(test_session, by_id) == ApplicationStatus.CONFIRMED
+    assert _status(test_session, by_email) == ApplicationStatus.CONFIRMED
+
+
+def test_reports_unmatched_and_not_accepted(test_session, form, make_application):
+    pending = make_application(ApplicationStatus.PENDING, "pending@example.com")
+    # ilike would have let "a_b" match it
+    underscore = make_application(ApplicationStatus.ACCEPTED, "axb@example.com")
+    other_form = Form(form_key=f"bulk-confirm-{uuid4()}", year=2025, is_open=False)
+    test_session.add(other_form)
+    test_session.flush()
+    elsewhere = make_application(ApplicationStatus.ACCEPTED, "elsewhere@example.com", other_form.form_key)
+
+    results = confirm(
+        test_session,
+        ["pending@example.com", "elsewhere@example.com", str(uuid4()), "a_b@example.com"],
+        form.form_key,
+    )
+
+    assert results[0].status == ApplicationStatus.PENDING and not results[0].confirmed
+    assert [r.application_id for r in results[1:]] == [None, None, None]
+    assert _status(test_session, pending) == ApplicationStatus.PENDING
+    assert _status(test_session, elsewhere) == ApplicationStatus.ACCEPTED
+    assert _status(test_session, underscore) == ApplicationStatus.ACCEPTED
+
+
+def test_listed_twice_is_confirmed_once(test_session, form, make_application):
+    application = make_application(ApplicationStatus.ACCEPTED, "twice@example.com")
+
+    results = confirm(test_session, ["twice@example.com", str(application.user_id)], form.form_key)
+
+    assert results[0].confirmed
+    assert not results[1].confirmed and results[1].status == ApplicationStatus.CONFIRMED
+
+
+def test_query_count_is_independent_of_input_size(test_session, form, make_application, query_budget):
+    applications = [make_application(ApplicationStatus.ACCEPTED, f"n{i}@example.com") for i in range(20)]
+
+    # Create + stage the input, resolve, drop, update
+    with query_budget(5):
+        results = confirm(test_session, [f"N{i}@example.com" for i in range(20)], form.form_key)
+
+    assert all(result.confirmed for result in results)
+    assert {result.application_id for result in results} == {a.id for a in applications}
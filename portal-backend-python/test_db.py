@@ -0,0 +1,78 @@
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, delete, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import db
+from models.user import User
+from models.user_role import RoleEnum, UserRole
+from routers.identity import load_principal_async
+
+
+@pytest_asyncio.fixture
+async def async_engine(test_sessionmaker):
+    """The test database behind the same asyncio driver the app uses."""
+    url = test_sessionmaker.kw["bind"].url.set(drivername=f"postgresql+{db.db_async_driver}")
+    engine = create_async_engine(url)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_session_round_trip(async_engine):
+    auth0_id = f"auth0|async_{uuid4()}"
+    async with db.AsyncSessionLocal(bind=async_engine) as session:
+        user = User(auth0_id=auth0_id)
+        session.add(user)
+        await session.flush()
+        session.add(UserRole(user_id=user.id, role=RoleEnum.CHECK_IN))
+        await session.commit()
+        # Still readable after commit without a lazy load
+        user_id = user.id
+
+    try:
+        async with db.AsyncSessionLocal(bind=async_engine) as session:
+            principal = await load_principal_async(session, auth0_id)
+            assert principal.id == user_id
+            assert principal.roles == {RoleEnum.CHECK_IN}
+    finally:
+        async with db.AsyncSessionLocal(bind=async_engine) as session:
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+
+class TestTimedQueuePool:
+    @pytest.fixture
+    def tiny_engine(self, test_sessionmaker):
+        engine = create_engine(
+            test_sessionmaker.kw["bind"].url,
+            poolclass=db.TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        yield engine
+        engine.dispose()
+
+    def test_counts_waits_and_timeouts(self, tiny_engine):
+        with tiny_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                tiny_engine.connect()
+
+            stats = db.describe_pool(tiny_engine.pool)
+            assert stats["checked_out"] == 1
+            assert stats["timeouts"] == 1
+            assert stats["wait_seconds"]["count"] == 2
+            # The timed-out checkout waited the full pool_timeout
+            assert stats["wait_seconds"]["sum"] >= 0.05
+
+    def test_counts_invalidated_connections_across_dispose(self, tiny_engine):
+        with tiny_engine.connect() as conn:
+            conn.invalidate()
+        tiny_engine.dispose()
+        with tiny_engine.connect() as conn:
+            conn.invalidate()
+
+        assert db.describe_pool(tiny_engine.pool)["invalidations"] == 2
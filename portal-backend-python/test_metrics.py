@@ -0,0 +1,134 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import metrics
+import server
+from db import get_db
+from metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUESTS,
+    REGISTRY,
+    MetricsMiddleware,
+)
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/items/{item_id}")
+def read_item(item_id: int, db=Depends(get_db)):
+    db.execute(text("SELECT 1"))
+    db.execute(text("SELECT 2"))
+    return {"item_id": item_id}
+
+
+@app.get("/events")
+def events():
+    def stream():
+        yield "event: ready\n\n"
+        # Headers went out with the first chunk
+        in_flight_while_streaming.append(HTTP_IN_FLIGHT.labels("GET").value)
+        yield "event: done\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+in_flight_while_streaming = []
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def instrumented(test_session):
+    engine = test_session.get_bind()
+    test_session.execute(text("SELECT 1"))  # opens the test savepoint up front
+    app.dependency_overrides[get_db] = lambda: (yield test_session)
+    metrics.instrument_engine(engine, "test")
+    REGISTRY.clear()
+    yield
+    metrics.uninstrument_engine(engine)
+    app.dependency_overrides.clear()
+
+
+class TestMetricsMiddleware:
+    def test_requests_recorded_by_route_template(self):
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        assert HTTP_REQUESTS.labels("GET", "/items/{item_id}", 200).value == 2
+        assert HTTP_REQUESTS.labels("GET", "other", 404).value == 1
+        assert HTTP_IN_FLIGHT.labels("GET").value == 0
+
+    def test_event_streams_are_counted_but_not_timed(self):
+        in_flight_while_streaming.clear()
+
+        client.get("/events")
+
+        assert in_flight_while_streaming == [0]
+        assert HTTP_REQUESTS.labels("GET", "/events", 200).value == 1
+        assert HTTP_REQUEST_DURATION.labels("GET", "/events").snapshot()["count"] == 0
+        assert HTTP_IN_FLIGHT.labels("GET").value == 0
+
+    def test_db_queries_charged_to_the_request(self):
+        client.get("/items/1")
+
+        snapshot = HTTP_REQUEST_DB_QUERIES.labels("/items/{item_id}").snapshot()
+        assert snapshot["count"] == 1
+        assert snapshot["sum"] == 2
+
+
+    def test_slow_query_logged_with_route(self, monkeypatch, caplog):
+        monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 0.000001)
+
+        with caplog.at_level("WARNING", logger="metrics"):
+            client.get("/items/1")
+
+        assert "in GET /items/{item_id}: SELECT 1" in caplog.text
+
+    def test_query_heavy_request_logged(self, monkeypatch, caplog):
+        monkeypatch.setattr(metrics, "REQUEST_QUERY_WARNING", 1)
+
+        with caplog.at_level("WARNING", logger="metrics"):
+            client.get("/items/1")
+
+        assert "GET /items/{item_id} issued 2 queries" in caplog.text
+
+
+class TestCheckInLabels:
+    def test_unknown_event_types_share_one_label(self):
+        assert metrics.check_in_event_label("lunch") == "lunch"
+        assert metrics.check_in_event_label("lnuch") == "other"
+        assert metrics.check_in_event_label("anything-a-scanner-sends") == "other"
+
+
+class TestMetricsEndpoint:
+    def test_exposes_prometheus_text(self, monkeypatch):
+        monkeypatch.setattr(server, "METRICS_TOKEN", "s3cret")
+        server_client = TestClient(server.app)
+        server_client.get("/health")
+
+        response = server_client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/health",status="200"} 1' in response.text
+        assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+
+    def test_hidden_without_a_token(self, monkeypatch):
+        monkeypatch.setattr(server, "METRICS_TOKEN", None)
+
+        assert TestClient(server.app).get("/metrics").status_code == 404
+
+    def test_token_required_when_configured(self, monkeypatch):
+        monkeypatch.setattr(server, "METRICS_TOKEN", "s3cret")
+        server_client = TestClient(server.app)
+
+        assert server_client.get("/metrics").status_code == 401
+        assert server_client.get("/metrics", headers={"Authorization": "Bearer s3cre"}).status_code == 401
+        response = server_client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert response.status_code == 200
@@ -0,0 +1,181 @@
+"""
+Small thread-safe metric primitives for in-process instrumentation, and a
+registry that renders them in the Prometheus text exposition format.
+"""
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; covers a pool checkout or a fast query up to a stuck request
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Buckets are upper bounds; snapshot() reports
+    cumulative counts per bound, Prometheus style, with +Inf implied by count.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self._counts):
+                self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative, running = [], 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative.append((bound, running))
+            return {"buckets": cumulative, "sum": self._sum, "count": self._count}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self._sum = 0.0
+            self._count = 0
+
+
+class Value:
+    """A single counter or gauge value."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Family:
+    """A named metric with one child (Value or Histogram) per label combination."""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: Sequence[str], factory: Callable):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values) -> Any:
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [
+            (dict(zip(self.labelnames, key)), child.snapshot() if self.kind == "histogram" else child.value)
+            for key, child in children
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+# A collector returns families computed at scrape time, as
+# (name, kind, help, [(labels, value or histogram snapshot)])
+CollectedFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], Any]]]
+
+
+class Registry:
+    def __init__(self):
+        self._families: List[Family] = []
+        self._collectors: List[Callable[[], Iterable[CollectedFamily]]] = []
+
+    def _add(self, family: Family) -> Family:
+        self._families.append(family)
+        return family
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Family:
+        return self._add(Family(name, help, "counter", labelnames, Value))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Family:
+        return self._add(Family(name, help, "gauge", labelnames, Value))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Family:
+        return self._add(Family(name, help, "histogram", labelnames, lambda: Histogram(buckets)))
+
+    def collector(self, collect: Callable[[], Iterable[CollectedFamily]]) -> Callable:
+        """Register a function producing families at scrape time."""
+        self._collectors.append(collect)
+        return collect
+
+    def clear(self) -> None:
+        """Drop every recorded sample; the families stay registered."""
+        for family in self._families:
+            family.clear()
+
+    def render(self) -> str:
+        families = [(f.name, f.kind, f.help, f.samples()) for f in self._families]
+        for collect in self._collectors:
+            families.extend(collect())
+
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {_escape_help(help)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind == "histogram":
+                    for bound, count in value["buckets"]:
+                        lines.append(_sample(f"{name}_bucket", {**labels, "le": _format(bound)}, count))
+                    lines.append(_sample(f"{name}_bucket", {**labels, "le": "+Inf"}, value["count"]))
+                    lines.append(_sample(f"{name}_sum", labels, value["sum"]))
+                    lines.append(_sample(f"{name}_count", labels, value["count"]))
+                else:
+                    lines.append(_sample(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format(value)}"
+    rendered = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {_format(value)}"
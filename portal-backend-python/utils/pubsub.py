@@ -0,0 +1,87 @@
+"""
+In-process publish/subscribe, for pushing events to connected clients.
+
+Publishing never blocks and may happen from any thread: events are handed
+to each subscriber's event loop. Every subscriber has a bounded queue; one
+that falls too far behind has its backlog replaced by a single RESET event,
+telling it to reload from scratch instead of holding memory for it.
+
+Only subscribers in this process see an event.
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+RESET = "reset"
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class Subscription:
+    """Events published to one topic since subscribing, in order."""
+
+    def __init__(self, broker: "Broker", topic: Hashable, max_queued: int):
+        self.topic = topic
+        self._broker = broker
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(max_queued)
+
+    def _deliver(self, event: Event) -> None:
+        # Runs on the subscriber's loop
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            event = (RESET, {})
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """The next event, or None if none arrives within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Broker:
+    def __init__(self, max_queued: int = 256):
+        self.max_queued = max_queued
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        """Start receiving `topic`'s events. Must be called on an event loop."""
+        subscription = Subscription(self, topic, self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def publish(self, topic: Hashable, kind: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, (kind, data))
+            except RuntimeError:
+                # Its event loop has shut down
+                self._unsubscribe(subscription)
+
+    def subscriber_count(self, topic: Hashable) -> int:
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
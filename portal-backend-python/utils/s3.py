@@ -1,28 +1,69 @@
+import asyncio
 import boto3
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
+MB = 1024 * 1024
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20"))
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
 
+# Files above the threshold are sent as a multipart upload in chunks of the
+# same size, read straight from the request's spooled temp file
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD_MB * MB,
+    multipart_chunksize=S3_MULTIPART_THRESHOLD_MB * MB,
+)
+
+
+@lru_cache(maxsize=1)
 def get_s3_client():
+    """
+    Shared S3 client. boto3 clients are thread-safe and keep a pool of
+    connections, so one per process is reused for every upload.
+    """
     return boto3.client(
         "s3",
         aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
         aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
         region_name=os.getenv("AWS_REGION", "us-east-1"),
+        config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS),
     )
 
 
 async def upload_file_to_s3(file: UploadFile, s3_key: str) -> Optional[str]:
-    s3_client = get_s3_client()
+    """Stream an uploaded file to S3 from a worker thread."""
+    extra_args = {"ContentType": file.content_type} if file.content_type else {}
+    await file.seek(0)
 
-    file_content = await file.read()
-
-    s3_client.put_object(
-        Bucket=os.getenv("S3_BUCKET_NAME"),
-        Key=s3_key,
-        Body=file_content,
-        ContentType=file.content_type,
+    await run_in_threadpool(
+        get_s3_client().upload_fileobj,
+        file.file,
+        os.getenv("S3_BUCKET_NAME"),
+        s3_key,
+        ExtraArgs=extra_args,
+        Config=TRANSFER_CONFIG,
     )
 
     return s3_key
+
+
+async def upload_files_to_s3(uploads: List[Tuple[UploadFile, str]]) -> List[str]:
+    """
+    Upload (file, s3_key) pairs concurrently. Keys that share one file are
+    uploaded one after another, since they read from the same file handle.
+    """
+    keys_by_file: Dict[int, Tuple[UploadFile, List[str]]] = {}
+    for file, s3_key in uploads:
+        keys_by_file.setdefault(id(file), (file, []))[1].append(s3_key)
+
+    async def upload_keys(file: UploadFile, s3_keys: List[str]) -> None:
+        for s3_key in s3_keys:
+            await upload_file_to_s3(file, s3_key)
+
+    await asyncio.gather(*(upload_keys(file, keys) for file, keys in keys_by_file.values()))
+    return [s3_key for _, s3_key in uploads]
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.pubsub import RESET, Broker
+
+
+@pytest.mark.asyncio
+async def test_events_reach_their_topic_in_order():
+    broker = Broker()
+    with broker.subscribe("a") as a, broker.subscribe("b") as b:
+        broker.publish("a", "one", {"n": 1})
+        broker.publish("a", "two", {"n": 2})
+
+        assert await a.get(timeout=1) == ("one", {"n": 1})
+        assert await a.get(timeout=1) == ("two", {"n": 2})
+        assert await b.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread():
+    broker = Broker()
+    with broker.subscribe("a") as subscription:
+        thread = threading.Thread(target=broker.publish, args=("a", "hello", {}))
+        thread.start()
+        thread.join()
+
+        assert await subscription.get(timeout=1) == ("hello", {})
+
+
+@pytest.mark.asyncio
+async def test_subscriber_that_falls_behind_is_reset():
+    broker = Broker(max_queued=2)
+    with broker.subscribe("a") as subscription:
+        for n in range(3):
+            broker.publish("a", "event", {"n": n})
+        await asyncio.sleep(0)
+
+        assert await subscription.get(timeout=1) == (RESET, {})
+        assert await subscription.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_closing_unsubscribes():
+    broker = Broker()
+    with broker.subscribe("a"):
+        assert broker.subscriber_count("a") == 1
+    assert broker.subscriber_count("a") == 0
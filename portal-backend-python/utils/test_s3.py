@@ -0,0 +1,60 @@
+import io
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from fastapi import UploadFile
+from moto import mock_aws
+from starlette.datastructures import Headers
+
+from utils import s3
+from utils.s3 import get_s3_client, upload_files_to_s3
+
+BUCKET = "test-bucket"
+
+
+def _upload_file(name: str, content: bytes) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        filename=name,
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    with mock_aws():
+        monkeypatch.setenv("S3_BUCKET_NAME", BUCKET)
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield boto3.client("s3", region_name="us-east-1")
+
+
+@pytest.mark.asyncio
+async def test_upload_files_concurrently(bucket, monkeypatch):
+    monkeypatch.setattr(
+        s3, "TRANSFER_CONFIG", TransferConfig(multipart_threshold=5 * s3.MB, multipart_chunksize=5 * s3.MB)
+    )
+    large = b"x" * (11 * s3.MB)
+    resume, transcript = _upload_file("resume.pdf", large), _upload_file("t.pdf", b"grades")
+
+    keys = await upload_files_to_s3([
+        (resume, "form/app/resume/resume.pdf"),
+        (transcript, "form/app/transcript/t.pdf"),
+        (resume, "form/app/portfolio/resume.pdf"),  # same file, second key
+    ])
+
+    assert keys == [
+        "form/app/resume/resume.pdf",
+        "form/app/transcript/t.pdf",
+        "form/app/portfolio/resume.pdf",
+    ]
+    for key, body in zip(keys, [large, b"grades", large]):
+        obj = bucket.get_object(Bucket=BUCKET, Key=key)
+        assert obj["Body"].read() == body
+        assert obj["ContentType"] == "application/pdf"
+    # Above the threshold the upload is sent in parts
+    assert "-" in bucket.head_object(Bucket=BUCKET, Key=keys[0])["ETag"]
+
+
+def test_s3_client_is_shared(bucket):
+    assert get_s3_client() is get_s3_client()
@@ -299,7 +299,7 @@ const AdminApplicationViewPage = () => {
           )}
 
           <div
-            className={`application-content ${currentApp.resume_url ? "has-resume" : ""}`}
+            className={`application-content ${currentApp.resume_url || currentApp.upload_pending ? "has-resume" : ""}`}
           >
             {/* Left Column: Application Fields */}
             <div className="application-responses">
@@ -391,6 +391,14 @@ const AdminApplicationViewPage = () => {
                 </div>
               </div>
             )}
+            {currentApp.upload_pending && (
+              <div className="resume-column">
+                <div className="resume-header">
+                  <span className="resume-label">Resume</span>
+                </div>
+                <p>The resume is still uploading. Reload in a few minutes to view it.</p>
+              </div>
+            )}
           </div>
 
           <div className="judge-actions">
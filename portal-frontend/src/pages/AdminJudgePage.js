@@ -236,7 +236,7 @@ const AdminJudgePage = () => {
           {error && <div className="judge-error">{error}</div>}
 
           <div
-            className={`application-content ${currentApp.resume_url ? "has-resume" : ""}`}
+            className={`application-content ${currentApp.resume_url || currentApp.upload_pending ? "has-resume" : ""}`}
           >
             {/* Left Column: Application Fields */}
             <div className="application-responses">
@@ -328,6 +328,14 @@ const AdminJudgePage = () => {
                 </div>
               </div>
             )}
+            {currentApp.upload_pending && (
+              <div className="resume-column">
+                <div className="resume-header">
+                  <span className="resume-label">Resume</span>
+                </div>
+                <p>The resume is still uploading. Reload in a few minutes to view it.</p>
+              </div>
+            )}
           </div>
 
           <div className="judge-actions">